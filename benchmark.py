@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Market Research Agent.
+Times the analysis pipeline on a seeded synthetic corpus and writes JSON results.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+from statistics import mean
+from typing import Callable, Dict, List
+from unittest import mock
+
+from market_research_agent import (
+    INDUSTRY_KEYWORDS,
+    METRICS,
+    QUESTIONNAIRE,
+    ROI_FANOUT,
+    CheckpointStore,
+    MarketResearchAgent,
+    RateLimiter,
+    ReportRenderer,
+    ResponseCache,
+    SimilarityIndex,
+    print_analysis_report,
+    save_report,
+)
+from mock_openai_server import CANNED_RESPONSES
+
+INDUSTRY_ANSWERS = {
+    "banking": "We are a regional {keyword} institution",
+    "legal": "Boutique {keyword} firm",
+    "consulting": "Management {keyword} practice",
+    "real_estate": "Residential {keyword} brokerage",
+    "healthcare": "Outpatient {keyword} network",
+    "manufacturing": "Precision parts {keyword}",
+    "marketing": "Full-service {keyword} agency",
+    "accounting": "Small business {keyword} services",
+    "insurance": "Commercial {keyword} carrier",
+    "retail": "Specialty {keyword} chain",
+    "technology": "B2B {keyword} company",
+    "education": "Private {keyword} provider",
+    "generic": "Family-owned services business",
+}
+
+EMPLOYEE_ANSWERS = [
+    "Just me, I run a solo practice",
+    "About {count} employees",
+    "{count} staff across two offices",
+    "We're a small team of {count} people",
+    "Roughly {count} workers, mid-size for our market",
+    "{count} employees, we are a large enterprise",
+]
+
+ACTIVITY_ANSWERS = [
+    "Client onboarding, reporting and account management",
+    "Sales, customer support and fulfilment",
+    "Project delivery for recurring clients",
+    "Compliance reviews and document preparation",
+]
+
+PROCESS_ANSWERS = [
+    "Data entry and weekly reporting",
+    "Scheduling and follow-up emails",
+    "Invoice processing and reconciliation",
+    "Research and proposal writing",
+]
+
+CHALLENGE_ANSWERS = [
+    "Too much manual work and slow turnaround",
+    "Hiring is hard and the team is stretched",
+    "Errors in spreadsheets and duplicated effort",
+    "Keeping up with regulatory changes",
+]
+
+REVENUE_ANSWERS = [
+    "${amount:,.0f}",
+    "Around ${millions}M",
+    "About {millions} million",
+    "${billions} billion",
+    "Not sure, maybe {millions} million",
+    "Prefer not to say",
+]
+
+
+def generate_description(rng: random.Random) -> str:
+    """Build one questionnaire answer in the format collect_business_info returns"""
+    industry = rng.choice(list(INDUSTRY_ANSWERS))
+    keyword = rng.choice(INDUSTRY_KEYWORDS.get(industry, ["services"]))
+    count = rng.choice([3, 8, 15, 40, 120, 450, 900, 2500, 12000])
+    millions = rng.choice([0.5, 2, 8, 25, 60, 250, 900])
+
+    answers = [
+        INDUSTRY_ANSWERS[industry].format(keyword=keyword),
+        rng.choice(EMPLOYEE_ANSWERS).format(count=f"{count:,}"),
+        rng.choice(ACTIVITY_ANSWERS),
+        rng.choice(PROCESS_ANSWERS),
+        rng.choice(CHALLENGE_ANSWERS),
+        rng.choice(REVENUE_ANSWERS).format(
+            amount=millions * 1_000_000,
+            millions=f"{millions:g}",
+            billions=f"{max(millions / 1000, 1.2):g}",
+        ),
+    ]
+    return " ".join(f"{q} {a}" for (q, _), a in zip(QUESTIONNAIRE, answers))
+
+
+def generate_corpus(size: int, seed: int = 42) -> List[str]:
+    """Generate a reproducible corpus covering every industry"""
+    rng = random.Random(seed)
+    return [generate_description(rng) for _ in range(size)]
+
+
+def canned_crew_outputs(
+    business_description: str, prompts, stream=None, job_id=None, profile=None
+) -> tuple:
+    """Stand-in for the LLM crew: the stand-in server's JSON answers, no tokens"""
+    outputs = [
+        CANNED_RESPONSES["market_research"],
+        CANNED_RESPONSES["process_analysis"],
+    ]
+    outputs += [CANNED_RESPONSES["roi_calculation"]] * ROI_FANOUT
+    return outputs, 0
+
+
+def time_calls(fn: Callable, items: List, repeat: int = 1) -> Dict[str, float]:
+    """Time fn over every item and summarize per-call latency"""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            call_start = time.perf_counter_ns()
+            fn(item)
+            latencies.append(time.perf_counter_ns() - call_start)
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    calls = len(latencies)
+    return {
+        "calls": calls,
+        "total_seconds": round(total, 6),
+        "mean_us": round(mean(latencies) / 1000, 3),
+        "p50_us": round(latencies[calls // 2] / 1000, 3),
+        "p95_us": round(latencies[min(calls - 1, int(calls * 0.95))] / 1000, 3),
+        "max_us": round(latencies[-1] / 1000, 3),
+        "ops_per_second": round(calls / total, 1) if total else None,
+    }
+
+
+@contextlib.contextmanager
+def expect_analyses(sources: List[str], expected: int):
+    """Fail unless expected analyses came from sources and none fell back
+
+    A broken patch of the crew makes analyze_business fall back to the
+    heuristics silently, which would time the wrong code path.
+    """
+
+    def counts():
+        return [
+            METRICS.value("market_research_analyses_total", source=source)
+            for source in sources + ["fallback"]
+        ]
+
+    before = counts()
+    yield
+    *done, fallbacks = (after - start for after, start in zip(counts(), before))
+    if fallbacks or sum(done) < expected:
+        raise RuntimeError(
+            f"expected {expected} analyses from {'/'.join(sources)}, got "
+            f"{sum(done):.0f} and {fallbacks:.0f} fallbacks; the benchmark is "
+            "not timing the path it reports"
+        )
+
+
+@contextlib.contextmanager
+def expect_no_throttling(limiter: RateLimiter, max_wait: float = 0.01):
+    """Fail if any call waited in the rate limiter
+
+    Waiting for budget would time the limiter's sleeps instead of the
+    pipeline, and the figures would drift with the limiter's settings.
+    """
+    before = limiter.metrics()
+    yield
+    after = limiter.metrics()
+    if after["throttled"] > before["throttled"] or after["max_wait_seconds"] > max_wait:
+        raise RuntimeError(
+            f"calls waited up to {after['max_wait_seconds']:.3f}s in the rate "
+            "limiter; the benchmark is not timing the path it reports"
+        )
+
+
+def run_benchmarks(corpus: List[str], repeat: int = 3) -> Dict[str, Dict]:
+    """Run every benchmark against the corpus"""
+    workdir = tempfile.mkdtemp(prefix="market_research_bench_")
+    cache = ResponseCache(os.path.join(workdir, "cache.sqlite3"))
+    agent = MarketResearchAgent(
+        cache=cache,
+        offline=True,
+        checkpoints=CheckpointStore(os.path.join(workdir, "checkpoints.sqlite3")),
+        similarity=SimilarityIndex(os.path.join(workdir, "similarity.sqlite3")),
+        # Budgets no run can exhaust, so only the pipeline is timed
+        rate_limiter=RateLimiter(
+            requests_per_minute=10**9, tokens_per_minute=10**12, max_concurrency=64
+        ),
+    )
+    results = [agent._create_fallback_analysis(d) for d in corpus]
+    report_paths = iter(
+        os.path.join(workdir, f"report_{i}.json") for i in range(len(corpus) * repeat)
+    )
+    sink = io.StringIO()
+
+    def quiet(fn):
+        def call(item):
+            with contextlib.redirect_stdout(sink):
+                fn(item)
+            sink.seek(0)
+            sink.truncate()
+
+        return call
+
+    benchmarks = {
+        "extract_features": (agent.extract_features, corpus),
+        "extract_industry": (agent._extract_industry, corpus),
+        "estimate_business_size": (agent._estimate_business_size, corpus),
+        "estimate_revenue": (agent._estimate_revenue, corpus),
+        "create_fallback_analysis": (agent._create_fallback_analysis, corpus),
+        "print_analysis_report": (quiet(print_analysis_report), results),
+        "render_markdown": (ReportRenderer("markdown").render, results),
+        "render_html": (ReportRenderer("html").render, results),
+        "save_report": (
+            quiet(lambda result: save_report(result, next(report_paths))),
+            results,
+        ),
+    }
+
+    stats = {}
+    for name, (fn, items) in benchmarks.items():
+        print(f"   ⏱️  {name}...")
+        stats[name] = time_calls(fn, items, repeat)
+
+    # The full online path with the crew replaced by canned responses
+    print("   ⏱️  analyze_business (mocked LLM)...")
+    agent.offline = False
+    with mock.patch.object(
+        agent, "_kickoff_crew", side_effect=canned_crew_outputs
+    ), expect_no_throttling(agent.rate_limiter):
+        with expect_analyses(["crew"], len(corpus) * repeat):
+            stats["analyze_business_mocked"] = time_calls(
+                quiet(lambda d: agent.analyze_business(d, use_cache=False)),
+                corpus,
+                repeat,
+            )
+        cache.clear()
+        with expect_analyses(["crew", "cache", "similar"], len(corpus) * repeat):
+            stats["analyze_business_cached"] = time_calls(
+                quiet(agent.analyze_business), corpus, repeat
+            )
+
+    for path in os.listdir(workdir):
+        os.remove(os.path.join(workdir, path))
+    os.rmdir(workdir)
+    return stats
+
+
+def git_revision() -> str:
+    """Current commit hash, if the benchmark runs from a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """List benchmarks whose mean latency regressed beyond threshold percent"""
+    regressions = []
+    for name, stats in current["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if not before:
+            continue
+        change = (stats["mean_us"] - before["mean_us"]) / before["mean_us"] * 100
+        marker = "⚠️ " if change > threshold else "  "
+        print(
+            f"{marker} {name:<28} {before['mean_us']:>10.1f} → "
+            f"{stats['mean_us']:>10.1f} µs ({change:+.1f}%)"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: List[str] = None):
+    """Run the suite and write machine-readable results"""
+    parser = argparse.ArgumentParser(description="Market research agent benchmarks")
+    parser.add_argument("--size", type=int, default=1000, help="corpus size")
+    parser.add_argument("--seed", type=int, default=42, help="corpus seed")
+    parser.add_argument("--repeat", type=int, default=3, help="passes per benchmark")
+    parser.add_argument(
+        "--output", metavar="FILE", help="results file (default: timestamped)"
+    )
+    parser.add_argument(
+        "--compare", metavar="FILE", help="baseline results to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="percent slowdown that counts as a regression (default: 10)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Generating {args.size} business descriptions (seed {args.seed})")
+    corpus = generate_corpus(args.size, args.seed)
+
+    print("🔄 Running benchmarks...")
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus_size": args.size,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "benchmarks": run_benchmarks(corpus, args.repeat),
+    }
+
+    output = args.output or datetime.now().strftime("benchmark_%Y%m%d_%H%M%S.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Benchmark results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Compared with {args.compare} ({baseline.get('revision')})")
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,33 +5,90 @@ Perfect for client discovery calls and business opportunity assessments.
 """
 
 import os
+import re
+import csv
+import gzip
+import html
 import json
+import queue
+import random
+import time
+import zlib
+import bisect
+import sqlite3
+import hashlib
+import threading
+import asyncio
+import argparse
+import functools
+import itertools
+import contextlib
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime
-from typing import Dict, List
-from dataclasses import dataclass, asdict
+from multiprocessing import shared_memory
+from typing import (
+    AsyncIterator,
+    Callable,
+    Container,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+from dataclasses import dataclass, asdict, replace
 
-# Import AI frameworks
-try:
-    from crewai import Agent, Task, Crew
-    from langchain_openai import ChatOpenAI
-
-    print("✅ AI packages imported successfully!")
-except ImportError as e:
-    print(f"❌ Error importing required packages: {e}")
-    print("Please run: pip install crewai langchain-openai python-dotenv")
-    exit(1)
+# Heavy dependencies are imported on first use so that heuristic-only
+# workers and CLI startup only pay for the standard library
+Agent = Task = Crew = ChatOpenAI = None
+np = None
 
 # Load environment variables
 try:
     from dotenv import load_dotenv
 
     load_dotenv()
-    print("✅ Environment variables loaded!")
 except ImportError:
-    print("⚠️ python-dotenv not found, using OS environment variables")
     pass
 
 
+def _import_ai_frameworks():
+    """Import CrewAI and LangChain the first time an LLM agent is built"""
+    global Agent, Task, Crew, ChatOpenAI
+    if ChatOpenAI is not None:
+        return
+    try:
+        from crewai import Agent, Task, Crew
+        from langchain_openai import ChatOpenAI
+    except ImportError as e:
+        raise ImportError(
+            f"{e}. Please run: pip install crewai langchain-openai python-dotenv"
+        ) from e
+
+
+def _import_numpy():
+    """Import NumPy the first time the ROI engine runs"""
+    global np
+    if np is not None:
+        return np
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(f"{e}. Please run: pip install -r requirements.txt") from e
+    np = numpy
+    return np
+
+
 @dataclass
 class BusinessProfile:
     """Structure for business information"""
@@ -59,6 +116,16 @@ class ProcessAnalysis:
     implementation_difficulty: str
 
 
+@dataclass
+class RoiSimulation:
+    """Percentile risk bands from a Monte Carlo ROI simulation"""
+
+    draws: int
+    roi_percentiles: Dict[str, float]
+    payback_percentiles: Dict[str, float]
+    payback_within_12_months: float
+
+
 @dataclass
 class MarketResearchResult:
     """Complete market research analysis result"""
@@ -70,847 +137,4828 @@ class MarketResearchResult:
     implementation_roadmap: List[str]
     investment_range: str
     payback_months: int
+    roi_simulation: Optional[RoiSimulation] = None
 
 
-class MarketResearchAgent:
-    """AI-powered market research and opportunity analysis agent"""
+@dataclass
+class BatchItemResult:
+    """Outcome of a single description within a batch run"""
 
-    def __init__(self, api_key: str = None):
-        """Initialize the agent with OpenAI API key"""
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key or self.api_key == "sk-your-key-here":
-            print("❌ Error: OpenAI API key not configured!")
-            print("Please edit the .env file and add your actual OpenAI API key")
-            print("Get your key from: https://platform.openai.com/api-keys")
-            exit(1)
+    index: int
+    description: str
+    result: Optional[MarketResearchResult] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class AnalysisEvent:
+    """One step of a streamed analysis
+
+    kind is one of status, task_started, token, field, item,
+    task_completed or result. value holds the status text, token text,
+    validated field or item, raw task output, or the final result.
+    """
+
+    kind: str
+    task: Optional[str] = None
+    name: Optional[str] = None
+    value: object = None
+
+
+def _run_batch_item(
+    analyze: Callable[[str], MarketResearchResult], index: int, description: str
+) -> BatchItemResult:
+    """Run one batch item, capturing any failure in the item's error slot"""
+    try:
+        return BatchItemResult(index, description, result=analyze(description))
+    except Exception as e:
+        return BatchItemResult(index, description, error=f"{type(e).__name__}: {e}")
 
+
+def _run_batch_chunk(
+    analyze: Callable[[str], MarketResearchResult],
+    start: int,
+    descriptions: List[str],
+) -> List[BatchItemResult]:
+    """Run a chunk of batch items one at a time"""
+    return [
+        _run_batch_item(analyze, start + offset, description)
+        for offset, description in enumerate(descriptions)
+    ]
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Split an iterable into (start index, chunk) pairs without materializing it"""
+    iterator = iter(items)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _unskipped(
+    items: List[BatchItemResult], skip: Container[int]
+) -> Iterator[BatchItemResult]:
+    """Batch items whose index is not in skip"""
+    return (item for item in items if item.index not in skip)
+
+
+def _run_portfolio_chunk(
+    agent: "MarketResearchAgent",
+    start: int,
+    descriptions: List[str],
+    simulation: "SimulationConfig" = None,
+) -> List[BatchItemResult]:
+    """Run a chunk through the vectorized heuristic path
+
+    If the chunk as a whole fails, its items are retried one by one so the
+    failure lands only in the error slots of the items that caused it.
+    """
+    try:
+        results, _ = agent.analyze_portfolio(descriptions, simulation=simulation)
+    except Exception:
+        analyze = functools.partial(agent.analyze_heuristic, simulation=simulation)
+        return _run_batch_chunk(analyze, start, descriptions)
+    return [
+        BatchItemResult(start + offset, d, result=result)
+        for offset, (d, result) in enumerate(zip(descriptions, results))
+    ]
+
+
+def _score_shard(
+    agent: "MarketResearchAgent",
+    block_name: str,
+    block_rows: int,
+    width: int,
+    offset: int,
+    start: int,
+    descriptions: List[str],
+) -> List[Tuple[int, str]]:
+    """Score a shard and write its rows into a shared ROI block
+
+    Returns the (index, error) pairs of descriptions that failed; their rows
+    keep a template code of -1.
+    """
+    np = _import_numpy()
+    codes = _template_codes(load_industry_templates())
+    templates, revenues, rows, template_codes, errors = [], [], [], [], []
+    for position, description in enumerate(descriptions):
         try:
-            self.llm = ChatOpenAI(
-                model="gpt-4o-mini",  # Cost-effective model
-                temperature=0.3,
-                api_key=self.api_key,
-            )
-            print("✅ AI model initialized successfully!")
+            features = agent.extract_features(description)
+            template = agent._select_template(features)
         except Exception as e:
-            print(f"❌ Error initializing AI model: {e}")
-            print("Please check your API key and internet connection")
-            exit(1)
+            errors.append((start + position, f"{type(e).__name__}: {e}"))
+            continue
+        templates.append(template)
+        revenues.append(features.revenue)
+        rows.append(offset + position)
+        template_codes.append(codes[template.key])
 
-    def create_research_crew(self) -> Crew:
-        """Create the multi-agent research crew"""
+    arrays = compute_roi_arrays(templates, revenues)
+    block = SharedRoiBlock(block_rows, width, name=block_name)
+    try:
+        block.write(np.asarray(rows, dtype=np.int64), arrays, template_codes)
+    finally:
+        block.close()
+    return errors
 
-        # Market Research Analyst
-        researcher = Agent(
-            role="Senior Market Research Analyst",
-            goal="Analyze business operations and identify AI automation opportunities",
-            backstory="""You are an expert business analyst with 15+ years experience in 
-                        operational efficiency and technology implementations. You specialize 
-                        in identifying high-impact automation opportunities and quantifying 
-                        business value.""",
-            llm=self.llm,
-            verbose=False,
-        )
-
-        # Business Process Expert
-        process_expert = Agent(
-            role="Business Process Optimization Specialist",
-            goal="Evaluate current processes and design automation solutions",
-            backstory="""You are a certified Six Sigma Black Belt with extensive experience 
-                        in process improvement and automation. You can quickly identify 
-                        bottlenecks, inefficiencies, and automation opportunities in any 
-                        business process.""",
-            llm=self.llm,
-            verbose=False,
-        )
-
-        # ROI Calculator
-        roi_analyst = Agent(
-            role="Financial ROI Analyst",
-            goal="Calculate accurate ROI projections and business impact",
-            backstory="""You are a financial analyst specializing in technology ROI calculations.
-                        You have deep experience in cost-benefit analysis, payback period 
-                        calculations, and business case development for automation projects.""",
-            llm=self.llm,
-            verbose=False,
-        )
-
-        return Crew(agents=[researcher, process_expert, roi_analyst], verbose=False)
-
-    def analyze_business(self, business_description: str) -> MarketResearchResult:
-        """Perform comprehensive business analysis"""
-
-        print("🤖 Starting AI analysis...")
-        print("   Initializing research agents...")
 
-        try:
-            crew = self.create_research_crew()
-
-            # Market Research Task
-            research_task = Task(
-                description=f"""
-                Analyze this business and identify automation opportunities:
-                
-                Business Description: {business_description}
-                
-                Your analysis should include:
-                1. Business classification (industry, size, revenue estimate)
-                2. Identification of 3-5 most time-consuming manual processes
-                3. Assessment of current operational costs and inefficiencies
-                4. Preliminary automation opportunity assessment
-                
-                Focus on quantifiable, high-impact areas where AI agents could provide immediate value.
-                Be specific about time spent on each process and current business impact.
-                """,
-                agent=crew.agents[0],
-                expected_output="Structured business analysis with process identification and initial opportunity assessment",
-            )
-
-            # Process Analysis Task
-            process_task = Task(
-                description="""
-                Based on the business analysis, perform detailed process evaluation:
-                
-                For each identified process, analyze:
-                1. Current time investment (hours/week, cost/year)
-                2. Complexity level (1-5 scale)
-                3. Automation potential (High/Medium/Low)
-                4. Specific AI solutions that could address this process
-                5. Implementation complexity and timeline
-                
-                Prioritize processes by ROI potential and implementation feasibility.
-                """,
-                agent=crew.agents[1],
-                expected_output="Detailed process analysis with automation recommendations and priority ranking",
-            )
-
-            # ROI Calculation Task
-            roi_task = Task(
-                description="""
-                Calculate comprehensive ROI analysis for the identified opportunities:
-                
-                For the top 3 processes, calculate:
-                1. Current annual cost (time * hourly rate + opportunity cost)
-                2. Potential automation savings (% reduction in time/cost)
-                3. Implementation investment required
-                4. Payback period and 3-year ROI
-                5. Risk factors and mitigation strategies
-                
-                Provide conservative, realistic, and optimistic scenarios.
-                Include specific dollar amounts and percentages.
-                """,
-                agent=crew.agents[2],
-                expected_output="Detailed ROI calculations with investment recommendations and financial projections",
-            )
-
-            # Execute the analysis
-            crew.tasks = [research_task, process_task, roi_task]
-
-            print("   Agents analyzing business processes...")
-            print("   Calculating ROI projections...")
-
-            result = crew.kickoff()
+# Keyword tables, in priority order: the first industry with a match wins
+INDUSTRY_KEYWORDS = {
+    "banking": [
+        "bank",
+        "banking",
+        "financial services",
+        "finance",
+        "credit union",
+        "lending",
+    ],
+    "legal": ["law", "legal", "attorney", "lawyer", "court", "litigation"],
+    "consulting": ["consultant", "consulting", "advisory", "strategy"],
+    "real_estate": ["real estate", "property", "realtor", "housing"],
+    "healthcare": [
+        "medical",
+        "healthcare",
+        "clinic",
+        "doctor",
+        "patient",
+        "hospital",
+    ],
+    "manufacturing": ["manufacturing", "production", "factory", "assembly"],
+    "marketing": ["marketing", "advertising", "digital", "social media"],
+    "accounting": ["accounting", "bookkeeping", "tax", "cpa"],
+    "insurance": ["insurance", "underwriting", "claims", "actuarial"],
+    "retail": ["retail", "store", "shopping", "merchandise"],
+    "technology": ["software", "tech", "it", "development", "saas"],
+    "education": ["education", "school", "university", "training"],
+}
 
-            # Parse and structure the results
-            return self._parse_analysis_result(result, business_description)
+# Size keywords tracked alongside the industry table
+SIGNAL_KEYWORDS = [
+    "solo",
+    "freelance",
+    "independent",
+    "small",
+    "startup",
+    "mid-size",
+    "medium",
+    "large",
+    "enterprise",
+    "corporation",
+]
 
-        except Exception as e:
-            print(f"❌ Error during AI analysis: {e}")
-            print("Creating fallback analysis...")
-            return self._create_fallback_analysis(business_description)
+# Words that mark a nearby bare "10b" or "2.5m" as a revenue figure
+REVENUE_KEYWORDS = ["revenue", "sales", "turnover", "income"]
 
-    def _create_fallback_analysis(
-        self, business_description: str
-    ) -> MarketResearchResult:
-        """Create a fallback analysis if AI fails"""
+EMPLOYEE_UNITS = ("employees", "people", "staff")
+BILLION_UNITS = ("billion", "b")
+MILLION_UNITS = ("million", "m")
 
-        business_profile = BusinessProfile(
-            name="Client Business",
-            industry=self._extract_industry(business_description),
-            size=self._estimate_business_size(business_description),
-            revenue_range=self._estimate_revenue(business_description),
-            description=business_description,
-            pain_points=[
-                "Manual processes",
-                "Time-intensive tasks",
-                "Operational inefficiencies",
-            ],
-            current_processes=[
-                "Research tasks",
-                "Report generation",
-                "Communication management",
-            ],
-        )
 
-        # Create realistic process analyses based on business type
-        if (
-            "marketing" in business_description.lower()
-            or "consultant" in business_description.lower()
-        ):
-            process_analyses = [
-                ProcessAnalysis(
-                    name="Client Research & Market Analysis",
-                    time_percentage=40.0,
-                    complexity_score=3,
-                    automation_potential="High",
-                    current_cost_annual=48000,
-                    potential_savings=33600,
-                    roi_percentage=70.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Proposal and Content Creation",
-                    time_percentage=30.0,
-                    automation_potential="High",
-                    complexity_score=4,
-                    current_cost_annual=36000,
-                    potential_savings=28800,
-                    roi_percentage=80.0,
-                    implementation_difficulty="Low",
-                ),
-                ProcessAnalysis(
-                    name="Client Communication & Reporting",
-                    time_percentage=20.0,
-                    complexity_score=2,
-                    automation_potential="Medium",
-                    current_cost_annual=24000,
-                    potential_savings=14400,
-                    roi_percentage=60.0,
-                    implementation_difficulty="Low",
-                ),
-            ]
-        else:
-            # Generic business processes
-            process_analyses = [
-                ProcessAnalysis(
-                    name="Research & Data Collection",
-                    time_percentage=35.0,
-                    complexity_score=3,
-                    automation_potential="High",
-                    current_cost_annual=52500,
-                    potential_savings=36750,
-                    roi_percentage=70.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Report and Document Generation",
-                    time_percentage=25.0,
-                    automation_potential="High",
-                    complexity_score=4,
-                    current_cost_annual=37500,
-                    potential_savings=30000,
-                    roi_percentage=80.0,
-                    implementation_difficulty="Low",
-                ),
-                ProcessAnalysis(
-                    name="Administrative Tasks",
-                    time_percentage=20.0,
-                    complexity_score=2,
-                    automation_potential="Medium",
-                    current_cost_annual=30000,
-                    potential_savings=18000,
-                    roi_percentage=60.0,
-                    implementation_difficulty="Low",
-                ),
-            ]
+@dataclass
+class DescriptionFeatures:
+    """Facts extracted from a business description in a single scan"""
 
-        # Calculate overall metrics
-        total_current_cost = sum(p.current_cost_annual for p in process_analyses)
-        total_savings = sum(p.potential_savings for p in process_analyses)
-        implementation_cost = total_current_cost * 0.25  # Assume 25% of annual cost
-        overall_roi = (
-            (total_savings / implementation_cost) * 100
-            if implementation_cost > 0
-            else 0
-        )
+    industry: str
+    employee_count: Optional[int]
+    size: str
+    revenue: float
+    revenue_range: str
+    keywords: FrozenSet[str]
+    industry_matched: bool = False  # An industry keyword was found
+    revenue_stated: bool = False  # A revenue amount was found
 
-        recommended_solution = {
-            "approach": "Multi-Agent Business Automation Platform",
-            "components": ["Research Agent", "Content Generator", "Communication Bot"],
-            "timeline": "8-12 weeks",
-            "investment": f"${implementation_cost:,.0f} - ${implementation_cost * 1.5:,.0f}",
-        }
+    def mentions(self, *words: str) -> bool:
+        """Check whether any of the given keywords occur in the description"""
+        return any(word in self.keywords for word in words)
 
-        implementation_roadmap = [
-            "Week 1-2: Discovery and requirements gathering",
-            "Week 3-4: Agent design and architecture planning",
-            "Week 5-8: Core agent development and testing",
-            "Week 9-10: Integration and system testing",
-            "Week 11-12: Deployment and user training",
+
+def _keyword_trie_branches(keywords: List[str]) -> List[str]:
+    """Build prefix-factored regex branches, one per leading character
+
+    Each branch matches the longest keyword under its first character, and
+    every branch starts with a literal so the regex engine can skip ahead to
+    candidate characters without trying each alternative.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
         ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
 
-        return MarketResearchResult(
-            business_profile=business_profile,
-            process_analyses=process_analyses,
-            overall_roi=overall_roi,
-            recommended_solution=recommended_solution,
-            implementation_roadmap=implementation_roadmap,
-            investment_range=recommended_solution["investment"],
-            payback_months=int(
-                (implementation_cost / (total_savings / 12))
-                if total_savings > 0
-                else 12
-            ),
+    return [re.escape(char) + build(child) for char, child in trie.items()]
+
+
+class DescriptionFeatureExtractor:
+    """Precompiled single-pass extractor for business descriptions
+
+    Every keyword and number shape lives in one prefix trie compiled into a
+    single regex, so a scan costs one pass over the text no matter how many
+    industries the table holds. Keywords keep their substring semantics:
+    overlaps are resolved from tables precomputed per keyword rather than by
+    rescanning.
+    """
+
+    def __init__(
+        self,
+        industry_keywords: Dict[str, List[str]] = None,
+        signal_keywords: List[str] = None,
+    ):
+        industry_keywords = industry_keywords or INDUSTRY_KEYWORDS
+        signal_keywords = signal_keywords or SIGNAL_KEYWORDS
+
+        self._industries = [industry.title() for industry in industry_keywords]
+        priorities: Dict[str, int] = {}
+        for priority, keywords in enumerate(industry_keywords.values()):
+            for keyword in keywords:
+                priorities.setdefault(keyword, priority)
+        vocabulary = sorted(
+            set(priorities) | set(signal_keywords) | set(REVENUE_KEYWORDS)
         )
+        starts: Dict[str, List[str]] = {}
+        for keyword in vocabulary:
+            starts.setdefault(keyword[0], []).append(keyword)
 
-    def _parse_analysis_result(
-        self, raw_result: str, business_description: str
-    ) -> MarketResearchResult:
-        """Parse the raw agent result into structured data"""
-        # For now, use the fallback - in production you'd parse the LLM output
-        return self._create_fallback_analysis(business_description)
+        # A match only reports the longest keyword at its position, so fold
+        # in every keyword it contains and find the first offset where a
+        # longer keyword could start inside it and run past its end
+        self._matches: Dict[str, Tuple[FrozenSet[str], int, int, bool]] = {}
+        for keyword in vocabulary:
+            contained = set()
+            resume = len(keyword)
+            for offset in range(len(keyword)):
+                tail = keyword[offset:]
+                for other in starts.get(keyword[offset], ()):
+                    if tail.startswith(other):
+                        contained.add(other)
+                    elif offset and other.startswith(tail):
+                        resume = min(resume, offset)
+            best = min(
+                (priorities[k] for k in contained if k in priorities), default=-1
+            )
+            revenue = any(k in contained for k in REVENUE_KEYWORDS)
+            self._matches[keyword] = (frozenset(contained), best, resume, revenue)
 
-    def _extract_industry(self, description: str) -> str:
-        """Extract industry from business description with better coverage"""
-        description_lower = description.lower()
-
-        industry_keywords = {
-            "banking": [
-                "bank",
-                "banking",
-                "financial services",
-                "finance",
-                "credit union",
-                "lending",
-            ],
-            "legal": ["law", "legal", "attorney", "lawyer", "court", "litigation"],
-            "consulting": ["consultant", "consulting", "advisory", "strategy"],
-            "real_estate": ["real estate", "property", "realtor", "housing"],
-            "healthcare": [
-                "medical",
-                "healthcare",
-                "clinic",
-                "doctor",
-                "patient",
-                "hospital",
-            ],
-            "manufacturing": ["manufacturing", "production", "factory", "assembly"],
-            "marketing": ["marketing", "advertising", "digital", "social media"],
-            "accounting": ["accounting", "bookkeeping", "tax", "cpa"],
-            "insurance": ["insurance", "underwriting", "claims", "actuarial"],
-            "retail": ["retail", "store", "shopping", "merchandise"],
-            "technology": ["software", "tech", "it", "development", "saas"],
-            "education": ["education", "school", "university", "training"],
-        }
+        number = r"[\d,]*(?:\.\d+)?"
+        branches = _keyword_trie_branches(vocabulary)
+        branches.append(r"\$\d" + number)
+        branches.extend(f"{digit}{number}" for digit in range(10))
+        self._pattern = re.compile("|".join(branches))
+        self._unit_pattern = re.compile(
+            r"\s*("
+            + "|".join(EMPLOYEE_UNITS + ("billion", "million", r"b\b", r"m\b"))
+            + ")"
+        )
 
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return industry.title()
+    def extract(self, description: str) -> DescriptionFeatures:
+        """Scan a description once and derive every feature from the matches"""
+        text = description.lower()
+        search = self._pattern.search
+        keywords = set()
+        industry_priority = len(self._industries)
+        employee_count = None
+        amounts: Dict[str, float] = {}
+        revenue_context = False
 
-        return "Professional Services"
+        match = search(text)
+        while match is not None:
+            token = match.group()
+            if token in self._matches:
+                contained, priority, resume, revenue = self._matches[token]
+                keywords.update(contained)
+                revenue_context = revenue_context or revenue
+                if 0 <= priority < industry_priority:
+                    industry_priority = priority
+                match = search(text, match.start() + resume)
+                continue
 
-    def _estimate_business_size(self, description: str) -> str:
-        """Estimate business size with proper enterprise scaling"""
-        description_lower = description.lower()
-
-        # Look for employee numbers first
-        import re
-
-        employee_matches = re.findall(
-            r"(\d{1,6})\s*(?:employees|people|staff)", description_lower
-        )
-        if employee_matches:
-            emp_count = int(employee_matches[0])
-            if emp_count >= 10000:
-                return f"Large Enterprise ({emp_count:,} employees)"
-            elif emp_count >= 1000:
-                return f"Mid-Large Enterprise ({emp_count:,} employees)"
-            elif emp_count >= 500:
-                return f"Mid-Market ({emp_count:,} employees)"
-            elif emp_count >= 100:
-                return f"Small-Mid Market ({emp_count:,} employees)"
-            elif emp_count >= 20:
-                return f"Small Business ({emp_count} employees)"
+            end = match.end()
+            unit = self._unit_pattern.match(text, end)
+            unit = unit.group(1) if unit else None
+            if token[0] == "$":
+                # A dollar figure is never a headcount
+                if unit is None or unit in EMPLOYEE_UNITS:
+                    unit = "$"
+            elif unit in ("b", "m") and not revenue_context:
+                # Bare "10b" or "2.5m" only counts after a revenue keyword
+                unit = None
+            if unit is not None and unit not in amounts:
+                try:
+                    amounts[unit] = float(token.lstrip("$").replace(",", ""))
+                except ValueError:
+                    pass
+                else:
+                    if unit in EMPLOYEE_UNITS and employee_count is None:
+                        employee_count = int(amounts[unit])
+            match = search(text, end)
+
+        keywords = frozenset(keywords)
+        if industry_priority < len(self._industries):
+            industry = self._industries[industry_priority]
+        else:
+            industry = "Professional Services"
+
+        return DescriptionFeatures(
+            industry=industry,
+            employee_count=employee_count,
+            size=self._size_bracket(employee_count, keywords),
+            revenue=self._revenue_number(amounts, keywords),
+            revenue_range=self._revenue_range(amounts, keywords),
+            keywords=keywords,
+            industry_matched=industry_priority < len(self._industries),
+            revenue_stated=any(
+                unit in amounts for unit in BILLION_UNITS + MILLION_UNITS + ("$",)
+            ),
+        )
+
+    @staticmethod
+    def _size_bracket(employee_count: Optional[int], keywords: FrozenSet[str]) -> str:
+        """Map an employee count, or failing that size keywords, to a bracket"""
+        if employee_count is not None:
+            if employee_count >= 10000:
+                return f"Large Enterprise ({employee_count:,} employees)"
+            elif employee_count >= 1000:
+                return f"Mid-Large Enterprise ({employee_count:,} employees)"
+            elif employee_count >= 500:
+                return f"Mid-Market ({employee_count:,} employees)"
+            elif employee_count >= 100:
+                return f"Small-Mid Market ({employee_count:,} employees)"
             else:
-                return f"Small Business ({emp_count} employees)"
+                return f"Small Business ({employee_count} employees)"
 
-        # Fallback to keyword detection
-        if any(
-            word in description_lower for word in ["solo", "freelance", "independent"]
-        ):
+        if keywords & {"solo", "freelance", "independent"}:
             return "Solo/Freelance"
-        elif any(word in description_lower for word in ["small", "startup"]):
+        elif keywords & {"small", "startup"}:
             return "Small Business (2-50 employees)"
-        elif any(word in description_lower for word in ["mid-size", "medium"]):
+        elif keywords & {"mid-size", "medium"}:
             return "Mid-Market (51-500 employees)"
-        elif any(
-            word in description_lower for word in ["large", "enterprise", "corporation"]
-        ):
+        elif keywords & {"large", "enterprise", "corporation"}:
             return "Large Enterprise (1000+ employees)"
         else:
             return "Small-Medium Business"
 
-    def _estimate_revenue(self, description: str) -> str:
-        """Estimate revenue range with enterprise brackets"""
-        description_lower = description.lower()
-
-        # Look for revenue numbers first
-        import re
-
-        # Match patterns like "$4.39 billion", "4.39B", "$500M", etc.
-        revenue_patterns = [
-            r"\$?(\d+\.?\d*)\s*billion",
-            r"\$?(\d+\.?\d*)\s*b\b",
-            r"\$?(\d+\.?\d*)\s*million",
-            r"\$?(\d+\.?\d*)\s*m\b",
-            r"\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)",
-        ]
+    @staticmethod
+    def _revenue_number(amounts: Dict[str, float], keywords: FrozenSet[str]) -> float:
+        """Pick the numeric annual revenue used for cost modelling"""
+        for unit in BILLION_UNITS:
+            if unit in amounts:
+                return amounts[unit] * 1000000000
+        for unit in MILLION_UNITS:
+            if unit in amounts:
+                return amounts[unit] * 1000000
+        if "$" in amounts:
+            return amounts["$"]
+
+        # Default based on business size
+        if keywords & {"large", "enterprise"}:
+            return 500000000  # $500M default for large enterprises
+        elif "small" in keywords:
+            return 2000000  # $2M default for small business
+        else:
+            return 10000000  # $10M default
 
-        for pattern in revenue_patterns:
-            matches = re.findall(pattern, description_lower)
-            if matches:
-                amount = float(matches[0].replace(",", ""))
-
-                if "billion" in description_lower or "b" in description_lower:
-                    if amount >= 10:
-                        return f"${amount}B+ (Large Enterprise)"
-                    elif amount >= 1:
-                        return f"${amount}B (Enterprise)"
-                    else:
-                        return f"${amount*1000}M (Large Corporate)"
-
-                elif "million" in description_lower or "m" in description_lower:
-                    if amount >= 500:
-                        return f"${amount}M+ (Large Corporate)"
-                    elif amount >= 100:
-                        return f"${amount}M (Mid-Large Market)"
-                    elif amount >= 10:
-                        return f"${amount}M (Mid-Market)"
-                    else:
-                        return f"${amount}M (Small-Mid Market)"
+    @staticmethod
+    def _revenue_range(amounts: Dict[str, float], keywords: FrozenSet[str]) -> str:
+        """Describe the stated revenue as an enterprise bracket"""
+        for unit in BILLION_UNITS:
+            if unit in amounts:
+                amount = amounts[unit]
+                if amount >= 10:
+                    return f"${amount}B+ (Large Enterprise)"
+                elif amount >= 1:
+                    return f"${amount}B (Enterprise)"
+                else:
+                    return f"${amount*1000}M (Large Corporate)"
 
+        for unit in MILLION_UNITS:
+            if unit in amounts:
+                amount = amounts[unit]
+                if amount >= 500:
+                    return f"${amount}M+ (Large Corporate)"
+                elif amount >= 100:
+                    return f"${amount}M (Mid-Large Market)"
+                elif amount >= 10:
+                    return f"${amount}M (Mid-Market)"
                 else:
-                    # Raw dollar amount
-                    if amount >= 1000000000:
-                        return f"${amount/1000000000:.1f}B (Enterprise)"
-                    elif amount >= 1000000:
-                        return f"${amount/1000000:.0f}M (Corporate)"
-                    else:
-                        return f"${amount:,.0f} (Small Business)"
+                    return f"${amount}M (Small-Mid Market)"
+
+        if "$" in amounts:
+            # Raw dollar amount
+            amount = amounts["$"]
+            if amount >= 1000000000:
+                return f"${amount/1000000000:.1f}B (Enterprise)"
+            elif amount >= 1000000:
+                return f"${amount/1000000:.0f}M (Corporate)"
+            else:
+                return f"${amount:,.0f} (Small Business)"
 
         # Fallback based on business size keywords
-        if any(word in description_lower for word in ["solo", "freelance"]):
+        if keywords & {"solo", "freelance"}:
             return "$100K - $500K"
-        elif any(word in description_lower for word in ["small", "startup"]):
+        elif keywords & {"small", "startup"}:
             return "$500K - $10M"
-        elif any(
-            word in description_lower for word in ["enterprise", "corporation", "large"]
-        ):
+        elif keywords & {"enterprise", "corporation", "large"}:
             return "$100M+"
         else:
             return "$1M - $50M"
 
-    def _create_fallback_analysis(
-        self, business_description: str
-    ) -> MarketResearchResult:
-        """Create industry-specific analysis based on business type"""
-
-        business_profile = BusinessProfile(
-            name="Client Business",
-            industry=self._extract_industry(business_description),
-            size=self._estimate_business_size(business_description),
-            revenue_range=self._estimate_revenue(business_description),
-            description=business_description,
-            pain_points=[
-                "Manual processes",
-                "Time-intensive tasks",
-                "Operational inefficiencies",
-            ],
-            current_processes=[
-                "Research tasks",
-                "Report generation",
-                "Communication management",
-            ],
-        )
 
-        # Industry-specific process analysis
-        industry = business_profile.industry.lower()
-
-        if industry == "banking":
-            # Banking-specific processes and costs
-            annual_revenue = self._extract_revenue_number(business_description)
-            base_cost = max(
-                annual_revenue * 0.15, 50000000
-            )  # At least 15% of revenue or $50M
-
-            process_analyses = [
-                ProcessAnalysis(
-                    name="Regulatory Compliance & Reporting",
-                    time_percentage=40.0,
-                    complexity_score=5,
-                    automation_potential="High",
-                    current_cost_annual=base_cost * 0.4,
-                    potential_savings=base_cost * 0.4 * 0.6,  # 60% savings potential
-                    roi_percentage=60.0,
-                    implementation_difficulty="High",
-                ),
-                ProcessAnalysis(
-                    name="Risk Management & Data Analysis",
-                    time_percentage=25.0,
-                    automation_potential="High",
-                    complexity_score=4,
-                    current_cost_annual=base_cost * 0.25,
-                    potential_savings=base_cost * 0.25 * 0.7,  # 70% savings
-                    roi_percentage=70.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Customer Due Diligence & KYC",
-                    time_percentage=20.0,
-                    complexity_score=4,
-                    automation_potential="High",
-                    current_cost_annual=base_cost * 0.20,
-                    potential_savings=base_cost * 0.20 * 0.8,  # 80% savings
-                    roi_percentage=80.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Cybersecurity Monitoring & Response",
-                    time_percentage=15.0,
-                    complexity_score=5,
-                    automation_potential="Medium",
-                    current_cost_annual=base_cost * 0.15,
-                    potential_savings=base_cost * 0.15 * 0.5,  # 50% savings
-                    roi_percentage=50.0,
-                    implementation_difficulty="High",
-                ),
-            ]
+FEATURE_EXTRACTOR = DescriptionFeatureExtractor()
 
-            recommended_solution = {
-                "approach": "Enterprise AI Compliance & Risk Management Platform",
-                "components": [
-                    "Regulatory Reporting Agent",
-                    "Risk Analysis Engine",
-                    "KYC Automation",
-                    "Cybersecurity Monitor",
-                ],
-                "timeline": "18-24 months (phased implementation)",
-                "investment": f"${base_cost * 0.3 / 1000000:.1f}M - ${base_cost * 0.5 / 1000000:.1f}M",
-            }
 
-        elif (
-            "marketing" in business_description.lower()
-            or "consultant" in business_description.lower()
-        ):
-            # Marketing consulting processes
-            annual_revenue = self._extract_revenue_number(business_description)
-            base_cost = max(annual_revenue * 0.6, 60000)  # Labor-intensive business
-
-            process_analyses = [
-                ProcessAnalysis(
-                    name="Client Research & Market Analysis",
-                    time_percentage=40.0,
-                    complexity_score=3,
-                    automation_potential="High",
-                    current_cost_annual=base_cost * 0.4,
-                    potential_savings=base_cost * 0.4 * 0.7,
-                    roi_percentage=70.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Proposal and Content Creation",
-                    time_percentage=30.0,
-                    automation_potential="High",
-                    complexity_score=4,
-                    current_cost_annual=base_cost * 0.3,
-                    potential_savings=base_cost * 0.3 * 0.8,
-                    roi_percentage=80.0,
-                    implementation_difficulty="Low",
-                ),
-                ProcessAnalysis(
-                    name="Client Communication & Reporting",
-                    time_percentage=20.0,
-                    complexity_score=2,
-                    automation_potential="Medium",
-                    current_cost_annual=base_cost * 0.2,
-                    potential_savings=base_cost * 0.2 * 0.6,
-                    roi_percentage=60.0,
-                    implementation_difficulty="Low",
-                ),
-            ]
+@dataclass
+class ProcessTemplate:
+    """Heuristic profile of one business process within an industry"""
 
-            recommended_solution = {
-                "approach": "Multi-Agent Marketing Automation Platform",
-                "components": [
-                    "Research Agent",
-                    "Content Generator",
-                    "Communication Bot",
-                ],
-                "timeline": "8-12 weeks",
-                "investment": f"${base_cost * 0.25:,.0f} - ${base_cost * 0.4:,.0f}",
-            }
+    name: str
+    time_percentage: float
+    complexity_score: int
+    automation_potential: str
+    savings_percentage: float
+    implementation_difficulty: str
 
-        else:
-            # Generic business processes
-            annual_revenue = self._extract_revenue_number(business_description)
-            base_cost = max(annual_revenue * 0.2, 100000)
-
-            process_analyses = [
-                ProcessAnalysis(
-                    name="Research & Data Collection",
-                    time_percentage=35.0,
-                    complexity_score=3,
-                    automation_potential="High",
-                    current_cost_annual=base_cost * 0.35,
-                    potential_savings=base_cost * 0.35 * 0.7,
-                    roi_percentage=70.0,
-                    implementation_difficulty="Medium",
-                ),
-                ProcessAnalysis(
-                    name="Report and Document Generation",
-                    time_percentage=25.0,
-                    automation_potential="High",
-                    complexity_score=4,
-                    current_cost_annual=base_cost * 0.25,
-                    potential_savings=base_cost * 0.25 * 0.8,
-                    roi_percentage=80.0,
-                    implementation_difficulty="Low",
-                ),
-                ProcessAnalysis(
-                    name="Administrative Tasks",
-                    time_percentage=20.0,
-                    complexity_score=2,
-                    automation_potential="Medium",
-                    current_cost_annual=base_cost * 0.20,
-                    potential_savings=base_cost * 0.20 * 0.6,
-                    roi_percentage=60.0,
-                    implementation_difficulty="Low",
-                ),
-            ]
 
-            recommended_solution = {
-                "approach": "Multi-Agent Business Automation Platform",
-                "components": [
-                    "Research Agent",
-                    "Content Generator",
-                    "Communication Bot",
-                ],
-                "timeline": "12-16 weeks",
-                "investment": f"${base_cost * 0.25:,.0f} - ${base_cost * 0.4:,.0f}",
-            }
+@dataclass
+class IndustryTemplate:
+    """Heuristic cost model and solution outline for an industry"""
 
-        # Calculate overall metrics
-        total_savings = sum(p.potential_savings for p in process_analyses)
+    key: str
+    revenue_share: float  # Share of revenue spent on the modelled processes
+    min_base_cost: float
+    processes: List[ProcessTemplate]
+    approach: str
+    components: List[str]
+    timeline: str
+    investment_low: float  # Implementation cost as a share of the base cost
+    investment_high: float
+    investment_unit: str  # "M" quotes millions, "$" quotes whole dollars
 
-        # Extract implementation cost from recommended solution investment
-        impl_cost_str = recommended_solution["investment"]
-        impl_cost = self._extract_implementation_cost(impl_cost_str)
+    @functools.cached_property
+    def shares(self) -> "np.ndarray":
+        """Share of the base cost spent on each process"""
+        return _import_numpy().array([p.time_percentage / 100 for p in self.processes])
 
-        overall_roi = (total_savings / impl_cost) * 100 if impl_cost > 0 else 0
-        payback_months = int(
-            (impl_cost / (total_savings / 12)) if total_savings > 0 else 12
+    @functools.cached_property
+    def savings_rates(self) -> "np.ndarray":
+        """Fraction of each process cost that automation saves"""
+        return _import_numpy().array(
+            [p.savings_percentage / 100 for p in self.processes]
         )
 
-        implementation_roadmap = [
-            "Week 1-4: Discovery and requirements gathering",
-            "Week 5-8: Solution design and architecture planning",
-            "Week 9-16: Core system development and testing",
-            "Week 17-20: Integration and system testing",
-            "Week 21-24: Deployment and user training",
-        ]
+    def format_investment(self, low: float, high: float) -> str:
+        """Format an implementation cost range for display"""
+        if self.investment_unit == "M":
+            return f"${low / 1000000:.1f}M - ${high / 1000000:.1f}M"
+        return f"${low:,.0f} - ${high:,.0f}"
 
-        return MarketResearchResult(
-            business_profile=business_profile,
-            process_analyses=process_analyses,
-            overall_roi=overall_roi,
-            recommended_solution=recommended_solution,
-            implementation_roadmap=implementation_roadmap,
-            investment_range=recommended_solution["investment"],
-            payback_months=payback_months,
-        )
 
-    def _extract_revenue_number(self, description: str) -> float:
-        """Extract numeric revenue from description"""
-        import re
+DEFAULT_TEMPLATES_PATH = os.getenv(
+    "MARKET_RESEARCH_TEMPLATES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "industry_templates.json"),
+)
 
-        description_lower = description.lower()
 
-        # Look for billion amounts
-        billion_match = re.search(r"(\d+\.?\d*)\s*billion", description_lower)
-        if billion_match:
-            return float(billion_match.group(1)) * 1000000000
+class IndustryTemplateRegistry:
+    """Industry templates indexed by the industry a description maps to
 
-        # Look for million amounts
-        million_match = re.search(r"(\d+\.?\d*)\s*million", description_lower)
-        if million_match:
-            return float(million_match.group(1)) * 1000000
+    Each template in the data file lists the industries it covers and the
+    default template serves every other one, so selecting a template is a
+    single dict lookup however many industries the file describes. Share
+    and savings-rate arrays are computed once, when the file is loaded.
+    """
 
-        # Look for raw dollar amounts
-        dollar_match = re.search(r"\$(\d{1,3}(?:,\d{3})*)", description_lower)
-        if dollar_match:
-            return float(dollar_match.group(1).replace(",", ""))
+    def __init__(
+        self,
+        templates: Dict[str, IndustryTemplate],
+        industries: Dict[str, str],
+        default: str,
+    ):
+        self.templates = templates
+        self.default = templates[default]
+        self._by_industry = {
+            industry.lower(): templates[key] for industry, key in industries.items()
+        }
+        for template in templates.values():
+            template.shares, template.savings_rates
 
-        # Default based on business size
-        if "large" in description_lower or "enterprise" in description_lower:
-            return 500000000  # $500M default for large enterprises
-        elif "small" in description_lower:
-            return 2000000  # $2M default for small business
-        else:
-            return 10000000  # $10M default
+    @classmethod
+    def load(cls, path: str = DEFAULT_TEMPLATES_PATH) -> "IndustryTemplateRegistry":
+        """Read templates from a JSON data file"""
+        with open(path) as f:
+            data = json.load(f)
 
-    def _extract_implementation_cost(self, cost_str: str) -> float:
-        """Extract implementation cost from investment string"""
-        import re
+        templates = {}
+        industries = {}
+        for key, spec in data["templates"].items():
+            spec = dict(spec)
+            for industry in spec.pop("industries", ()):
+                industries[industry] = key
+            processes = [ProcessTemplate(**p) for p in spec.pop("processes")]
+            templates[key] = IndustryTemplate(key=key, processes=processes, **spec)
+        return cls(templates, industries, data.get("default", "generic"))
 
-        # Handle million amounts
-        million_match = re.search(r"(\d+\.?\d*)M", cost_str)
-        if million_match:
-            return float(million_match.group(1)) * 1000000
+    def get(self, industry: str) -> IndustryTemplate:
+        """Template for an industry name, or the default template"""
+        return self._by_industry.get(industry.lower(), self.default)
 
-        # Handle dollar amounts with commas
-        dollar_match = re.search(r"\$(\d{1,3}(?:,\d{3})*)", cost_str)
-        if dollar_match:
-            return float(dollar_match.group(1).replace(",", ""))
+    def __getitem__(self, key: str) -> IndustryTemplate:
+        return self.templates[key]
 
-        # Default
-        return 100000
+    def __len__(self) -> int:
+        return len(self.templates)
 
 
-def print_header():
-    """Print professional header"""
-    print("\n" + "=" * 80)
-    print("🤖 AGENTIC AI MARKET RESEARCH AGENT")
-    print("   Professional Business Analysis & AI Opportunity Assessment")
-    print("=" * 80)
-    print()
+@functools.lru_cache(maxsize=None)
+def load_industry_templates(
+    path: str = DEFAULT_TEMPLATES_PATH,
+) -> IndustryTemplateRegistry:
+    """Load a template registry once per process"""
+    return IndustryTemplateRegistry.load(path)
 
 
-def collect_business_info() -> str:
-    """Collect business information from user"""
-    print("📋 BUSINESS DISCOVERY QUESTIONNAIRE")
-    print("-" * 40)
+@dataclass
+class RoiArrays:
+    """Raw ROI metrics for N clients x M processes
 
-    questions = [
-        "What industry is your business in?",
-        "How many employees do you have?",
-        "What are your main business activities?",
-        "What processes take the most time each week?",
-        "What are your biggest operational challenges?",
-        "What's your approximate annual revenue?",
-    ]
+    Clients with fewer than M processes are zero-padded on the right;
+    process_counts records how many columns are real for each row.
+    """
 
-    responses = []
-    for i, question in enumerate(questions, 1):
-        print(f"\n{i}. {question}")
-        response = input("   → ").strip()
-        if response:
-            responses.append(f"{question} {response}")
+    base_cost: "np.ndarray"  # (N,)
+    current_cost: "np.ndarray"  # (N, M)
+    savings: "np.ndarray"  # (N, M)
+    implementation_cost: "np.ndarray"  # (N,) low end of the investment range
+    implementation_cost_high: "np.ndarray"  # (N,)
+    overall_roi: "np.ndarray"  # (N,) percent
+    payback_months: "np.ndarray"  # (N,) whole months
+    process_counts: "np.ndarray"  # (N,)
 
-    return " ".join(responses)
 
+def compute_roi_arrays(
+    templates: List[IndustryTemplate], annual_revenues: List[float]
+) -> RoiArrays:
+    """Compute costs, savings, ROI and payback for many clients in one pass
 
-def format_currency(amount: float) -> str:
-    """Format currency for display"""
-    return f"${amount:,.0f}"
+    Clients are grouped by template so each group is a single broadcast of
+    its base costs against the template's share and savings-rate arrays.
+    """
+    np = _import_numpy()
+    revenues = np.asarray(annual_revenues, dtype=float)
+    n_clients = len(templates)
+    n_processes = max((len(t.processes) for t in templates), default=0)
 
+    base_cost = np.zeros(n_clients)
+    current_cost = np.zeros((n_clients, n_processes))
+    savings = np.zeros((n_clients, n_processes))
+    investment_low = np.zeros(n_clients)
+    investment_high = np.zeros(n_clients)
+    process_counts = np.zeros(n_clients, dtype=np.int64)
 
-def print_analysis_report(result: MarketResearchResult):
-    """Print professionally formatted analysis report"""
+    groups: Dict[str, List[int]] = {}
+    for row, template in enumerate(templates):
+        groups.setdefault(template.key, []).append(row)
 
-    print("\n" + "=" * 80)
-    print("📊 BUSINESS ANALYSIS REPORT")
-    print("=" * 80)
+    for rows in groups.values():
+        template = templates[rows[0]]
+        rows = np.asarray(rows)
+        width = len(template.processes)
+        base = np.maximum(
+            revenues[rows] * template.revenue_share, template.min_base_cost
+        )
+        costs = base[:, None] * template.shares
+        base_cost[rows] = base
+        current_cost[rows, :width] = costs
+        savings[rows, :width] = costs * template.savings_rates
+        investment_low[rows] = template.investment_low
+        investment_high[rows] = template.investment_high
+        process_counts[rows] = width
 
-    # Executive Summary
-    print("\n🏢 BUSINESS PROFILE")
-    print("-" * 20)
-    print(f"Industry: {result.business_profile.industry}")
-    print(f"Size: {result.business_profile.size}")
-    print(f"Revenue Range: {result.business_profile.revenue_range}")
+    total_savings = savings.sum(axis=1)
+    implementation_cost = base_cost * investment_low
+    has_cost = implementation_cost > 0
+    has_savings = total_savings > 0
+    overall_roi = np.where(
+        has_cost,
+        total_savings / np.where(has_cost, implementation_cost, 1) * 100,
+        0.0,
+    )
+    payback = np.where(
+        has_savings,
+        implementation_cost / (np.where(has_savings, total_savings, 1) / 12),
+        12,
+    )
 
-    # Process Analysis
-    print("\n⚡ AUTOMATION OPPORTUNITIES")
-    print("-" * 30)
+    return RoiArrays(
+        base_cost=base_cost,
+        current_cost=current_cost,
+        savings=savings,
+        implementation_cost=implementation_cost,
+        implementation_cost_high=base_cost * investment_high,
+        overall_roi=overall_roi,
+        payback_months=np.floor(payback).astype(np.int64),
+        process_counts=process_counts,
+    )
 
-    total_current_cost = sum(p.current_cost_annual for p in result.process_analyses)
-    total_savings = sum(p.potential_savings for p in result.process_analyses)
 
-    for i, process in enumerate(result.process_analyses, 1):
-        print(f"\n{i}. {process.name}")
-        print(f"   • Time Investment: {process.time_percentage}% of operations")
-        print(
-            f"   • Current Annual Cost: {format_currency(process.current_cost_annual)}"
-        )
-        print(f"   • Potential Savings: {format_currency(process.potential_savings)}")
-        print(f"   • Automation Potential: {process.automation_potential}")
-        print(f"   • ROI: {process.roi_percentage:.0f}%")
-
-    # Financial Summary
-    print("\n💰 FINANCIAL IMPACT SUMMARY")
-    print("-" * 28)
-    print(f"Total Current Annual Cost: {format_currency(total_current_cost)}")
-    print(f"Projected Annual Savings: {format_currency(total_savings)}")
-    print(f"Overall ROI: {result.overall_roi:.0f}%")
-    print(f"Payback Period: {result.payback_months} months")
-
-    # Recommended Solution
-    print("\n🎯 RECOMMENDED SOLUTION")
-    print("-" * 24)
-    print(f"Approach: {result.recommended_solution['approach']}")
-    print(f"Components: {', '.join(result.recommended_solution['components'])}")
-    print(f"Timeline: {result.recommended_solution['timeline']}")
-    print(f"Investment Range: {result.investment_range}")
-
-    # Implementation Roadmap
-    print("\n🗺️  IMPLEMENTATION ROADMAP")
-    print("-" * 27)
-    for step in result.implementation_roadmap:
-        print(f"   • {step}")
-
-    # Next Steps
-    print("\n🚀 RECOMMENDED NEXT STEPS")
-    print("-" * 26)
-    print("   • Schedule discovery call to discuss specific requirements")
-    print("   • Develop proof of concept for highest-impact process")
-    print("   • Create detailed implementation plan and timeline")
-    print("   • Begin with pilot program to validate ROI projections")
+# Columns of a shared ROI block: name, dtype and whether there is one
+# value per process; template is the code of the client's template
+SHARED_ROI_COLUMNS = [
+    ("base_cost", "float64", False),
+    ("current_cost", "float64", True),
+    ("savings", "float64", True),
+    ("implementation_cost", "float64", False),
+    ("implementation_cost_high", "float64", False),
+    ("overall_roi", "float64", False),
+    ("payback_months", "int64", False),
+    ("process_counts", "int64", False),
+    ("template", "int64", False),
+]
 
-    print("\n" + "=" * 80)
-    print(f"Report Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    print("=" * 80)
 
+def _template_codes(registry: IndustryTemplateRegistry) -> Dict[str, int]:
+    """Numeric code of each template key, in registry order"""
+    return {key: code for code, key in enumerate(registry.templates)}
 
-def save_report(result: MarketResearchResult, filename: str = None):
-    """Save analysis report to file"""
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"market_research_analysis_{timestamp}.json"
 
-    with open(filename, "w") as f:
-        json.dump(asdict(result), f, indent=2, default=str)
+class SharedRoiBlock:
+    """RoiArrays columns for a segment of rows in one shared-memory block
 
-    print(f"\n💾 Analysis saved to: {filename}")
+    The parent creates a block per segment of the input; shard workers
+    attach to it by name and write their rows in place, so only a shard's
+    error list travels back through the process pool.
+    """
 
+    def __init__(self, rows: int, width: int, name: str = None):
+        np = _import_numpy()
+        layout = [
+            (field, np.dtype(dtype), (rows, width) if per_process else (rows,))
+            for field, dtype, per_process in SHARED_ROI_COLUMNS
+        ]
+        size = sum(dtype.itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+        self.rows = rows
+        self.width = width
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=name is None, size=max(size, 1)
+        )
+        self.name = self.shm.name
+        self.columns: Dict[str, "np.ndarray"] = {}
+        offset = 0
+        for field, dtype, shape in layout:
+            column = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            self.columns[field] = column
+            offset += column.nbytes
+        if name is None:
+            self.columns["template"][:] = -1
 
-def main():
-    """Main application entry point"""
-    print_header()
+    def write(self, rows: "np.ndarray", arrays: RoiArrays, templates: "np.ndarray"):
+        """Store computed ROI arrays at the given rows of the block"""
+        width = arrays.current_cost.shape[1]
+        for field, column in self.columns.items():
+            if field == "template":
+                column[rows] = templates
+            elif column.ndim == 2:
+                column[rows, :width] = getattr(arrays, field)
+            else:
+                column[rows] = getattr(arrays, field)
 
-    # Check API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or api_key == "sk-your-key-here":
-        print("❌ Error: OpenAI API key not configured!")
-        print("Please edit the .env file and add your actual OpenAI API key")
-        print("\n1. Get your key from: https://platform.openai.com/api-keys")
-        print("2. Edit the .env file in this directory")
-        print("3. Replace 'sk-your-key-here' with your actual key")
-        return
+    def copy(self) -> Dict[str, "np.ndarray"]:
+        """Copy every column out of shared memory"""
+        return {field: column.copy() for field, column in self.columns.items()}
 
-    try:
-        # Initialize agent
-        agent = MarketResearchAgent(api_key)
+    def close(self):
+        # Views must be released before the mapping can be closed
+        self.columns = {}
+        self.shm.close()
 
-        # Collect business information
-        business_description = collect_business_info()
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
 
-        if not business_description.strip():
-            print("❌ No business information provided. Exiting.")
-            return
 
-        # Perform analysis
-        print("\n🔄 Processing your business analysis...")
-        print("   This may take 30-60 seconds...")
+@dataclass
+class HeuristicScores:
+    """Numeric heuristic results for a scored corpus, one row per description"""
+
+    arrays: RoiArrays
+    templates: "np.ndarray"  # (N,) index into template_keys, -1 if scoring failed
+    template_keys: List[str]
+    errors: Dict[int, str]
 
-        result = agent.analyze_business(business_description)
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def save(self, path: str):
+        """Write every column to a NumPy .npz archive"""
+        np = _import_numpy()
+        error_index = sorted(self.errors)
+        np.savez(
+            path,
+            **asdict(self.arrays),
+            template=self.templates,
+            template_keys=np.array(self.template_keys),
+            error_index=np.array(error_index, dtype=np.int64),
+            error=np.array([self.errors[i] for i in error_index], dtype=str),
+        )
+
+
+@dataclass
+class SimulationConfig:
+    """Sampling distributions for the Monte Carlo ROI simulation
+
+    Each driver is a (kind, spread) pair describing a multiplicative shock
+    around its deterministic value, where kind is one of "triangular",
+    "uniform", "normal" or "lognormal".
+    """
+
+    draws: int = 100000
+    savings_rate: Tuple[str, float] = ("triangular", 0.25)
+    cost_share: Tuple[str, float] = ("normal", 0.15)
+    implementation_cost: Tuple[str, float] = ("lognormal", 0.3)
+    percentiles: Tuple[float, ...] = (5, 10, 25, 50, 75, 90, 95)
+    seed: Optional[int] = None
+
+
+def _sample_multipliers(
+    rng: "np.random.Generator", driver: Tuple[str, float], size
+) -> "np.ndarray":
+    """Draw mean-one multiplicative shocks for a simulation driver"""
+    kind, spread = driver
+    if kind == "triangular":
+        return rng.triangular(1 - spread, 1, 1 + spread, size)
+    elif kind == "uniform":
+        return rng.uniform(1 - spread, 1 + spread, size)
+    elif kind == "normal":
+        return np.maximum(rng.normal(1, spread, size), 0)
+    elif kind == "lognormal":
+        return rng.lognormal(-(spread**2) / 2, spread, size)
+    raise ValueError(f"Unknown distribution: {kind}")
+
+
+_AMOUNT = re.compile(r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([kmb])?(?![a-z])", re.I)
+_AMOUNT_SCALES = {"k": 1e3, "m": 1e6, "b": 1e9}
+
+
+def parse_investment_range(text: str) -> Optional[Tuple[float, float]]:
+    """(low, high) dollars from a range such as "$60,000 - $80,000" or "$1.2M"
+
+    Returns None when the text holds no amount.
+    """
+    amounts = [
+        float(number.replace(",", "")) * _AMOUNT_SCALES.get(suffix.lower(), 1)
+        for number, suffix in _AMOUNT.findall(text or "")
+    ]
+    if not amounts:
+        return None
+    return amounts[0], max(amounts[0], amounts[-1])
+
+
+def simulate_roi(
+    result: MarketResearchResult, config: SimulationConfig = None
+) -> RoiSimulation:
+    """Monte Carlo sensitivity analysis of an analysis' ROI and payback
+
+    Savings rates, process cost shares and implementation cost are shocked
+    independently; every draw for every process is evaluated at once as a
+    (draws, processes) array. Each process saves potential_savings out of
+    current_cost_annual, and the implementation cost is the low end of the
+    investment range, the same definition overall_roi uses. Only when the
+    range holds no amount is the cost solved back from overall_roi.
+    """
+    np = _import_numpy()
+    config = config or SimulationConfig()
+    rng = np.random.default_rng(config.seed)
+
+    processes = result.process_analyses
+    costs = np.array([p.current_cost_annual for p in processes], dtype=float)
+    savings = np.array([p.potential_savings for p in processes], dtype=float)
+    rates = np.divide(savings, costs, out=np.zeros_like(costs), where=costs > 0)
+    investment_range = parse_investment_range(result.investment_range)
+    if investment_range is not None:
+        implementation_cost = investment_range[0]
+    elif result.overall_roi > 0:
+        implementation_cost = savings.sum() / (result.overall_roi / 100)
+    else:
+        implementation_cost = 0
+
+    shape = (config.draws, len(costs))
+    sampled_costs = costs * _sample_multipliers(rng, config.cost_share, shape)
+    sampled_rates = np.clip(
+        rates * _sample_multipliers(rng, config.savings_rate, shape), 0, 1
+    )
+    savings = (sampled_costs * sampled_rates).sum(axis=1)
+    investment = implementation_cost * _sample_multipliers(
+        rng, config.implementation_cost, config.draws
+    )
+
+    has_cost = investment > 0
+    roi = np.where(has_cost, savings / np.where(has_cost, investment, 1) * 100, 0)
+    has_savings = savings > 0
+    payback = np.where(
+        has_savings, investment / (np.where(has_savings, savings, 1) / 12), np.inf
+    )
+
+    keys = [f"p{q:g}" for q in config.percentiles]
+    roi_bands = np.percentile(roi, config.percentiles, method="nearest")
+    payback_bands = np.percentile(payback, config.percentiles, method="nearest")
+
+    return RoiSimulation(
+        draws=config.draws,
+        roi_percentiles=dict(zip(keys, roi_bands.tolist())),
+        payback_percentiles=dict(zip(keys, payback_bands.tolist())),
+        payback_within_12_months=float(np.mean(payback <= 12)),
+    )
+
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "MARKET_RESEARCH_CACHE", ".market_research_cache.sqlite3"
+)
+
+
+class _SqliteStore:
+    """Base for the SQLite-backed stores shared by threads and processes
+
+    Each thread lazily opens its own connection in WAL mode, applying the
+    pragmas and creating the subclass's schema. Connections stay behind
+    when a store is pickled for a worker process, which reopens its own.
+    """
+
+    pragmas = ("journal_mode=WAL", "synchronous=NORMAL")
+    schema = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict:
+        """Leave connections behind when pickled"""
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open this thread's connection on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            for pragma in self.pragmas:
+                conn.execute(f"PRAGMA {pragma}")
+            conn.executescript(self.schema)
+            self._local.conn = conn
+        return conn
+
+
+class ResponseCache(_SqliteStore):
+    """Content-addressed on-disk cache of per-task crew outputs
+
+    Entries live in a SQLite database in WAL mode, so several processes can
+    share one cache file. The least recently used entries are evicted once
+    the entry or byte budget is exceeded, and entries older than the TTL are
+    treated as misses.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            outputs TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = 10000,
+        max_bytes: int = 100 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        super().__init__(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        """Leave connections and locks behind when pickled"""
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        super().__setstate__(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash the inputs that determine an LLM response"""
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return the cached task outputs for a key, or None on a miss"""
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT outputs, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            with self._lock:
+                self.misses += 1
+            return None
+
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, outputs: List[str]):
+        """Store task outputs and evict entries beyond the cache budget"""
+        payload = json.dumps(outputs, separators=(",", ":"))
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now, now),
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones over budget"""
+        conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            entries -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        """Remove every cached entry"""
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Report hit/miss counters for this process and the cache size"""
+        entries, total = (
+            self._connection()
+            .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+            .fetchone()
+        )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "MARKET_RESEARCH_CHECKPOINTS", ".market_research_checkpoints.sqlite3"
+)
+
+
+class CheckpointStore(_SqliteStore):
+    """On-disk outputs of finished crew tasks for jobs still in progress
+
+    Each task output is written as soon as the task completes, keyed by job
+    ID, task name and position (the fan-out index of ROI sub-tasks), so a
+    retried or restarted job skips the LLM calls it already paid for. A
+    job's entries are removed when it finishes; abandoned ones expire after
+    the TTL. Like ResponseCache it uses SQLite in WAL mode, so batch workers
+    in several processes can share one file.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            job_id TEXT NOT NULL,
+            task TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            output TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (job_id, task, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints (created_at);
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_CHECKPOINT_PATH, ttl_seconds: float = 7 * 24 * 3600
+    ):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+
+    def save(self, job_id: str, task: str, position: int, output: str):
+        """Record one finished task output for a job"""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+            (job_id, task, position, output, time.time()),
+        )
+
+    def load(self, job_id: str) -> Dict[Tuple[str, int], str]:
+        """Finished task outputs for a job, by (task, position)"""
+        rows = self._connection().execute(
+            "SELECT task, position, output FROM checkpoints "
+            "WHERE job_id = ? AND created_at >= ?",
+            (job_id, time.time() - self.ttl_seconds),
+        )
+        return {(task, position): output for task, position, output in rows}
+
+    def clear(self, job_id: str):
+        """Forget a job's outputs, along with any expired entries"""
+        conn = self._connection()
+        conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (job_id,))
+        conn.execute(
+            "DELETE FROM checkpoints WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,),
+        )
+
+
+DEFAULT_SIMILARITY_PATH = os.getenv(
+    "MARKET_RESEARCH_SIMILARITY", ".market_research_similarity.sqlite3"
+)
+
+SIMILARITY_THRESHOLD = 0.9
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 8  # 8 rows per band: pairs from about 0.77 Jaccard become candidates
+SHINGLE_WORDS = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\$?\d+(?:[.,]\d+)*|\w+")
+
+
+@functools.lru_cache(maxsize=None)
+def _minhash_coefficients(permutations: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Fixed (a, b) pairs of the universal hashes behind each permutation"""
+    np = _import_numpy()
+    rng = random.Random(permutations)
+    # a < 2**31 keeps a * x + b within uint64 for 32-bit shingle hashes
+    a = [rng.randrange(1, 1 << 31) for _ in range(permutations)]
+    b = [rng.randrange(0, _MERSENNE_PRIME) for _ in range(permutations)]
+    return np.array(a, dtype=np.uint64), np.array(b, dtype=np.uint64)
+
+
+def description_shingles(description: str, size: int = SHINGLE_WORDS) -> Set[str]:
+    """Word shingles of a description's answers
+
+    Only the answers count: the questionnaire text is shared by every
+    intake and would make all of them look alike. Shingles never span two
+    answers and carry the answer's label, so the same words given for
+    processes and for challenges stay distinct.
+    """
+    answers = questionnaire_answers(description) or [(None, description)]
+    shingles = set()
+    for label, answer in answers:
+        words = _WORD.findall(answer.lower())
+        for start in range(max(1, len(words) - size + 1)):
+            shingles.add(f"{label}:{' '.join(words[start:start + size])}")
+    return shingles
+
+
+@dataclass
+class SimilarMatch:
+    """An indexed description close enough to reuse its analysis"""
+
+    cache_key: str
+    similarity: float
+
+
+class SimilarityIndex(_SqliteStore):
+    """MinHash/LSH index of analyzed descriptions for near-duplicate reuse
+
+    Each description is reduced to a MinHash signature of its answer
+    shingles, and every band of the signature is stored as an LSH bucket
+    pointing at the response cache key of its analysis. A lookup probes one
+    indexed bucket per band, so its cost does not grow with the index;
+    candidates must reach the similarity threshold on the full signature
+    and agree exactly on the facts the ROI model depends on (industry,
+    employees and revenue). Buckets are salted with a scope, so analyses
+    made with other models or instructions never match. Like ResponseCache
+    it uses SQLite in WAL mode.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            cache_key TEXT NOT NULL UNIQUE,
+            fingerprint TEXT NOT NULL,
+            signature BLOB NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS buckets (
+            bucket INTEGER NOT NULL,
+            entry INTEGER NOT NULL,
+            PRIMARY KEY (bucket, entry)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_entries_created ON entries (created_at);
+        CREATE INDEX IF NOT EXISTS idx_buckets_entry ON buckets (entry);
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SIMILARITY_PATH,
+        permutations: int = MINHASH_PERMUTATIONS,
+        bands: int = LSH_BANDS,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+        super().__init__(path)
+        self.permutations = permutations
+        self.bands = bands
+        self.ttl_seconds = ttl_seconds
+        self._probe = (
+            "SELECT DISTINCT e.cache_key, e.fingerprint, e.signature "
+            "FROM buckets b JOIN entries e ON e.id = b.entry "
+            f"WHERE b.bucket IN ({', '.join('?' * bands)}) AND e.created_at >= ?"
+        )
+
+    def signature(self, description: str) -> "np.ndarray":
+        """MinHash signature of a description's answer shingles"""
+        np = _import_numpy()
+        shingles = description_shingles(description)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        a, b = _minhash_coefficients(self.permutations)
+        minima = ((hashes[:, None] * a + b) % _MERSENNE_PRIME).min(axis=0)
+        return minima.astype(np.uint32)
+
+    def _buckets(self, signature: "np.ndarray", scope: str) -> List[int]:
+        """One LSH bucket ID per band of the signature"""
+        data = signature.tobytes()
+        width = len(data) // self.bands
+        prefix = scope.encode("utf-8")
+        return [
+            int.from_bytes(
+                hashlib.blake2b(
+                    prefix + bytes([band]) + data[band * width : (band + 1) * width],
+                    digest_size=8,
+                ).digest(),
+                "big",
+                signed=True,
+            )
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _fingerprint(description: str) -> str:
+        """Facts that must match before an analysis is reused"""
+        features = FEATURE_EXTRACTOR.extract(description)
+        return f"{features.industry}|{features.employee_count}|{features.revenue:g}"
+
+    def find(
+        self, description: str, scope: str, threshold: float = SIMILARITY_THRESHOLD
+    ) -> Optional[SimilarMatch]:
+        """Most similar indexed description at or above threshold, if any"""
+        np = _import_numpy()
+        signature = self.signature(description)
+        rows = (
+            self._connection()
+            .execute(
+                self._probe,
+                (*self._buckets(signature, scope), time.time() - self.ttl_seconds),
+            )
+            .fetchall()
+        )
+        if not rows:
+            return None
+
+        fingerprint = self._fingerprint(description)
+        best = None
+        for cache_key, candidate, blob in rows:
+            if candidate != fingerprint:
+                continue
+            similarity = float(
+                np.count_nonzero(np.frombuffer(blob, dtype=np.uint32) == signature)
+                / self.permutations
+            )
+            if similarity >= threshold and (
+                best is None or similarity > best.similarity
+            ):
+                best = SimilarMatch(cache_key, similarity)
+        return best
+
+    def add(self, description: str, cache_key: str, scope: str):
+        """Index a description under the cache key of its analysis"""
+        now = time.time()
+        conn = self._connection()
+        refreshed = conn.execute(
+            "UPDATE entries SET created_at = ? WHERE cache_key = ?", (now, cache_key)
+        )
+        if refreshed.rowcount:
+            return
+
+        signature = self.signature(description)
+        conn.execute("BEGIN")
+        try:
+            entry = conn.execute(
+                "INSERT INTO entries (cache_key, fingerprint, signature, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (cache_key, self._fingerprint(description), signature.tobytes(), now),
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?)",
+                [(bucket, entry) for bucket in self._buckets(signature, scope)],
+            )
+            expired = conn.execute(
+                "SELECT id FROM entries WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            ).fetchall()
+            self._delete(conn, expired)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def discard(self, cache_key: str):
+        """Drop the entry for a cache key, e.g. once the cache evicted it"""
+        conn = self._connection()
+        self._delete(
+            conn,
+            conn.execute(
+                "SELECT id FROM entries WHERE cache_key = ?", (cache_key,)
+            ).fetchall(),
+        )
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, entries: List[Tuple[int]]):
+        conn.executemany("DELETE FROM buckets WHERE entry = ?", entries)
+        conn.executemany("DELETE FROM entries WHERE id = ?", entries)
+
+    def clear(self):
+        """Remove every indexed description"""
+        conn = self._connection()
+        conn.execute("DELETE FROM buckets")
+        conn.execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Recognise provider throttling errors without importing the SDK"""
+    message = f"{type(error).__name__} {error}".lower()
+    return "ratelimit" in message or "rate limit" in message or "429" in message
+
+
+class _TokenBucket:
+    """Continuously refilling budget of units per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate = self.capacity / 60
+        self.updated = time.monotonic()
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until the bucket can cover the amount"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Shared limiter for LLM concurrency, RPM and TPM budgets
+
+    Callers queue in FIFO order until both token buckets can cover their
+    request and a concurrency slot is free, so bursts are smoothed out to
+    the configured budgets instead of failing against the API. All state
+    sits behind one thread lock: threads wait in acquire_sync and
+    coroutines on any event loop in acquire, and both draw from the same
+    budgets and slots.
+    """
+
+    # How often a coroutine that is not at the head of the queue re-checks
+    POLL_SECONDS = 0.05
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_concurrency: int = 16,
+    ):
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self._changed = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned: Set[int] = set()
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.granted = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _enqueue(self) -> int:
+        """Take the next place in the queue; call with the lock held"""
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self.queue_depth += 1
+        return ticket
+
+    def _attempt(self, ticket: int, requests: int, tokens: int) -> Optional[float]:
+        """Grant a queued request if its turn, budget and a slot have come
+
+        Returns 0 once granted, the seconds until the budget covers the
+        request at the head of the queue, or None while waiting for earlier
+        callers or a free slot. Call with the lock held.
+        """
+        if ticket != self._serving or self.in_flight >= self.max_concurrency:
+            return None
+        now = time.monotonic()
+        delay = max(
+            self._requests.delay(requests, now), self._tokens.delay(tokens, now)
+        )
+        if delay > 0:
+            return delay
+        self._requests.take(requests)
+        self._tokens.take(tokens)
+        self.in_flight += 1
+        self._advance()
+        return 0.0
+
+    def _advance(self):
+        """Move the head of the queue past granted and abandoned tickets"""
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+        self._changed.notify_all()
+
+    def _leave(self, ticket: int, start: float, granted: bool) -> float:
+        """Settle a caller's place in the queue; call with the lock held"""
+        self.queue_depth -= 1
+        if not granted:
+            if ticket == self._serving:
+                self._advance()
+            else:
+                self._abandoned.add(ticket)
+            return 0.0
+        waited = time.monotonic() - start
+        self.granted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def acquire_sync(self, requests: int = 1, tokens: int = 0) -> float:
+        """Block the calling thread until granted; returns seconds waited"""
+        start = time.monotonic()
+        granted = False
+        with self._changed:
+            ticket = self._enqueue()
+            try:
+                while True:
+                    delay = self._attempt(ticket, requests, tokens)
+                    if delay == 0:
+                        granted = True
+                        break
+                    self._changed.wait(delay)
+            finally:
+                waited = self._leave(ticket, start, granted)
+        return waited
+
+    async def acquire(self, requests: int = 1, tokens: int = 0) -> float:
+        """Wait without blocking the event loop; returns seconds waited"""
+        start = time.monotonic()
+        granted = False
+        with self._changed:
+            ticket = self._enqueue()
+        try:
+            while True:
+                with self._changed:
+                    delay = self._attempt(ticket, requests, tokens)
+                if delay == 0:
+                    granted = True
+                    break
+                await asyncio.sleep(delay or self.POLL_SECONDS)
+        finally:
+            with self._changed:
+                waited = self._leave(ticket, start, granted)
+        return waited
+
+    def release(self):
+        """Free the concurrency slot taken by acquire"""
+        with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Return over-reserved tokens once the real usage is known"""
+        if actual_tokens < estimated_tokens:
+            with self._changed:
+                self._tokens.refund(estimated_tokens - actual_tokens)
+                self._changed.notify_all()
+
+    def record_throttle(self, reserved_tokens: int):
+        """Count a throttled attempt and refund the tokens it reserved"""
+        with self._changed:
+            self.throttled += 1
+        self.settle(reserved_tokens, 0)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, requests: int = 1, tokens: int = 0):
+        """Hold a rate-limited slot for the duration of the block"""
+        await self.acquire(requests, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextlib.contextmanager
+    def limit_sync(self, requests: int = 1, tokens: int = 0):
+        """Blocking counterpart of limit for worker threads"""
+        self.acquire_sync(requests, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def metrics(self) -> Dict[str, float]:
+        """Queue depth, in-flight count and wait-time statistics"""
+        with self._changed:
+            return {
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "avg_wait_seconds": (
+                    self.total_wait / self.granted if self.granted else 0.0
+                ),
+                "max_wait_seconds": self.max_wait,
+            }
+
+
+# One limiter per process so every agent draws from the same API budget
+DEFAULT_RATE_LIMITER = RateLimiter(
+    requests_per_minute=int(os.getenv("OPENAI_RPM_LIMIT", "500")),
+    tokens_per_minute=int(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+    max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")),
+)
+
+
+# USD per million (prompt, completion) tokens, for cost estimates
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+# Model for each crew task: profile classification runs on a small fast
+# model, process and ROI reasoning on the main one
+DEFAULT_TASK_MODELS = {
+    "market_research": "gpt-4.1-nano",
+    "process_analysis": "gpt-4o-mini",
+    "roi_calculation": "gpt-4o-mini",
+}
+
+# Histogram bucket bounds in seconds, from cached parses up to slow crew runs
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+METRIC_HELP = {
+    "market_research_stage_seconds": "Latency of analysis pipeline stages",
+    "market_research_stage_errors_total": "Pipeline stages that raised",
+    "market_research_analyses_total": "Analyses completed, by result source",
+    "market_research_tokens_total": "LLM tokens used, by model and kind",
+    "market_research_cost_usd_total": "Estimated LLM spend in US dollars",
+    "market_research_field_fallbacks_total": "Result fields filled in by heuristics",
+    "market_research_prompt_tokens_saved_total": "Estimated input tokens saved "
+    "by prompt compaction",
+    "market_research_llm_calls_saved_total": "Crew tasks skipped because the "
+    "heuristics were decisive",
+    "market_research_service_jobs_total": "Analysis service jobs, by outcome",
+    "market_research_tasks_resumed_total": "Crew tasks restored from checkpoints",
+}
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs in Prometheus bucket order, ending with +Inf"""
+        bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+        return list(zip(bounds, itertools.accumulate(self.counts)))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Thread-safe registry of pipeline counters and latency histograms
+
+    Stages are timed with span(), which records into the
+    market_research_stage_seconds histogram. Token usage is priced with
+    MODEL_PRICES. Everything can be exported in the Prometheus text format,
+    for example to a node_exporter textfile collector. Each process keeps
+    its own registry, so heuristic batch workers are not included.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one latency sample"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def span(self, stage: str, **labels):
+        """Time a pipeline stage; failures are counted and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc("market_research_stage_errors_total", stage=stage, **labels)
+            raise
+        finally:
+            self.observe(
+                "market_research_stage_seconds",
+                time.perf_counter() - start,
+                stage=stage,
+                **labels,
+            )
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator form of span()"""
+
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def record_usage(self, model: str, prompt_tokens: int, completion_tokens: int):
+        """Count tokens and estimated cost for one LLM run"""
+        self.inc(
+            "market_research_tokens_total", prompt_tokens, model=model, kind="prompt"
+        )
+        self.inc(
+            "market_research_tokens_total",
+            completion_tokens,
+            model=model,
+            kind="completion",
+        )
+        prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        cost = (
+            prompt_tokens * prompt_price + completion_tokens * completion_price
+        ) / 1e6
+        self.inc("market_research_cost_usd_total", cost, model=model)
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of one labelled counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            return self.counters.get(key, 0)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all label values"""
+        with self._lock:
+            return sum(
+                value for (key, _), value in self.counters.items() if key == name
+            )
+
+    def model_summary(self) -> Dict[str, Dict[str, float]]:
+        """Task count, task seconds, tokens and cost for each model"""
+        summary = {}
+
+        def entry(model):
+            return summary.setdefault(
+                model, {"tasks": 0, "seconds": 0.0, "tokens": 0, "cost_usd": 0.0}
+            )
+
+        with self._lock:
+            for (name, labels), histogram in self.histograms.items():
+                labels = dict(labels)
+                if (
+                    name == "market_research_stage_seconds"
+                    and labels.get("stage") == "task"
+                    and "model" in labels
+                ):
+                    stats = entry(labels["model"])
+                    stats["tasks"] += histogram.count
+                    stats["seconds"] += histogram.sum
+            for (name, labels), value in self.counters.items():
+                labels = dict(labels)
+                if name == "market_research_tokens_total":
+                    entry(labels["model"])["tokens"] += value
+                elif name == "market_research_cost_usd_total":
+                    entry(labels["model"])["cost_usd"] += value
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return (
+                "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in pairs) + "}"
+            )
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, list(h.cumulative()), h.sum, h.count)
+                for key, h in self.histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{label_text(labels)} {value:g}")
+        for (name, labels), buckets, total, count in histograms:
+            describe(name, "histogram")
+            for le, cumulative in buckets:
+                lines.append(
+                    f"{name}_bucket{label_text(labels, [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{name}_sum{label_text(labels)} {total:.6f}")
+            lines.append(f"{name}_count{label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Atomically write the Prometheus text to a metrics file"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+
+# Process-wide registry shared by every agent
+METRICS = Metrics()
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+class IncrementalJSONDecoder:
+    """Streaming scanner for one JSON object in LLM output
+
+    Text before the first "{" (prose, "Final Answer:", code fences) is
+    skipped. feed() returns the top-level fields, and the items of top-level
+    arrays, whose values completed in that chunk, so they can be validated
+    while the rest is still arriving.
+    value() repairs a truncated document by cutting back to the last
+    complete value and appending the missing brackets, so a string or
+    number cut off mid-way is dropped rather than kept truncated.
+    """
+
+    _structural = re.compile(r'[{}\[\]",:]')
+    _string_special = re.compile(r'["\\]')
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.start = None
+        self.stack: List[str] = []
+        self.in_string = False
+        self.string_start = 0
+        self.string_is_key = False
+        self.expect_key = False
+        self.done = False
+        # Last cut point that leaves a valid prefix, and the stack there
+        self.cut = None
+        self.cut_stack: Tuple[str, ...] = ()
+        self.key = None
+        self.value_start = None
+        self.item_start = None
+        self.item_index = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Optional[int], object]]:
+        """Scan a chunk of output; returns newly completed values
+
+        Each entry is (field, index, value); index is None for a whole
+        top-level field and the position for an item of a top-level array.
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        while not self.done and self.pos < len(text):
+            if self.start is None:
+                brace = text.find("{", self.pos)
+                if brace < 0:
+                    self.pos = len(text)
+                    break
+                self.start = brace
+                self.pos = brace
+
+            if self.in_string:
+                match = self._string_special.search(text, self.pos)
+                if match is None:
+                    self.pos = len(text)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(text):
+                        self.pos = match.start()
+                        break
+                    self.pos = match.end() + 1
+                    continue
+                self.in_string = False
+                self.pos = match.end()
+                if self.string_is_key:
+                    if len(self.stack) == 1:
+                        self.key = json.loads(text[self.string_start : self.pos])
+                else:
+                    self._commit(self.pos)
+                continue
+
+            match = self._structural.search(text, self.pos)
+            if match is None:
+                self.pos = len(text)
+                break
+            char, at = match.group(), match.start()
+            self.pos = match.end()
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = at
+                self.string_is_key = self.expect_key
+            elif char in "{[":
+                self.stack.append(char)
+                self.expect_key = char == "{"
+                self._commit(self.pos)
+                if char == "[" and len(self.stack) == 2 and self.key is not None:
+                    self.item_start, self.item_index = self.pos, 0
+            elif char == ":":
+                self.expect_key = False
+                if len(self.stack) == 1:
+                    self.value_start = self.pos
+            elif char == ",":
+                self._item_done(at, completed)
+                self._field_done(at, completed)
+                self._commit(at)
+                self.expect_key = self.stack[-1] == "{"
+            else:
+                self._item_done(at, completed)
+                self._field_done(at, completed)
+                if char == "]" and len(self.stack) == 2:
+                    self.item_start = None
+                self.stack.pop()
+                self.expect_key = False
+                self._commit(self.pos)
+                if not self.stack:
+                    self.done = True
+        return completed
+
+    def _commit(self, index: int):
+        self.cut = index
+        self.cut_stack = tuple(self.stack)
+
+    def _item_done(self, end: int, completed: List):
+        """Emit an item of a top-level array when it ends at a ',' or ']'"""
+        if len(self.stack) != 2 or self.item_start is None:
+            return
+        raw = self.text[self.item_start : end].strip()
+        self.item_start = end + 1
+        if not raw:
+            return
+        try:
+            completed.append((self.key, self.item_index, json.loads(raw)))
+        except ValueError:
+            pass
+        self.item_index += 1
+
+    def _field_done(self, end: int, completed: List):
+        """Emit a top-level field when its value ends at a ',' or '}'"""
+        if len(self.stack) != 1 or self.key is None or self.value_start is None:
+            return
+        raw = self.text[self.value_start : end].strip()
+        key, self.key, self.value_start = self.key, None, None
+        try:
+            completed.append((key, None, json.loads(raw)))
+        except ValueError:
+            pass
+
+    def repaired(self) -> Optional[str]:
+        """The document so far, truncated and closed into valid JSON"""
+        if self.start is None or self.cut is None:
+            return None
+        closers = "".join(
+            "}" if opener == "{" else "]" for opener in reversed(self.cut_stack)
+        )
+        return self.text[self.start : self.cut] + closers
+
+    def value(self) -> Optional[Dict]:
+        """Best-effort parse of the (possibly truncated) object"""
+        text = self.repaired()
+        if text is None:
+            return None
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
+
+
+def _as_text(value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("expected a non-empty string")
+    return value.strip()
+
+
+def _as_text_list(value) -> List[str]:
+    if not isinstance(value, list):
+        raise ValueError("expected a list of strings")
+    items = [item.strip() for item in value if isinstance(item, str) and item.strip()]
+    if not items:
+        raise ValueError("expected at least one string")
+    return items
+
+
+def _as_number(value) -> float:
+    """Accept numbers and numeric strings such as "$1,200" or "45%" """
+    if isinstance(value, str):
+        value = value.strip().lstrip("$").rstrip("%").replace(",", "")
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    number = float(value)
+    if number != number or number in (float("inf"), float("-inf")):
+        raise ValueError("expected a finite number")
+    return number
+
+
+def _as_percentage(value) -> float:
+    number = _as_number(value)
+    if not 0 <= number <= 100:
+        raise ValueError("expected a percentage between 0 and 100")
+    return number
+
+
+def _as_amount(value) -> float:
+    number = _as_number(value)
+    if number < 0:
+        raise ValueError("expected a non-negative amount")
+    return number
+
+
+def _as_months(value) -> int:
+    number = _as_number(value)
+    if not 0 <= number <= 240:
+        raise ValueError("expected a payback period in months")
+    return int(round(number))
+
+
+def _as_complexity(value) -> int:
+    number = int(round(_as_number(value)))
+    if not 1 <= number <= 5:
+        raise ValueError("expected a complexity score from 1 to 5")
+    return number
+
+
+def _as_level(value) -> str:
+    level = _as_text(value).capitalize()
+    if level not in ("High", "Medium", "Low"):
+        raise ValueError("expected High, Medium or Low")
+    return level
+
+
+PROCESS_FIELDS = {
+    "name": _as_text,
+    "time_percentage": _as_percentage,
+    "complexity_score": _as_complexity,
+    "automation_potential": _as_level,
+    "current_cost_annual": _as_amount,
+    "potential_savings": _as_amount,
+    "roi_percentage": _as_number,
+    "implementation_difficulty": _as_level,
+}
+
+
+def _as_process(value) -> ProcessAnalysis:
+    if not isinstance(value, dict):
+        raise ValueError("expected a process object")
+    try:
+        return ProcessAnalysis(
+            **{name: check(value[name]) for name, check in PROCESS_FIELDS.items()}
+        )
+    except KeyError as e:
+        raise ValueError(f"missing process field {e}") from None
+
+
+def _as_process_list(value) -> List[ProcessAnalysis]:
+    """Keep every process that validates completely; drop the rest"""
+    if not isinstance(value, list):
+        raise ValueError("expected a list of processes")
+    processes = []
+    for item in value:
+        try:
+            processes.append(_as_process(item))
+        except (TypeError, ValueError):
+            continue
+    if not processes:
+        raise ValueError("no complete process analyses")
+    return processes
+
+
+# Validators for the JSON each sequential crew task returns, in task order
+TASK_OUTPUT_FIELDS = [
+    # Market research -> BusinessProfile
+    {
+        "name": _as_text,
+        "industry": _as_text,
+        "size": _as_text,
+        "revenue_range": _as_text,
+        "pain_points": _as_text_list,
+        "current_processes": _as_text_list,
+    },
+    # Process analysis -> ProcessAnalysis list and solution outline
+    {
+        "process_analyses": _as_process_list,
+        "approach": _as_text,
+        "timeline": _as_text,
+        "implementation_roadmap": _as_text_list,
+    },
+]
+
+# Validators for each per-process ROI sub-task
+ROI_SUBTASK_FIELDS = {
+    "name": _as_text,
+    "current_cost_annual": _as_amount,
+    "potential_savings": _as_amount,
+    "implementation_cost_low": _as_amount,
+    "implementation_cost_high": _as_amount,
+    "roi_percentage": _as_number,
+    "payback_months": _as_months,
+    "solution": _as_text,
+    "risks": _as_text_list,
+}
+
+# Validators for single items of array fields, used while streaming
+TASK_OUTPUT_ITEMS = {"process_analyses": _as_process}
+
+# JSON shapes shown to the model, matching TASK_OUTPUT_FIELDS
+TASK_OUTPUT_SCHEMAS = [
+    {
+        "name": "business name, or Client Business if not stated",
+        "industry": "string",
+        "size": "string, e.g. Small Business (25 employees)",
+        "revenue_range": "string, e.g. $1M - $10M",
+        "pain_points": ["string"],
+        "current_processes": ["string"],
+    },
+    {
+        "process_analyses": [
+            {
+                "name": "string",
+                "time_percentage": "number, percent of staff time (0-100)",
+                "complexity_score": "integer 1-5",
+                "automation_potential": "High | Medium | Low",
+                "current_cost_annual": "number, USD per year",
+                "potential_savings": "number, USD per year",
+                "roi_percentage": "number, percent",
+                "implementation_difficulty": "High | Medium | Low",
+            }
+        ],
+        "approach": "string, the overall AI solution",
+        "timeline": "string, e.g. 8-12 weeks",
+        "implementation_roadmap": ["string, e.g. Week 1-4: Discovery"],
+    },
+]
+
+ROI_SUBTASK_SCHEMA = {
+    "name": "process name, as given",
+    "current_cost_annual": "number, USD per year",
+    "potential_savings": "number, USD per year",
+    "implementation_cost_low": "number, USD",
+    "implementation_cost_high": "number, USD",
+    "roi_percentage": "number, annual savings as percent of investment",
+    "payback_months": "integer",
+    "solution": "string, the AI component that automates this process",
+    "risks": ["string, a risk factor and its mitigation"],
+}
+
+# Number of top processes that get their own concurrent ROI sub-task
+ROI_FANOUT = 3
+
+
+def select_roi_processes(processes: List[ProcessAnalysis]) -> List[int]:
+    """Indexes of the processes to fan out, highest savings first
+
+    Ties keep input order, so the same processes always map to the same
+    sub-task slots.
+    """
+    ranked = sorted(
+        range(len(processes)), key=lambda i: (-processes[i].potential_savings, i)
+    )
+    return ranked[:ROI_FANOUT]
+
+
+def merge_process_roi(
+    processes: List[ProcessAnalysis], roi_fields: List[Dict[str, object]]
+) -> Tuple[List[ProcessAnalysis], Dict[str, object]]:
+    """Fold per-process ROI sub-task results back into one analysis
+
+    roi_fields[i] belongs to the i-th process from select_roi_processes, so
+    the merge does not depend on the order in which sub-tasks finished.
+    Returns the updated processes and whichever totals could be computed:
+    overall_roi, payback_months and investment_range need every sub-task's
+    implementation cost; components and risks collect what is present.
+    """
+    processes = list(processes)
+    chosen = select_roi_processes(processes)
+    complete = bool(chosen) and len(roi_fields) >= len(chosen)
+    savings = cost_low = cost_high = 0.0
+    components: List[str] = []
+    risks: List[str] = []
+
+    for index, fields in zip(chosen, roi_fields):
+        updates = {
+            name: fields[name]
+            for name in ("current_cost_annual", "potential_savings", "roi_percentage")
+            if name in fields
+        }
+        if updates:
+            processes[index] = replace(processes[index], **updates)
+
+        if "implementation_cost_low" in fields:
+            low = fields["implementation_cost_low"]
+            savings += processes[index].potential_savings
+            cost_low += low
+            cost_high += max(low, fields.get("implementation_cost_high", low))
+        else:
+            complete = False
+
+        if "solution" in fields and fields["solution"] not in components:
+            components.append(fields["solution"])
+        risks.extend(risk for risk in fields.get("risks", []) if risk not in risks)
+
+    totals: Dict[str, object] = {}
+    if complete and cost_low > 0:
+        # Same definitions as compute_roi_arrays
+        totals["overall_roi"] = savings / cost_low * 100
+        totals["payback_months"] = int(cost_low / (savings / 12)) if savings else 12
+        totals["investment_range"] = f"${cost_low:,.0f} - ${cost_high:,.0f}"
+    if components:
+        totals["components"] = components
+    if risks:
+        totals["risks"] = risks
+    return processes, totals
+
+
+class StructuredOutputParser:
+    """Validate one task's JSON output field by field as it arrives
+
+    Fields that fail validation are recorded in errors and left out, so
+    the caller can fall back for just those fields. Items of array fields
+    with a validator in items are also checked and reported one by one.
+    """
+
+    def __init__(self, fields: Dict[str, Callable], items: Dict[str, Callable] = None):
+        self.fields = fields
+        self.items = items or {}
+        self.decoder = IncrementalJSONDecoder()
+        self.values: Dict[str, object] = {}
+        self.errors: Dict[str, str] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Optional[int], object]]:
+        """Scan more output; returns (field, index, value) for what validated"""
+        accepted = []
+        for name, index, value in self.decoder.feed(chunk):
+            if index is None:
+                if self._accept(name, value):
+                    accepted.append((name, None, self.values[name]))
+            elif name in self.fields and name in self.items:
+                try:
+                    accepted.append((name, index, self.items[name](value)))
+                except (TypeError, ValueError):
+                    pass
+        return accepted
+
+    def close(self) -> Dict[str, object]:
+        """Salvage fields from a truncated remainder and return all values"""
+        partial = self.decoder.value() or {}
+        for name, value in partial.items():
+            if name not in self.values and name not in self.errors:
+                self._accept(name, value)
+        return self.values
+
+    def _accept(self, name: str, value) -> bool:
+        check = self.fields.get(name)
+        if check is None:
+            return False
+        try:
+            self.values[name] = check(value)
+        except (TypeError, ValueError) as e:
+            self.errors[name] = str(e)
+            return False
+        return True
+
+
+def parse_task_output(fields: Dict[str, Callable], output: str) -> Dict[str, object]:
+    """Validated fields from a complete task output"""
+    parser = StructuredOutputParser(fields)
+    output = output or ""
+    start = output.find("{")
+    if start >= 0:
+        # Well-formed output skips the scanner, which is only needed for repair
+        try:
+            document, _ = _JSON_DECODER.raw_decode(output, start)
+        except ValueError:
+            document = None
+        if isinstance(document, dict):
+            for name, value in document.items():
+                parser._accept(name, value)
+            return parser.values
+    parser.feed(output)
+    return parser.close()
+
+
+# Role definitions for the research crew, in task order
+AGENT_SPECS = [
+    # Market Research Analyst
+    {
+        "role": "Senior Market Research Analyst",
+        "goal": "Analyze business operations and identify AI automation opportunities",
+        "backstory": (
+            "You are an expert business analyst with 15+ years experience in "
+            "operational efficiency and technology implementations. You specialize "
+            "in identifying high-impact automation opportunities and quantifying "
+            "business value."
+        ),
+    },
+    # Business Process Expert
+    {
+        "role": "Business Process Optimization Specialist",
+        "goal": "Evaluate current processes and design automation solutions",
+        "backstory": (
+            "You are a certified Six Sigma Black Belt with extensive experience "
+            "in process improvement and automation. You can quickly identify "
+            "bottlenecks, inefficiencies, and automation opportunities in any "
+            "business process."
+        ),
+    },
+    # ROI Calculator
+    {
+        "role": "Financial ROI Analyst",
+        "goal": "Calculate accurate ROI projections and business impact",
+        "backstory": (
+            "You are a financial analyst specializing in technology ROI calculations. "
+            "You have deep experience in cost-benefit analysis, payback period "
+            "calculations, and business case development for automation projects."
+        ),
+    },
+]
+
+# Metric labels for the crew tasks, in task order; roi_calculation runs as
+# one concurrent sub-task per selected process
+TASK_NAMES = ("market_research", "process_analysis", "roi_calculation")
+
+# Static instructions and expected output for the sequential crew tasks. The
+# client data is appended after them by PromptBuilder.
+TASK_INSTRUCTIONS = [
+    # Market Research Task
+    (
+        """
+        Analyze this business and identify automation opportunities.
+
+        Your analysis should include:
+        1. Business classification (industry, size, revenue estimate)
+        2. Identification of 3-5 most time-consuming manual processes
+        3. Assessment of current operational costs and inefficiencies
+        4. Preliminary automation opportunity assessment
+
+        Focus on quantifiable, high-impact areas where AI agents could provide immediate value.
+        Be specific about time spent on each process and current business impact.
+        """,
+        "Structured business analysis with process identification and initial opportunity assessment",
+    ),
+    # Process Analysis Task
+    (
+        """
+        Based on the business analysis, perform detailed process evaluation:
+
+        For each identified process, analyze:
+        1. Current time investment (hours/week, cost/year)
+        2. Complexity level (1-5 scale)
+        3. Automation potential (High/Medium/Low)
+        4. Specific AI solutions that could address this process
+        5. Implementation complexity and timeline
+
+        Prioritize processes by ROI potential and implementation feasibility.
+        Then outline the overall solution approach, timeline and roadmap.
+        """,
+        "Detailed process analysis with automation recommendations and priority ranking",
+    ),
+]
+
+ROI_TASK_INSTRUCTIONS = (
+    """
+    Calculate comprehensive ROI analysis for this automation opportunity:
+
+    Calculate:
+    1. Current annual cost (time * hourly rate + opportunity cost)
+    2. Potential automation savings (% reduction in time/cost)
+    3. Implementation investment required, as a low and high estimate
+    4. Payback period and ROI
+    5. Risk factors and mitigation strategies
+
+    Include specific dollar amounts and percentages.
+    """,
+    "Detailed ROI calculation with investment estimate and risk assessment "
+    "for this process",
+)
+
+# Questions asked by collect_business_info, with the short label each answer
+# gets in prompts
+QUESTIONNAIRE = [
+    ("What industry is your business in?", "Industry"),
+    ("How many employees do you have?", "Employees"),
+    ("What are your main business activities?", "Activities"),
+    ("What processes take the most time each week?", "Most time-consuming processes"),
+    ("What are your biggest operational challenges?", "Challenges"),
+    ("What's your approximate annual revenue?", "Annual revenue"),
+]
+
+DESCRIPTION_TOKEN_BUDGET = 400
+
+# Weight of each stated fact in the heuristic profile confidence. Industry,
+# employees and revenue are what the research task derives, so at the
+# default threshold stating all three lets the heuristic profile stand in
+# for it.
+PROFILE_CONFIDENCE_WEIGHTS = {
+    "industry": 0.3,
+    "employees": 0.25,
+    "revenue": 0.25,
+    "processes": 0.1,
+    "challenges": 0.1,
+}
+PROFILE_CONFIDENCE_THRESHOLD = 0.8
+
+# Profile lists used when the description does not name any
+DEFAULT_PAIN_POINTS = (
+    "Manual processes",
+    "Time-intensive tasks",
+    "Operational inefficiencies",
+)
+DEFAULT_CURRENT_PROCESSES = (
+    "Research tasks",
+    "Report generation",
+    "Communication management",
+)
+
+_QUESTION_PATTERN = re.compile(
+    "|".join(re.escape(question) for question, _ in QUESTIONNAIRE)
+)
+_QUESTION_LABELS = dict(QUESTIONNAIRE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def questionnaire_answers(description: str) -> List[Tuple[Optional[str], str]]:
+    """(label, answer) pairs from a questionnaire description
+
+    Text before the first question gets the label None. Descriptions that
+    contain no questionnaire question give an empty list.
+    """
+    text = " ".join(description.split())
+    pieces = _QUESTION_PATTERN.split(text)
+    if len(pieces) == 1:
+        return []
+    answers = [(None, pieces[0].strip())] if pieces[0].strip() else []
+    for question, answer in zip(_QUESTION_PATTERN.findall(text), pieces[1:]):
+        answers.append((_QUESTION_LABELS[question], answer.strip()))
+    return answers
+
+
+def _answer_items(answer: str, limit: int = 5) -> List[str]:
+    """Split a free-text answer that lists several things into items"""
+    items = (item.strip(" .") for item in re.split(r",|;|\band\b", answer or ""))
+    return [item[0].upper() + item[1:] for item in items if item][:limit]
+
+
+def _json_instruction(schema: Dict) -> str:
+    """Prompt suffix asking for output in a fixed JSON shape"""
+    return (
+        "Respond with only a JSON object in exactly this shape, "
+        f"with no other text:\n{json.dumps(schema)}\n"
+    )
+
+
+def _compact_text(text: str) -> str:
+    """Collapse whitespace runs and drop blank lines, keeping line breaks"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _clip_words(text: str, limit: int) -> str:
+    """Cut text to at most limit characters at a word boundary"""
+    if len(text) <= limit:
+        return text
+    clipped = text[: max(0, limit - 1)]
+    if " " in clipped[limit // 2 :]:
+        clipped = clipped.rsplit(" ", 1)[0]
+    return clipped.rstrip(" ,;:") + "…"
+
+
+def prompt_tokens(prompts: List[Tuple[str, str]]) -> int:
+    """Estimated input tokens for a list of (description, expected) prompts"""
+    return sum(
+        estimate_tokens(description) + estimate_tokens(expected)
+        for description, expected in prompts
+    )
+
+
+class PromptBuilder:
+    """Assemble task prompts with a stable prefix and a bounded client part
+
+    Static text (instructions, then the output schema) comes first and client
+    data last, so every analysis of a task shares the same prompt prefix and
+    providers can serve it from their prompt cache. Whitespace runs are
+    collapsed, questionnaire questions shrink to short labels, and the
+    business description is trimmed to description_budget tokens by
+    shortening the longest answers first.
+
+    With compact=False the builder reproduces the uncompacted layout, which
+    is the baseline for reporting tokens saved.
+    """
+
+    def __init__(
+        self,
+        description_budget: Optional[int] = DESCRIPTION_TOKEN_BUDGET,
+        compact: bool = True,
+    ):
+        self.description_budget = description_budget
+        self.compact = compact
+
+    def build(
+        self,
+        instructions: Tuple[str, str],
+        schema: Dict,
+        data: List[Tuple[str, str]],
+    ) -> Tuple[str, str]:
+        """(description, expected output) for a task with labelled client data"""
+        text, expected = instructions
+        if not self.compact:
+            fields = "".join(f"\n{label}: {value}\n" for label, value in data)
+            return (
+                f"{text}{fields}\n{_json_instruction(schema)}",
+                f"JSON object. {expected}",
+            )
+
+        parts = [_compact_text(text), _compact_text(_json_instruction(schema))]
+        for label, value in data:
+            parts.append(f"{label}:\n{value}" if "\n" in value else f"{label}: {value}")
+        # The schema instruction already asks for JSON only
+        return "\n\n".join(parts), expected
+
+    def fit_description(self, business_description: str) -> str:
+        """Business description as it goes into prompts"""
+        if not self.compact:
+            return business_description
+
+        budget = (
+            None if self.description_budget is None else self.description_budget * 4
+        )
+        answers = questionnaire_answers(business_description)
+        if not answers:
+            # Free text: drop repeated sentences, then keep the opening ones
+            text = " ".join(business_description.split())
+            sentences = list(dict.fromkeys(_SENTENCE_END.split(text)))
+            text = " ".join(sentences)
+            return text if budget is None else _clip_words(text, budget)
+
+        # "Question? answer" pairs become one "Label: answer" line each
+        segments = [
+            answer if label is None else f"{label}: {answer}"
+            for label, answer in answers
+        ]
+        if budget is None or sum(map(len, segments)) + len(segments) <= budget:
+            return "\n".join(segments)
+
+        # Share the budget so short answers stay whole and only the longest
+        # ones are shortened
+        cap, remaining = 0, budget - len(segments)
+        lengths = sorted(len(segment) for segment in segments)
+        for position, length in enumerate(lengths):
+            cap = remaining // (len(lengths) - position)
+            if length > cap:
+                break
+            remaining -= length
+        return "\n".join(_clip_words(segment, cap) for segment in segments)
+
+
+# Prompts as they were laid out before compaction, the savings baseline
+UNCOMPACTED_PROMPTS = PromptBuilder(None, compact=False)
+
+
+class CrewPool:
+    """Pool of pre-built research agent sets
+
+    Agent sets are built lazily up to the pool size and then reused. Each
+    request leases a whole set exclusively and gets a fresh Crew with its own
+    task list, so no crew or task state is shared between concurrent runs.
+    Leasing blocks on a thread-safe queue; asyncio callers reach it through
+    worker threads.
+    """
+
+    def __init__(self, llms: List, size: int = 16):
+        self.llms = llms
+        self.size = size
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def build_agents(self) -> List["Agent"]:
+        """Build one set of research agents from AGENT_SPECS, one LLM each"""
+        return [
+            Agent(**spec, llm=llm, verbose=False)
+            for spec, llm in zip(AGENT_SPECS, self.llms)
+        ]
+
+    def acquire(self, timeout: float = None) -> List["Agent"]:
+        """Take an idle agent set, building one if the pool has room"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self.created < self.size
+            if grow:
+                self.created += 1
+        if grow:
+            try:
+                return self.build_agents()
+            except Exception:
+                with self._lock:
+                    self.created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    def release(self, agents: List["Agent"]):
+        """Return an agent set to the pool"""
+        self._idle.put(agents)
+
+    @contextlib.contextmanager
+    def lease(self):
+        """Hold an agent set for the duration of the block"""
+        agents = self.acquire()
+        try:
+            yield agents
+        finally:
+            self.release(agents)
+
+    @staticmethod
+    def build_crew(
+        agents: List["Agent"],
+        prompts: List[Tuple[str, str]],
+        callbacks: List[Callable] = None,
+    ) -> "Crew":
+        """Bind a fresh task list for one request to a leased agent set"""
+        callbacks = callbacks or [None] * len(prompts)
+        tasks = [
+            Task(
+                description=description,
+                agent=agent,
+                expected_output=expected,
+                callback=callback,
+            )
+            for (description, expected), agent, callback in zip(
+                prompts, agents, callbacks
+            )
+        ]
+        return Crew(agents=agents, tasks=tasks, verbose=False)
+
+
+# Per-thread receiver for streamed LLM tokens; crew tasks run on the thread
+# that called kickoff, so tokens can be routed without sharing state
+_TOKEN_SINKS = threading.local()
+
+
+def _token_router():
+    """LangChain callback handler that forwards tokens to this thread's sink"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TokenRouter(BaseCallbackHandler):
+        def on_llm_new_token(self, token: str, **kwargs):
+            sink = getattr(_TOKEN_SINKS, "sink", None)
+            if sink is not None and token:
+                sink(token)
+
+    return TokenRouter()
+
+
+class _StreamEmitter:
+    """Turns crew callbacks into AnalysisEvents for one streamed analysis
+
+    Tokens are fed to the current task's StructuredOutputParser so that
+    profile fields and individual processes are reported as soon as they
+    validate. Tasks whose output arrives without tokens (cached responses
+    or a non-streaming model) are parsed when they complete. ROI sub-tasks
+    run concurrently, so their tokens are only relayed and each one is
+    reported as a process_roi item when it finishes.
+    """
+
+    def __init__(self, emit: Callable[[AnalysisEvent], None]):
+        self.emit = emit
+        self.restart()
+
+    def restart(self):
+        self.task = 0
+        self.parsers = [
+            StructuredOutputParser(fields, TASK_OUTPUT_ITEMS)
+            for fields in TASK_OUTPUT_FIELDS
+        ]
+        self.streamed = [False] * len(self.parsers)
+
+    def status(self, message: str):
+        self.emit(AnalysisEvent("status", value=message))
+
+    def start(self):
+        self.emit(AnalysisEvent("task_started", task=TASK_NAMES[0]))
+
+    def token(self, text: str):
+        if self.task >= len(self.parsers):
+            return
+        self.streamed[self.task] = True
+        self.emit(AnalysisEvent("token", task=TASK_NAMES[self.task], value=text))
+        self._fields(self.parsers[self.task].feed(text))
+
+    def task_done(self, output: str):
+        if self.task >= len(self.parsers):
+            return
+        if not self.streamed[self.task]:
+            self._fields(self.parsers[self.task].feed(output or ""))
+        self.emit(
+            AnalysisEvent("task_completed", task=TASK_NAMES[self.task], value=output)
+        )
+        self.task += 1
+        self.emit(AnalysisEvent("task_started", task=TASK_NAMES[self.task]))
+
+    def roi_token(self, text: str):
+        self.emit(AnalysisEvent("token", task="roi_calculation", value=text))
+
+    def roi_done(self, index: int, output: str):
+        fields = parse_task_output(ROI_SUBTASK_FIELDS, output)
+        if fields:
+            self.emit(
+                AnalysisEvent(
+                    "item", task="roi_calculation", name="process_roi", value=fields
+                )
+            )
+
+    def roi_finished(self):
+        self.emit(AnalysisEvent("task_completed", task="roi_calculation"))
+
+    def replay(self, outputs: List[str]):
+        """Emit the events of a finished run, e.g. from the response cache"""
+        self.start()
+        sequential = len(self.parsers)
+        for output in outputs[:sequential]:
+            self.task_done(output)
+        for index, output in enumerate(outputs[sequential:]):
+            self.roi_done(index, output)
+        self.roi_finished()
+
+    def _fields(self, accepted: List[Tuple[str, Optional[int], object]]):
+        task = TASK_NAMES[self.task]
+        for name, index, value in accepted:
+            kind = "field" if index is None else "item"
+            self.emit(AnalysisEvent(kind, task=task, name=name, value=value))
+
+
+class MarketResearchAgent:
+    """AI-powered market research and opportunity analysis agent"""
+
+    def __init__(
+        self,
+        api_key: str = None,
+        cache: ResponseCache = None,
+        offline: bool = False,
+        rate_limiter: RateLimiter = None,
+        pool_size: int = 16,
+        base_url: str = None,
+        prompt_budget: int = DESCRIPTION_TOKEN_BUDGET,
+        models: Dict[str, str] = None,
+        confidence_threshold: Optional[float] = PROFILE_CONFIDENCE_THRESHOLD,
+        checkpoints: CheckpointStore = None,
+        similarity: SimilarityIndex = None,
+        similarity_threshold: Optional[float] = SIMILARITY_THRESHOLD,
+    ):
+        """Initialize the agent with OpenAI API key
+
+        In offline mode the agent never loads the AI frameworks or needs an
+        API key, and every analysis uses the heuristic model. base_url points
+        the LLM client at another OpenAI-compatible endpoint, such as the
+        local stand-in in mock_openai_server.py. prompt_budget caps the
+        tokens of business description sent with each task. models overrides
+        DEFAULT_TASK_MODELS for some or all of the tasks in TASK_NAMES.
+        When the heuristic profile confidence reaches confidence_threshold
+        the research task is skipped; None always runs it. Task outputs are
+        checkpointed to checkpoints until each analysis completes. A cache
+        miss reuses the analysis of an indexed near-duplicate description
+        whose similarity reaches similarity_threshold; None never reuses.
+        Every crew run, sync or async, waits for rate_limiter; the default
+        DEFAULT_RATE_LIMITER is shared by the whole process and sized by
+        OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT and OPENAI_MAX_CONCURRENCY. Pass
+        a RateLimiter of its own to give the agent a separate budget, or
+        one with budgets it cannot exhaust to bypass limiting.
+        """
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        self.models = {**DEFAULT_TASK_MODELS, **(models or {})}
+        self.temperature = 0.3
+        self.cache = cache if cache is not None else ResponseCache()
+        self.checkpoints = checkpoints if checkpoints is not None else CheckpointStore()
+        self.similarity = similarity if similarity is not None else SimilarityIndex()
+        self.similarity_threshold = similarity_threshold
+        self.rate_limiter = rate_limiter or DEFAULT_RATE_LIMITER
+        self.prompt_builder = PromptBuilder(prompt_budget)
+        self.confidence_threshold = confidence_threshold
+        self.offline = offline
+        self.llms = None
+        self.crew_pool = None
+        self._streaming_pool = None
+        self._streaming_lock = threading.Lock()
+        if offline:
+            return
+
+        if not self.api_key or self.api_key == "sk-your-key-here":
+            print("❌ Error: OpenAI API key not configured!")
+            print("Please edit the .env file and add your actual OpenAI API key")
+            print("Get your key from: https://platform.openai.com/api-keys")
+            exit(1)
+
+        try:
+            _import_ai_frameworks()
+        except ImportError as e:
+            print(f"❌ Error importing required packages: {e}")
+            exit(1)
+
+        try:
+            self.llms = self._build_llms()
+            self.crew_pool = CrewPool(self.llms, size=pool_size)
+            print("✅ AI model initialized successfully!")
+        except Exception as e:
+            print(f"❌ Error initializing AI model: {e}")
+            print("Please check your API key and internet connection")
+            exit(1)
+
+    def __getstate__(self) -> Dict:
+        """Drop the LLM clients when the agent is shipped to worker processes"""
+        state = self.__dict__.copy()
+        state.pop("llms", None)
+        state.pop("crew_pool", None)
+        state.pop("rate_limiter", None)
+        state.pop("_streaming_pool", None)
+        state.pop("_streaming_lock", None)
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self.llms = None
+        self.crew_pool = None
+        self.rate_limiter = DEFAULT_RATE_LIMITER
+        self._streaming_pool = None
+        self._streaming_lock = threading.Lock()
+
+    def _build_llms(self, **options) -> List:
+        """LLM clients in TASK_NAMES order, one shared client per model"""
+        clients = {}
+        for model in dict.fromkeys(self.models[name] for name in TASK_NAMES):
+            clients[model] = ChatOpenAI(
+                model=model,
+                temperature=self.temperature,
+                api_key=self.api_key,
+                base_url=self.base_url,
+                **options,
+            )
+        return [clients[self.models[name]] for name in TASK_NAMES]
+
+    def _streaming_crew_pool(self) -> CrewPool:
+        """Agent sets on token-streaming LLMs, built on first use"""
+        with self._streaming_lock:
+            if self._streaming_pool is None:
+                llms = self._build_llms(streaming=True, callbacks=[_token_router()])
+                self._streaming_pool = CrewPool(llms, size=self.crew_pool.size)
+        return self._streaming_pool
+
+    def create_research_crew(self) -> "Crew":
+        """Create the multi-agent research crew"""
+        return Crew(agents=self.crew_pool.build_agents(), verbose=False)
+
+    def analyze_business(
+        self,
+        business_description: str,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+        job_id: str = None,
+        max_retries: int = 5,
+    ) -> MarketResearchResult:
+        """Perform comprehensive business analysis
+
+        Pass a SimulationConfig to attach Monte Carlo ROI risk bands, or
+        use_cache=False to force fresh agent responses. Finished tasks are
+        checkpointed under job_id, by default derived from the inputs, so
+        analyzing the same job again resumes where a failed run stopped.
+        Crew runs share the rate limiter with every other thread and event
+        loop in the process; throttling is retried up to max_retries times.
+        """
+        result = self._run_analysis(
+            business_description,
+            use_cache=use_cache,
+            job_id=job_id,
+            max_retries=max_retries,
+        )
+        if simulation is not None:
+            result.roi_simulation = simulate_roi(result, simulation)
+        return result
+
+    def _task_prompts(
+        self,
+        business_description: str,
+        builder: PromptBuilder = None,
+        research_output: str = None,
+    ) -> List[Tuple[str, str]]:
+        """Build the (description, expected output) pair for each crew task
+
+        A research output known before the crew runs, checkpointed or a
+        confident heuristic profile, is handed to the process analysis.
+        """
+        builder = builder or self.prompt_builder
+        data = [("Business description", builder.fit_description(business_description))]
+        # Every task answers in a fixed JSON shape so the output can be parsed
+        return [
+            builder.build(
+                instructions,
+                schema,
+                # A skipped research task hands its profile to process analysis
+                (
+                    data + [("Business analysis", research_output)]
+                    if research_output and index
+                    else data
+                ),
+            )
+            for index, (instructions, schema) in enumerate(
+                zip(TASK_INSTRUCTIONS, TASK_OUTPUT_SCHEMAS)
+            )
+        ]
+
+    def _roi_prompts(
+        self,
+        business_description: str,
+        processes: List[ProcessAnalysis],
+        builder: PromptBuilder = None,
+    ) -> List[Tuple[str, str]]:
+        """One ROI sub-task prompt per process, in fan-out order"""
+        builder = builder or self.prompt_builder
+        description = builder.fit_description(business_description)
+        # The process goes last: it is the only part that differs per sub-task
+        return [
+            builder.build(
+                ROI_TASK_INSTRUCTIONS,
+                ROI_SUBTASK_SCHEMA,
+                [
+                    ("Business description", description),
+                    ("Process", json.dumps(asdict(process))),
+                ],
+            )
+            for process in processes
+        ]
+
+    def _prompt_tokens_saved(
+        self,
+        business_description: str,
+        tasks: slice,
+        processes: List[ProcessAnalysis],
+        sent: List[Tuple[str, str]],
+        research_output: str = None,
+    ) -> int:
+        """Estimated input tokens sent prompts saved over the uncompacted layout"""
+        baseline = self._task_prompts(
+            business_description, UNCOMPACTED_PROMPTS, research_output
+        )
+        baseline = baseline[tasks]
+        baseline += self._roi_prompts(
+            business_description, processes, UNCOMPACTED_PROMPTS
+        )
+        return max(0, prompt_tokens(baseline) - prompt_tokens(sent))
+
+    def _confident_profile(self, business_description: str) -> Optional[str]:
+        """Heuristic profile as research task output, if confident enough"""
+        if self.confidence_threshold is None:
+            return None
+        profile, confidence = self.heuristic_profile(business_description)
+        if confidence < self.confidence_threshold:
+            return None
+        return json.dumps(profile)
+
+    def _cache_key(self, business_description: str, prompts: List[Tuple[str, str]]):
+        """Cache key for the crew outputs of one analysis"""
+        parts = [
+            business_description,
+            prompts,
+            ROI_TASK_INSTRUCTIONS,
+            ROI_FANOUT,
+            sorted(self.models.items()),
+            self.temperature,
+        ]
+        # Keep responses from other endpoints out of the OpenAI cache entries
+        if self.base_url:
+            parts.append(self.base_url)
+        return ResponseCache.make_key(*parts)
+
+    def _similarity_scope(self) -> str:
+        """Key of the settings under which analyses may be reused"""
+        parts = [
+            TASK_INSTRUCTIONS,
+            ROI_TASK_INSTRUCTIONS,
+            ROI_FANOUT,
+            sorted(self.models.items()),
+            self.temperature,
+        ]
+        if self.base_url:
+            parts.append(self.base_url)
+        return ResponseCache.make_key(*parts)
+
+    def _similar_outputs(
+        self, business_description: str, say: Callable[[str], None]
+    ) -> Optional[List[str]]:
+        """Cached crew outputs of an indexed near-duplicate description"""
+        if self.similarity_threshold is None or self.similarity_threshold > 1:
+            return None
+        with METRICS.span("similarity"):
+            match = self.similarity.find(
+                business_description,
+                self._similarity_scope(),
+                self.similarity_threshold,
+            )
+        if match is None:
+            return None
+        outputs = self.cache.get(match.cache_key)
+        if outputs is None:
+            self.similarity.discard(match.cache_key)
+            return None
+        say(
+            "   Reusing the analysis of a near-duplicate description "
+            f"({match.similarity:.0%} similar)..."
+        )
+        return outputs
+
+    def _kickoff_crew(
+        self,
+        business_description: str,
+        prompts: List[Tuple[str, str]],
+        stream: _StreamEmitter = None,
+        job_id: str = None,
+        profile: str = None,
+    ) -> Tuple[List[str], int]:
+        """Run the crew as a task DAG; returns outputs and tokens used
+
+        Research and process analysis run in sequence on one crew. Each
+        selected process then gets its own ROI sub-task on a separate agent
+        set, all running concurrently, so this phase takes as long as the
+        slowest process rather than the sum. Outputs are the sequential task
+        outputs followed by the ROI outputs in fan-out order.
+
+        With a job_id every finished task is checkpointed, and tasks already
+        checkpointed for the job are not run again. A confident heuristic
+        profile, from _confident_profile, stands in for the research task.
+        """
+        say = print if stream is None else stream.status
+        done = self.checkpoints.load(job_id) if job_id else {}
+        if done:
+            METRICS.inc("market_research_tasks_resumed_total", len(done))
+            say(f"   Resuming from checkpoint: {len(done)} tasks already done...")
+
+        def checkpoint(task, position, output):
+            if job_id and output:
+                self.checkpoints.save(job_id, task, position, output)
+
+        # Tasks run sequentially, so each completion callback closes the
+        # span that started when the previous task finished
+        marks = []
+
+        def task_done(name):
+            def callback(output):
+                now = time.perf_counter()
+                METRICS.observe(
+                    "market_research_stage_seconds",
+                    now - marks[-1],
+                    stage="task",
+                    task=name,
+                    model=self.models[name],
+                )
+                marks.append(now)
+                checkpoint(name, 0, getattr(output, "raw", None))
+                if stream is not None:
+                    stream.task_done(getattr(output, "raw", None))
+
+            return callback
+
+        # Outputs known before the crew runs: checkpointed tasks, or else a
+        # confident heuristic profile standing in for the research task
+        known = list(
+            itertools.takewhile(
+                lambda output: output is not None,
+                (done.get((name, 0)) for name in TASK_NAMES[: len(prompts)]),
+            )
+        )
+        if known and len(known) < len(prompts):
+            prompts = self._task_prompts(business_description, research_output=known[0])
+        elif not known:
+            if profile:
+                known = [profile]
+                METRICS.inc("market_research_llm_calls_saved_total", task=TASK_NAMES[0])
+                say("   Heuristic profile is decisive, skipping the research task...")
+        run = slice(len(known), len(prompts))
+
+        pool = self.crew_pool if stream is None else self._streaming_crew_pool()
+        if stream is not None:
+            stream.start()
+            for output in known:
+                stream.task_done(output)
+        outputs, tokens = list(known), 0
+        if run.start < run.stop:
+            with pool.lease() as agents:
+                with METRICS.span("crew_build"):
+                    crew = CrewPool.build_crew(
+                        agents[run],
+                        prompts[run],
+                        [task_done(name) for name in TASK_NAMES[run]],
+                    )
+                with METRICS.span("crew_kickoff"):
+                    marks.append(time.perf_counter())
+                    result = self._run_crew(crew, stream.token if stream else None)
+            outputs += [task_output.raw for task_output in result.tasks_output]
+            tokens = self._record_usage(result, TASK_NAMES[run], prompts[run])
+
+        processes = self._fanout_processes(business_description, outputs[-1])
+        roi_prompts = self._roi_prompts(business_description, processes)
+        roi_done = {
+            index: done[("roi_calculation", index)]
+            for index in range(len(roi_prompts))
+            if ("roi_calculation", index) in done
+        }
+        if stream is not None:
+            for index, output in roi_done.items():
+                stream.roi_done(index, output)
+        with METRICS.span("roi_fanout"), ThreadPoolExecutor(
+            max_workers=max(1, len(roi_prompts))
+        ) as executor:
+            runs = [
+                (
+                    None
+                    if index in roi_done
+                    else executor.submit(
+                        self._kickoff_roi_task, pool, index, prompt, stream, job_id
+                    )
+                )
+                for index, prompt in enumerate(roi_prompts)
+            ]
+            # Collected in submission order, whatever order they finish in
+            roi_results = [
+                (roi_done[index], 0) if future is None else future.result()
+                for index, future in enumerate(runs)
+            ]
+        if stream is not None:
+            stream.roi_finished()
+
+        sent = [index for index in range(len(roi_prompts)) if index not in roi_done]
+        saved = self._prompt_tokens_saved(
+            business_description,
+            run,
+            [processes[index] for index in sent],
+            prompts[run] + [roi_prompts[index] for index in sent],
+            known[0] if known else None,
+        )
+        METRICS.inc("market_research_prompt_tokens_saved_total", saved)
+        say(f"   Compact prompts saved ~{saved:,} input tokens")
+
+        if job_id:
+            self.checkpoints.clear(job_id)
+        outputs.extend(output for output, _ in roi_results)
+        return outputs, tokens + sum(used for _, used in roi_results)
+
+    def _kickoff_roi_task(
+        self,
+        pool: CrewPool,
+        index: int,
+        prompt: Tuple[str, str],
+        stream: _StreamEmitter = None,
+        job_id: str = None,
+    ) -> Tuple[str, int]:
+        """Run one ROI sub-task on its own agent set
+
+        A failed sub-task yields empty output so the merge falls back for
+        that process only; throttling errors propagate so the whole run can
+        be retried.
+        """
+        try:
+            with METRICS.span(
+                "task",
+                task="roi_calculation",
+                model=self.models["roi_calculation"],
+            ):
+                with pool.lease() as agents:
+                    crew = CrewPool.build_crew(agents[-1:], [prompt])
+                    result = self._run_crew(crew, stream.roi_token if stream else None)
+        except Exception as e:
+            if _is_rate_limit_error(e):
+                raise
+            output, used = "", 0
+        else:
+            output = result.tasks_output[0].raw
+            used = self._record_usage(result, ["roi_calculation"], [prompt])
+            if job_id and output:
+                self.checkpoints.save(job_id, "roi_calculation", index, output)
+        if stream is not None:
+            stream.roi_done(index, output)
+        return output, used
+
+    @staticmethod
+    def _run_crew(crew: "Crew", sink: Callable[[str], None] = None):
+        """Kick off a crew, routing streamed tokens on this thread to sink"""
+        _TOKEN_SINKS.sink = sink
+        try:
+            return crew.kickoff()
+        finally:
+            _TOKEN_SINKS.sink = None
+
+    def _record_usage(
+        self, result, task_names: List[str], prompts: List[Tuple[str, str]]
+    ) -> int:
+        """Record a crew result's token usage by model; returns the total tokens
+
+        CrewAI reports usage for the crew as a whole, so when its tasks ran
+        on different models the totals are split by each task's estimated
+        prompt and completion size.
+        """
+        usage = getattr(result, "token_usage", None)
+        if usage is None:
+            return 0
+        prompt_total = getattr(usage, "prompt_tokens", 0) or 0
+        completion_total = getattr(usage, "completion_tokens", 0) or 0
+
+        sizes = {}
+        for name, prompt, task_output in zip(task_names, prompts, result.tasks_output):
+            model_sizes = sizes.setdefault(self.models[name], [0, 0])
+            model_sizes[0] += prompt_tokens([prompt])
+            model_sizes[1] += estimate_tokens(task_output.raw or "")
+        prompt_size = sum(size for size, _ in sizes.values()) or 1
+        completion_size = sum(size for _, size in sizes.values()) or 1
+        for model, (prompt_share, completion_share) in sizes.items():
+            METRICS.record_usage(
+                model,
+                round(prompt_total * prompt_share / prompt_size),
+                round(completion_total * completion_share / completion_size),
+            )
+        return getattr(usage, "total_tokens", 0) or 0
+
+    def _fanout_processes(
+        self, business_description: str, process_output: str
+    ) -> List[ProcessAnalysis]:
+        """Processes that get ROI sub-tasks, as _parse_analysis_result sees them"""
+        processes = parse_task_output(TASK_OUTPUT_FIELDS[1], process_output).get(
+            "process_analyses"
+        )
+        if processes is None:
+            processes = self._create_fallback_analysis(
+                business_description
+            ).process_analyses
+        return [processes[i] for i in select_roi_processes(processes)]
+
+    def _reservation(
+        self,
+        business_description: str,
+        prompts: List[Tuple[str, str]],
+        profile: str = None,
+    ) -> Tuple[int, int]:
+        """Requests and estimated tokens to reserve from the rate limiter
+
+        Covers prompt tokens plus a completion allowance for every task,
+        including the ROI sub-tasks that fan out after process analysis. A
+        confident profile means the research task is never sent.
+        """
+        roi_prompt = self.prompt_builder.build(
+            ROI_TASK_INSTRUCTIONS,
+            ROI_SUBTASK_SCHEMA,
+            [
+                (
+                    "Business description",
+                    self.prompt_builder.fit_description(business_description),
+                )
+            ],
+        )
+        sent = prompts[1:] if profile else prompts
+        tokens = (
+            prompt_tokens(sent)
+            + ROI_FANOUT * (prompt_tokens([roi_prompt]) + 100)
+            + (len(sent) + ROI_FANOUT) * 1000
+        )
+        return len(sent) + ROI_FANOUT, tokens
+
+    def _kickoff_crew_limited(
+        self,
+        business_description: str,
+        prompts: List[Tuple[str, str]],
+        stream: _StreamEmitter,
+        job_id: str,
+        max_retries: int,
+        profile: str = None,
+    ) -> List[str]:
+        """Run the crew behind the shared rate limiter from a worker thread
+
+        Throttling errors are retried with exponential backoff, resuming
+        from the tasks checkpointed under job_id.
+        """
+        requests, tokens = self._reservation(business_description, prompts, profile)
+        for attempt in range(max_retries + 1):
+            try:
+                with self.rate_limiter.limit_sync(requests, tokens):
+                    outputs, used = self._kickoff_crew(
+                        business_description, prompts, stream, job_id, profile
+                    )
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt == max_retries:
+                    raise
+                self.rate_limiter.record_throttle(tokens)
+                delay = min(60, 2**attempt)
+                if stream is not None:
+                    stream.status(f"Rate limited, retrying in {delay}s")
+                    stream.restart()
+                time.sleep(delay)
+                continue
+            if used:
+                self.rate_limiter.settle(tokens, used)
+            return outputs
+
+    def _run_analysis(
+        self,
+        business_description: str,
+        use_cache: bool = True,
+        stream: _StreamEmitter = None,
+        job_id: str = None,
+        max_retries: int = 5,
+    ) -> MarketResearchResult:
+        """Run the research crew, falling back to heuristics on failure
+
+        With a stream, progress goes out as events instead of print lines.
+        The crew runs behind the shared rate limiter and throttling errors
+        are retried up to max_retries times before falling back.
+        """
+        if self.offline:
+            METRICS.inc("market_research_analyses_total", source="heuristic")
+            return self._create_fallback_analysis(business_description)
+
+        say = print if stream is None else stream.status
+        say("🤖 Starting AI analysis...")
+        say("   Initializing research agents...")
+
+        try:
+            # Computed once: the prompts, reservation and crew all depend on it
+            profile = self._confident_profile(business_description)
+            prompts = self._task_prompts(business_description, research_output=profile)
+            cache_key = self._cache_key(business_description, prompts)
+
+            # Bypassing the cache skips the lookup but still refreshes the entry
+            outputs = self.cache.get(cache_key) if use_cache else None
+            if outputs is not None:
+                say("   Using cached agent responses...")
+                source = "cache"
+            elif use_cache:
+                outputs = self._similar_outputs(business_description, say)
+                source = "similar"
+            if outputs is not None:
+                if stream is not None:
+                    stream.replay(outputs)
+            else:
+                say("   Agents analyzing business processes...")
+                say("   Calculating ROI projections...")
+
+                job_id = job_id or cache_key
+                if not use_cache:
+                    self.checkpoints.clear(job_id)
+                outputs = self._kickoff_crew_limited(
+                    business_description, prompts, stream, job_id, max_retries, profile
+                )
+                self.cache.put(cache_key, outputs)
+                self.similarity.add(
+                    business_description, cache_key, self._similarity_scope()
+                )
+                source = "crew"
+
+            # Parse and structure the results
+            with METRICS.span("parse"):
+                result = self._parse_analysis_result(outputs, business_description)
+            METRICS.inc("market_research_analyses_total", source=source)
+            return result
+
+        except Exception as e:
+            say(f"❌ Error during AI analysis: {e}")
+            say("Creating fallback analysis...")
+            METRICS.inc("market_research_analyses_total", source="fallback")
+            return self._create_fallback_analysis(business_description)
+
+    def analyze_business_stream(
+        self,
+        business_description: str,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+    ) -> Iterator[AnalysisEvent]:
+        """Stream an analysis as task, token and field events
+
+        The crew runs on a background thread. Validated profile fields and
+        processes are yielded as soon as their JSON completes; the last
+        event is the finished result.
+        """
+        events = queue.Queue()
+        stream = _StreamEmitter(events.put)
+
+        def run():
+            try:
+                result = self._run_analysis(business_description, use_cache, stream)
+                if simulation is not None:
+                    result.roi_simulation = simulate_roi(result, simulation)
+                events.put(AnalysisEvent("result", value=result))
+            finally:
+                events.put(None)
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            yield event
+        worker.join()
+
+    async def analyze_business_stream_async(
+        self,
+        business_description: str,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+        max_retries: int = 5,
+    ) -> AsyncIterator[AnalysisEvent]:
+        """Async generator form of analyze_business_stream, rate limited"""
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        stream = _StreamEmitter(
+            lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+        )
+
+        async def run():
+            try:
+                result = await self._run_analysis_async(
+                    business_description, use_cache, max_retries, stream
+                )
+                if simulation is not None:
+                    result.roi_simulation = simulate_roi(result, simulation)
+                events.put_nowait(AnalysisEvent("result", value=result))
+            finally:
+                # Queue the end marker behind any events still in flight
+                loop.call_soon(events.put_nowait, None)
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            await task
+        finally:
+            task.cancel()
+
+    async def analyze_business_async(
+        self,
+        business_description: str,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+        max_retries: int = 5,
+        job_id: str = None,
+    ) -> MarketResearchResult:
+        """Asyncio-native analyze_business behind the shared rate limiter
+
+        Each crew run reserves its requests and an estimate of its tokens
+        from the limiter before it starts. Provider throttling errors are
+        retried with exponential backoff instead of degrading straight to
+        the heuristic fallback. Retries resume from the tasks checkpointed
+        under job_id.
+        """
+        result = await self._run_analysis_async(
+            business_description, use_cache, max_retries, job_id=job_id
+        )
+        if simulation is not None:
+            result.roi_simulation = simulate_roi(result, simulation)
+        return result
+
+    async def _run_analysis_async(
+        self,
+        business_description: str,
+        use_cache: bool,
+        max_retries: int,
+        stream: _StreamEmitter = None,
+        job_id: str = None,
+    ) -> MarketResearchResult:
+        """Rate-limited crew run with backoff on throttling"""
+        if self.offline:
+            METRICS.inc("market_research_analyses_total", source="heuristic")
+            return self._create_fallback_analysis(business_description)
+
+        say = print if stream is None else stream.status
+        profile = self._confident_profile(business_description)
+        prompts = self._task_prompts(business_description, research_output=profile)
+        cache_key = self._cache_key(business_description, prompts)
+        outputs = self.cache.get(cache_key) if use_cache else None
+        source = "cache"
+        if outputs is None and use_cache:
+            outputs = self._similar_outputs(business_description, say)
+            source = "similar"
+        if outputs is not None:
+            if stream is not None:
+                stream.replay(outputs)
+            with METRICS.span("parse"):
+                result = self._parse_analysis_result(outputs, business_description)
+            METRICS.inc("market_research_analyses_total", source=source)
+            return result
+
+        requests, tokens = self._reservation(business_description, prompts, profile)
+        job_id = job_id or cache_key
+        if not use_cache:
+            self.checkpoints.clear(job_id)
+        for attempt in range(max_retries + 1):
+            try:
+                async with self.rate_limiter.limit(requests, tokens):
+                    outputs, used = await asyncio.to_thread(
+                        self._kickoff_crew,
+                        business_description,
+                        prompts,
+                        stream,
+                        job_id,
+                        profile,
+                    )
+                if used:
+                    self.rate_limiter.settle(tokens, used)
+                self.cache.put(cache_key, outputs)
+                self.similarity.add(
+                    business_description, cache_key, self._similarity_scope()
+                )
+                with METRICS.span("parse"):
+                    result = self._parse_analysis_result(outputs, business_description)
+                METRICS.inc("market_research_analyses_total", source="crew")
+                return result
+            except Exception as e:
+                if _is_rate_limit_error(e) and attempt < max_retries:
+                    self.rate_limiter.record_throttle(tokens)
+                    delay = min(60, 2**attempt)
+                    if stream is not None:
+                        stream.status(f"Rate limited, retrying in {delay}s")
+                        stream.restart()
+                    await asyncio.sleep(delay)
+                    continue
+                say(f"❌ Error during AI analysis: {e}")
+                say("Creating fallback analysis...")
+                METRICS.inc("market_research_analyses_total", source="fallback")
+                return self._create_fallback_analysis(business_description)
+
+    def analyze_batch(
+        self,
+        descriptions: List[str],
+        max_workers: int = 4,
+        heuristic: bool = False,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+    ) -> List[BatchItemResult]:
+        """Analyze many business descriptions on a worker pool
+
+        LLM analyses are I/O bound and run on threads; heuristic analyses are
+        CPU bound and run on a process pool. Results come back in input order
+        and a failing item only fills its own error slot.
+        """
+        chunksize = max(1, min(1000, len(descriptions) // (max_workers * 4)))
+        items = list(
+            self.iter_batch(
+                descriptions,
+                max_workers=max_workers,
+                heuristic=heuristic,
+                simulation=simulation,
+                use_cache=use_cache,
+                chunksize=chunksize,
+            )
+        )
+        items.sort(key=lambda item: item.index)
+        return items
+
+    def iter_batch(
+        self,
+        descriptions: Iterable[str],
+        max_workers: int = 4,
+        heuristic: bool = False,
+        simulation: SimulationConfig = None,
+        use_cache: bool = True,
+        chunksize: int = 256,
+        skip: Container[int] = (),
+    ) -> Iterator[BatchItemResult]:
+        """Yield batch results as they complete
+
+        Descriptions are read lazily and only a bounded window of work is in
+        flight, so memory stays flat however long the input is. Results are
+        yielded in completion order; use BatchItemResult.index to restore
+        input order. Items whose index is in skip are not yielded; in AI
+        mode they are not run at all.
+        """
+        if heuristic:
+            # Ship whole chunks so each worker runs one vectorized ROI pass
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            work = (
+                (_run_portfolio_chunk, self, start, chunk, simulation)
+                for start, chunk in _chunked(descriptions, chunksize)
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            analyze = functools.partial(
+                self.analyze_business, simulation=simulation, use_cache=use_cache
+            )
+            work = (
+                (_run_batch_chunk, analyze, start, chunk)
+                for start, chunk in _chunked(descriptions, 1)
+                if start not in skip
+            )
+
+        with executor:
+            pending = set()
+            for fn, *args in work:
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from _unskipped(future.result(), skip)
+                pending.add(executor.submit(fn, *args))
+            for future in as_completed(pending):
+                yield from _unskipped(future.result(), skip)
+
+    def _parse_analysis_result(
+        self, task_outputs: List[str], business_description: str
+    ) -> MarketResearchResult:
+        """Parse the raw agent result into structured data
+
+        Each task's JSON is validated field by field. Fields that are
+        missing, truncated or invalid are taken from the heuristic analysis,
+        so partial output is still used. Outputs after the sequential tasks
+        are the per-process ROI sub-tasks, merged by merge_process_roi.
+        """
+        sequential = len(TASK_OUTPUT_FIELDS)
+        profile_fields, process_fields = [
+            parse_task_output(fields, output)
+            for fields, output in zip(TASK_OUTPUT_FIELDS, task_outputs)
+        ] + [{}] * (sequential - len(task_outputs[:sequential]))
+        roi_fields = [
+            parse_task_output(ROI_SUBTASK_FIELDS, output)
+            for output in task_outputs[sequential:]
+        ]
+
+        # The heuristic analysis is only built if some field needs it
+        heuristic = []
+
+        def fallback() -> MarketResearchResult:
+            if not heuristic:
+                heuristic.append(self._create_fallback_analysis(business_description))
+            return heuristic[0]
+
+        def pick(parsed: Dict, name: str, default: Callable):
+            if name in parsed:
+                return parsed[name]
+            METRICS.inc("market_research_field_fallbacks_total", field=name)
+            return default(fallback())
+
+        business_profile = BusinessProfile(
+            name=pick(profile_fields, "name", lambda r: r.business_profile.name),
+            industry=pick(
+                profile_fields, "industry", lambda r: r.business_profile.industry
+            ),
+            size=pick(profile_fields, "size", lambda r: r.business_profile.size),
+            revenue_range=pick(
+                profile_fields,
+                "revenue_range",
+                lambda r: r.business_profile.revenue_range,
+            ),
+            description=business_description,
+            pain_points=pick(
+                profile_fields, "pain_points", lambda r: r.business_profile.pain_points
+            ),
+            current_processes=pick(
+                profile_fields,
+                "current_processes",
+                lambda r: r.business_profile.current_processes,
+            ),
+        )
+
+        processes, totals = merge_process_roi(
+            pick(process_fields, "process_analyses", lambda r: r.process_analyses),
+            roi_fields,
+        )
+        investment_range = pick(
+            totals, "investment_range", lambda r: r.investment_range
+        )
+        recommended_solution = {
+            "approach": pick(
+                process_fields, "approach", lambda r: r.recommended_solution["approach"]
+            ),
+            "components": pick(
+                totals, "components", lambda r: r.recommended_solution["components"]
+            ),
+            "timeline": pick(
+                process_fields, "timeline", lambda r: r.recommended_solution["timeline"]
+            ),
+            "investment": investment_range,
+        }
+        if "risks" in totals:
+            recommended_solution["risks"] = totals["risks"]
+
+        return MarketResearchResult(
+            business_profile=business_profile,
+            process_analyses=processes,
+            overall_roi=pick(totals, "overall_roi", lambda r: r.overall_roi),
+            recommended_solution=recommended_solution,
+            implementation_roadmap=pick(
+                process_fields,
+                "implementation_roadmap",
+                lambda r: r.implementation_roadmap,
+            ),
+            investment_range=investment_range,
+            payback_months=pick(totals, "payback_months", lambda r: r.payback_months),
+        )
+
+    def extract_features(self, description: str) -> DescriptionFeatures:
+        """Extract industry, size and revenue from a description in one pass"""
+        return FEATURE_EXTRACTOR.extract(description)
+
+    def _extract_industry(self, description: str) -> str:
+        """Extract industry from business description with better coverage"""
+        return self.extract_features(description).industry
+
+    def _estimate_business_size(self, description: str) -> str:
+        """Estimate business size with proper enterprise scaling"""
+        return self.extract_features(description).size
+
+    def _estimate_revenue(self, description: str) -> str:
+        """Estimate revenue range with enterprise brackets"""
+        return self.extract_features(description).revenue_range
+
+    def heuristic_profile(self, business_description: str) -> Tuple[Dict, float]:
+        """Research task profile fields from the heuristics, with a confidence
+
+        The 0-1 confidence adds up PROFILE_CONFIDENCE_WEIGHTS for each fact
+        the description states outright: an industry keyword (in the
+        industry answer, for questionnaires), an employee count, a revenue
+        amount, and answers naming time-consuming processes and challenges.
+        """
+        features = self.extract_features(business_description)
+        answers = dict(questionnaire_answers(business_description))
+        if "Industry" in answers:
+            stated = FEATURE_EXTRACTOR.extract(answers["Industry"])
+            clear_industry = (
+                stated.industry_matched and stated.industry == features.industry
+            )
+        else:
+            clear_industry = features.industry_matched
+        processes = _answer_items(answers.get("Most time-consuming processes"))
+        challenges = _answer_items(answers.get("Challenges"))
+
+        stated_facts = {
+            "industry": clear_industry,
+            "employees": features.employee_count is not None,
+            "revenue": features.revenue_stated,
+            "processes": bool(processes),
+            "challenges": bool(challenges),
+        }
+        confidence = sum(
+            PROFILE_CONFIDENCE_WEIGHTS[fact]
+            for fact, stated in stated_facts.items()
+            if stated
+        )
+        profile = {
+            "name": "Client Business",
+            "industry": features.industry,
+            "size": features.size,
+            "revenue_range": features.revenue_range,
+            "pain_points": challenges or list(DEFAULT_PAIN_POINTS),
+            "current_processes": processes or list(DEFAULT_CURRENT_PROCESSES),
+        }
+        return profile, round(confidence, 2)
+
+    def _select_template(self, features: DescriptionFeatures) -> IndustryTemplate:
+        """Look up the heuristic industry template for a description"""
+        return load_industry_templates().get(features.industry)
+
+    def analyze_portfolio(
+        self, descriptions: List[str], simulation: SimulationConfig = None
+    ) -> Tuple[List[MarketResearchResult], RoiArrays]:
+        """Run the heuristic analysis for many descriptions at once
+
+        ROI figures for every client and process are computed in a single
+        vectorized pass. Returns the MarketResearchResult list together with
+        the RoiArrays it was built from.
+        """
+        features = [self.extract_features(d) for d in descriptions]
+        templates = [self._select_template(f) for f in features]
+        arrays = compute_roi_arrays(templates, [f.revenue for f in features])
+
+        results = [
+            self._build_fallback_result(description, feature, template, arrays, row)
+            for row, (description, feature, template) in enumerate(
+                zip(descriptions, features, templates)
+            )
+        ]
+        if simulation is not None:
+            for result in results:
+                result.roi_simulation = simulate_roi(result, simulation)
+        return results, arrays
+
+    def score_heuristic(
+        self,
+        descriptions: Iterable[str],
+        max_workers: int = None,
+        shard_size: int = 4096,
+    ) -> HeuristicScores:
+        """Score descriptions with the heuristic model on every core
+
+        The input is read lazily in segments of a few shards per worker.
+        Each segment gets a shared-memory ROI block that workers fill in
+        place; the parent only copies finished blocks out, so no result
+        dataclasses are built or pickled. Two segments are kept in flight
+        so workers never wait on a segment's slowest shard.
+        """
+        np = _import_numpy()
+        max_workers = max_workers or os.cpu_count() or 1
+        registry = load_industry_templates()
+        width = max(len(t.processes) for t in registry.templates.values())
+        segment_rows = shard_size * max_workers * 2
+
+        segments: List[Dict[str, "np.ndarray"]] = []
+        errors: Dict[int, str] = {}
+        in_flight: List[Tuple[SharedRoiBlock, List]] = []
+
+        def finish(block: SharedRoiBlock, futures: List):
+            try:
+                for future in futures:
+                    errors.update(future.result())
+                segments.append(block.copy())
+            finally:
+                block.unlink()
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for start, segment in _chunked(descriptions, segment_rows):
+                    block = SharedRoiBlock(len(segment), width)
+                    futures = [
+                        executor.submit(
+                            _score_shard,
+                            self,
+                            block.name,
+                            block.rows,
+                            width,
+                            offset,
+                            start + offset,
+                            segment[offset : offset + shard_size],
+                        )
+                        for offset in range(0, len(segment), shard_size)
+                    ]
+                    in_flight.append((block, futures))
+                    if len(in_flight) > 1:
+                        finish(*in_flight.pop(0))
+                while in_flight:
+                    finish(*in_flight.pop(0))
+            finally:
+                for block, futures in in_flight:
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                    block.unlink()
+
+        columns = {
+            field: (
+                np.concatenate([segment[field] for segment in segments])
+                if segments
+                else np.zeros((0, width) if per_process else 0, dtype=dtype)
+            )
+            for field, dtype, per_process in SHARED_ROI_COLUMNS
+        }
+        templates = columns.pop("template")
+        return HeuristicScores(
+            arrays=RoiArrays(**columns),
+            templates=templates,
+            template_keys=list(registry.templates),
+            errors=errors,
+        )
+
+    def analyze_heuristic(
+        self, business_description: str, simulation: SimulationConfig = None
+    ) -> MarketResearchResult:
+        """Analyze a single description with the heuristic model only"""
+        results, _ = self.analyze_portfolio([business_description], simulation)
+        return results[0]
+
+    def _create_fallback_analysis(
+        self, business_description: str
+    ) -> MarketResearchResult:
+        """Create industry-specific analysis based on business type"""
+        with METRICS.span("heuristic"):
+            return self.analyze_heuristic(business_description)
+
+    def _build_fallback_result(
+        self,
+        business_description: str,
+        features: DescriptionFeatures,
+        template: IndustryTemplate,
+        arrays: RoiArrays,
+        row: int,
+    ) -> MarketResearchResult:
+        """Assemble the result dataclasses for one row of the ROI arrays"""
+
+        business_profile = BusinessProfile(
+            name="Client Business",
+            industry=features.industry,
+            size=features.size,
+            revenue_range=features.revenue_range,
+            description=business_description,
+            pain_points=list(DEFAULT_PAIN_POINTS),
+            current_processes=list(DEFAULT_CURRENT_PROCESSES),
+        )
+
+        current_costs = arrays.current_cost[row].tolist()
+        savings = arrays.savings[row].tolist()
+        process_analyses = [
+            ProcessAnalysis(
+                name=process.name,
+                time_percentage=process.time_percentage,
+                complexity_score=process.complexity_score,
+                automation_potential=process.automation_potential,
+                current_cost_annual=current_costs[col],
+                potential_savings=savings[col],
+                roi_percentage=process.savings_percentage,
+                implementation_difficulty=process.implementation_difficulty,
+            )
+            for col, process in enumerate(template.processes)
+        ]
+
+        investment = template.format_investment(
+            float(arrays.implementation_cost[row]),
+            float(arrays.implementation_cost_high[row]),
+        )
+        recommended_solution = {
+            "approach": template.approach,
+            "components": list(template.components),
+            "timeline": template.timeline,
+            "investment": investment,
+        }
+
+        implementation_roadmap = [
+            "Week 1-4: Discovery and requirements gathering",
+            "Week 5-8: Solution design and architecture planning",
+            "Week 9-16: Core system development and testing",
+            "Week 17-20: Integration and system testing",
+            "Week 21-24: Deployment and user training",
+        ]
+
+        return MarketResearchResult(
+            business_profile=business_profile,
+            process_analyses=process_analyses,
+            overall_roi=float(arrays.overall_roi[row]),
+            recommended_solution=recommended_solution,
+            implementation_roadmap=implementation_roadmap,
+            investment_range=investment,
+            payback_months=int(arrays.payback_months[row]),
+        )
+
+    def _extract_revenue_number(self, description: str) -> float:
+        """Extract numeric revenue from description"""
+        return self.extract_features(description).revenue
+
+
+def print_header():
+    """Print professional header"""
+    print("\n" + "=" * 80)
+    print("🤖 AGENTIC AI MARKET RESEARCH AGENT")
+    print("   Professional Business Analysis & AI Opportunity Assessment")
+    print("=" * 80)
+    print()
+
+
+def collect_business_info() -> str:
+    """Collect business information from user"""
+    print("📋 BUSINESS DISCOVERY QUESTIONNAIRE")
+    print("-" * 40)
+
+    responses = []
+    for i, (question, _) in enumerate(QUESTIONNAIRE, 1):
+        print(f"\n{i}. {question}")
+        response = input("   → ").strip()
+        if response:
+            responses.append(f"{question} {response}")
+
+    return " ".join(responses)
+
+
+def format_currency(amount: float) -> str:
+    """Format currency for display"""
+    return f"${amount:,.0f}"
+
+
+STREAM_TASK_TITLES = {
+    "market_research": "🔎 Researching the business",
+    "process_analysis": "⚡ Analyzing processes",
+    "roi_calculation": "💰 Calculating ROI",
+}
+
+STREAM_PROFILE_LABELS = {
+    "industry": "Industry",
+    "size": "Size",
+    "revenue_range": "Revenue Range",
+    "pain_points": "Pain Points",
+    "current_processes": "Current Processes",
+}
+
+
+class StreamRenderer:
+    """Print partial analysis sections as streamed events arrive"""
+
+    def __init__(self):
+        self.tokens = 0
+
+    def handle(self, event: AnalysisEvent):
+        if event.kind == "status":
+            print(event.value)
+        elif event.kind == "task_started":
+            print(f"\n{STREAM_TASK_TITLES.get(event.task, event.task)}...")
+        elif event.kind == "token":
+            self.tokens += 1
+            print(f"\r   ✍️  {self.tokens} tokens received", end="", flush=True)
+        elif event.kind == "field" and event.name in STREAM_PROFILE_LABELS:
+            value = event.value
+            if isinstance(value, list):
+                value = ", ".join(value)
+            self._print(f"   {STREAM_PROFILE_LABELS[event.name]}: {value}")
+        elif event.kind == "item" and event.name == "process_analyses":
+            process = event.value
+            self._print(
+                f"   • {process.name}: {process.automation_potential} potential, "
+                f"{format_currency(process.potential_savings)}/year savings"
+            )
+        elif event.kind == "item" and event.name == "process_roi":
+            fields = event.value
+            line = f"   • {fields.get('name', 'Process')}"
+            if "roi_percentage" in fields:
+                line += f": {fields['roi_percentage']:.0f}% ROI"
+            if "payback_months" in fields:
+                line += f", {fields['payback_months']} month payback"
+            self._print(line)
+        elif event.kind == "task_completed":
+            self._print("   ✅ Done")
+
+    def _print(self, line: str):
+        # Overwrite the token counter line before printing a section line
+        print("\r" + " " * 40 + "\r" + line, flush=True)
+
+
+REPORT_RULE = "=" * 80
+
+REPORT_NEXT_STEPS = [
+    "Schedule discovery call to discuss specific requirements",
+    "Develop proof of concept for highest-impact process",
+    "Create detailed implementation plan and timeline",
+    "Begin with pilot program to validate ROI projections",
+]
+
+REPORT_RISK_BANDS = [
+    ("Conservative", "p10", "p90"),
+    ("Realistic", "p50", "p50"),
+    ("Optimistic", "p90", "p10"),
+]
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]|<>#])")
+
+
+def _escape_markdown(text: str) -> str:
+    """Backslash-escape Markdown syntax characters"""
+    if _MARKDOWN_SPECIAL.search(text) is None:
+        return text
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+# Per-format report templates. Every report is the header, one process
+# entry per process, the financial summary, the optional risk bands, the
+# solution, one roadmap step per step and the footer; "document_start" and
+# "document_end" wrap a whole stream of reports and are written verbatim.
+REPORT_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "text": {
+        "header": "\n"
+        + REPORT_RULE
+        + "\n📊 BUSINESS ANALYSIS REPORT\n"
+        + REPORT_RULE
+        + "\n\n🏢 BUSINESS PROFILE\n"
+        + "-" * 20
+        + "\nIndustry: {industry}\nSize: {size}\nRevenue Range: {revenue_range}\n"
+        + "\n⚡ AUTOMATION OPPORTUNITIES\n"
+        + "-" * 30
+        + "\n",
+        "process": "\n{index}. {name}\n"
+        "   • Time Investment: {time_percentage}% of operations\n"
+        "   • Current Annual Cost: {current_cost}\n"
+        "   • Potential Savings: {savings}\n"
+        "   • Automation Potential: {automation_potential}\n"
+        "   • ROI: {roi:.0f}%\n",
+        "financial": "\n💰 FINANCIAL IMPACT SUMMARY\n"
+        + "-" * 28
+        + "\nTotal Current Annual Cost: {total_cost}\n"
+        "Projected Annual Savings: {total_savings}\n"
+        "Overall ROI: {overall_roi:.0f}%\n"
+        "Payback Period: {payback_months} months\n",
+        "simulation": "\n🎲 ROI RISK BANDS\n"
+        + "-" * 17
+        + "\nSimulated Scenarios: {draws:,}\n",
+        "band": "{label}: {roi:.0f}% ROI, {payback:.1f} month payback\n",
+        "simulation_end": "Payback Within 12 Months: {within:.0%} of scenarios\n",
+        "solution": "\n🎯 RECOMMENDED SOLUTION\n"
+        + "-" * 24
+        + "\nApproach: {approach}\nComponents: {components}\n"
+        "Timeline: {timeline}\nInvestment Range: {investment}\n"
+        "\n🗺️  IMPLEMENTATION ROADMAP\n" + "-" * 27 + "\n",
+        "step": "   • {step}\n",
+        "footer": "\n🚀 RECOMMENDED NEXT STEPS\n"
+        + "-" * 26
+        + "\n"
+        + "".join(f"   • {step}\n" for step in REPORT_NEXT_STEPS)
+        + "\n"
+        + REPORT_RULE
+        + "\nReport Generated: {generated}\n"
+        + REPORT_RULE
+        + "\n",
+        "document_start": "",
+        "document_end": "",
+    },
+    "markdown": {
+        "header": "# 📊 Business Analysis Report\n\n## 🏢 Business Profile\n\n"
+        "- **Industry:** {industry}\n- **Size:** {size}\n"
+        "- **Revenue Range:** {revenue_range}\n\n"
+        "## ⚡ Automation Opportunities\n\n"
+        "| # | Process | Time | Current Annual Cost | Potential Savings "
+        "| Automation Potential | ROI |\n"
+        "|---:|---|---:|---:|---:|---|---:|\n",
+        "process": "| {index} | {name} | {time_percentage}% | {current_cost} "
+        "| {savings} | {automation_potential} | {roi:.0f}% |\n",
+        "financial": "\n## 💰 Financial Impact Summary\n\n"
+        "- **Total Current Annual Cost:** {total_cost}\n"
+        "- **Projected Annual Savings:** {total_savings}\n"
+        "- **Overall ROI:** {overall_roi:.0f}%\n"
+        "- **Payback Period:** {payback_months} months\n",
+        "simulation": "\n## 🎲 ROI Risk Bands\n\n- **Simulated Scenarios:** {draws:,}\n",
+        "band": "- **{label}:** {roi:.0f}% ROI, {payback:.1f} month payback\n",
+        "simulation_end": "- **Payback Within 12 Months:** {within:.0%} of scenarios\n",
+        "solution": "\n## 🎯 Recommended Solution\n\n"
+        "- **Approach:** {approach}\n- **Components:** {components}\n"
+        "- **Timeline:** {timeline}\n- **Investment Range:** {investment}\n\n"
+        "## 🗺️ Implementation Roadmap\n\n",
+        "step": "- {step}\n",
+        "footer": "\n## 🚀 Recommended Next Steps\n\n"
+        + "".join(f"- {step}\n" for step in REPORT_NEXT_STEPS)
+        + "\n*Report Generated: {generated}*\n\n---\n\n",
+        "document_start": "",
+        "document_end": "",
+    },
+    "html": {
+        "header": '<article class="report">\n<h1>📊 Business Analysis Report</h1>\n'
+        "<h2>🏢 Business Profile</h2>\n<dl>\n"
+        "<dt>Industry</dt><dd>{industry}</dd>\n<dt>Size</dt><dd>{size}</dd>\n"
+        "<dt>Revenue Range</dt><dd>{revenue_range}</dd>\n</dl>\n"
+        "<h2>⚡ Automation Opportunities</h2>\n<table>\n"
+        "<tr><th>#</th><th>Process</th><th>Time</th><th>Current Annual Cost</th>"
+        "<th>Potential Savings</th><th>Automation Potential</th><th>ROI</th></tr>\n",
+        "process": "<tr><td>{index}</td><td>{name}</td><td>{time_percentage}%</td>"
+        "<td>{current_cost}</td><td>{savings}</td><td>{automation_potential}</td>"
+        "<td>{roi:.0f}%</td></tr>\n",
+        "financial": "</table>\n<h2>💰 Financial Impact Summary</h2>\n<dl>\n"
+        "<dt>Total Current Annual Cost</dt><dd>{total_cost}</dd>\n"
+        "<dt>Projected Annual Savings</dt><dd>{total_savings}</dd>\n"
+        "<dt>Overall ROI</dt><dd>{overall_roi:.0f}%</dd>\n"
+        "<dt>Payback Period</dt><dd>{payback_months} months</dd>\n</dl>\n",
+        "simulation": "<h2>🎲 ROI Risk Bands</h2>\n<dl>\n"
+        "<dt>Simulated Scenarios</dt><dd>{draws:,}</dd>\n",
+        "band": "<dt>{label}</dt>"
+        "<dd>{roi:.0f}% ROI, {payback:.1f} month payback</dd>\n",
+        "simulation_end": "<dt>Payback Within 12 Months</dt>"
+        "<dd>{within:.0%} of scenarios</dd>\n</dl>\n",
+        "solution": "<h2>🎯 Recommended Solution</h2>\n<dl>\n"
+        "<dt>Approach</dt><dd>{approach}</dd>\n"
+        "<dt>Components</dt><dd>{components}</dd>\n"
+        "<dt>Timeline</dt><dd>{timeline}</dd>\n"
+        "<dt>Investment Range</dt><dd>{investment}</dd>\n</dl>\n"
+        "<h2>🗺️ Implementation Roadmap</h2>\n<ul>\n",
+        "step": "<li>{step}</li>\n",
+        "footer": "</ul>\n<h2>🚀 Recommended Next Steps</h2>\n<ul>\n"
+        + "".join(f"<li>{step}</li>\n" for step in REPORT_NEXT_STEPS)
+        + "</ul>\n<footer>Report Generated: {generated}</footer>\n</article>\n",
+        "document_start": '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+        '<meta charset="utf-8">\n<title>Business Analysis Reports</title>\n<style>\n'
+        "body { font-family: sans-serif; max-width: 60em; margin: auto; }\n"
+        "article { border-bottom: 1px solid #ccc; padding-bottom: 1em; }\n"
+        "dt { font-weight: bold; float: left; clear: left; width: 14em; }\n"
+        "table { border-collapse: collapse; }\n"
+        "td, th { border: 1px solid #ccc; padding: 0.25em 0.5em; }\n"
+        "</style>\n</head>\n<body>\n",
+        "document_end": "</body>\n</html>\n",
+    },
+}
+
+REPORT_ESCAPES: Dict[str, Callable[[str], str]] = {
+    "text": str,
+    "markdown": _escape_markdown,
+    "html": html.escape,
+}
+
+REPORT_EXTENSIONS = {
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".html": "html",
+    ".htm": "html",
+}
+
+REPORT_BUFFER_SIZE = 1 << 20
+
+
+class ReportRenderer:
+    """Render analysis reports as text, Markdown or HTML
+
+    Templates are looked up and bound once per renderer, and each report is
+    assembled in a single pass over its processes into one string, so a
+    report costs one write however many lines it has. Totals are summed in
+    the same pass that formats the process entries.
+    """
+
+    def __init__(self, report_format: str = "text"):
+        if report_format not in REPORT_TEMPLATES:
+            raise ValueError(
+                f"Unknown report format {report_format!r}; "
+                f"choose from {', '.join(REPORT_TEMPLATES)}"
+            )
+        templates = REPORT_TEMPLATES[report_format]
+        self.report_format = report_format
+        self._escape = REPORT_ESCAPES[report_format]
+        self._header = templates["header"].format
+        self._process = templates["process"].format
+        self._financial = templates["financial"].format
+        self._simulation = templates["simulation"].format
+        self._band = templates["band"].format
+        self._simulation_end = templates["simulation_end"].format
+        self._solution = templates["solution"].format
+        self._step = templates["step"].format
+        self._footer = templates["footer"].format
+        self.document_start = templates["document_start"]
+        self.document_end = templates["document_end"]
+
+    @staticmethod
+    def format_for(path: str) -> str:
+        """Pick a report format from a file name's extension"""
+        return REPORT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+
+    @staticmethod
+    def timestamp() -> str:
+        return datetime.now().strftime("%B %d, %Y at %I:%M %p")
+
+    def render(self, result: MarketResearchResult, generated: str = None) -> str:
+        """Render one report"""
+        escape = self._escape
+        profile = result.business_profile
+        solution = result.recommended_solution
+        parts = [
+            self._header(
+                industry=escape(profile.industry),
+                size=escape(profile.size),
+                revenue_range=escape(profile.revenue_range),
+            )
+        ]
+
+        total_cost = total_savings = 0
+        for index, process in enumerate(result.process_analyses, 1):
+            total_cost += process.current_cost_annual
+            total_savings += process.potential_savings
+            parts.append(
+                self._process(
+                    index=index,
+                    name=escape(process.name),
+                    time_percentage=process.time_percentage,
+                    current_cost=format_currency(process.current_cost_annual),
+                    savings=format_currency(process.potential_savings),
+                    automation_potential=escape(process.automation_potential),
+                    roi=process.roi_percentage,
+                )
+            )
+
+        parts.append(
+            self._financial(
+                total_cost=format_currency(total_cost),
+                total_savings=format_currency(total_savings),
+                overall_roi=result.overall_roi,
+                payback_months=result.payback_months,
+            )
+        )
+
+        simulation = result.roi_simulation
+        if simulation:
+            parts.append(self._simulation(draws=simulation.draws))
+            for label, roi_band, payback_band in REPORT_RISK_BANDS:
+                roi = simulation.roi_percentiles.get(roi_band)
+                payback = simulation.payback_percentiles.get(payback_band)
+                if roi is not None and payback is not None:
+                    parts.append(self._band(label=label, roi=roi, payback=payback))
+            parts.append(
+                self._simulation_end(within=simulation.payback_within_12_months)
+            )
+
+        parts.append(
+            self._solution(
+                approach=escape(solution["approach"]),
+                components=escape(", ".join(solution["components"])),
+                timeline=escape(solution["timeline"]),
+                investment=escape(result.investment_range),
+            )
+        )
+        parts.extend(
+            self._step(step=escape(step)) for step in result.implementation_roadmap
+        )
+        parts.append(self._footer(generated=generated or self.timestamp()))
+        return "".join(parts)
+
+    @contextlib.contextmanager
+    def document(self, out: TextIO) -> Iterator[Callable[[MarketResearchResult], None]]:
+        """Stream reports into one output handle
+
+        Yields a function that renders and writes one report; the document
+        wrapper (the HTML page, for instance) is written around them. Every
+        report in the document shares one generation timestamp.
+        """
+        generated = self.timestamp()
+        out.write(self.document_start)
+        yield lambda result: out.write(self.render(result, generated))
+        out.write(self.document_end)
+
+    def write(self, results: Iterable[MarketResearchResult], out: TextIO) -> int:
+        """Write many reports as one document and return how many were written"""
+        count = 0
+        with self.document(out) as add:
+            for result in results:
+                add(result)
+                count += 1
+        return count
+
+
+TEXT_REPORT = ReportRenderer("text")
+
+
+@METRICS.timed("render")
+def print_analysis_report(result: MarketResearchResult):
+    """Print professionally formatted analysis report"""
+    print(TEXT_REPORT.render(result), end="", flush=True)
+
+
+@METRICS.timed("save")
+def save_report(result: MarketResearchResult, filename: str = None):
+    """Save analysis report to file"""
+    if not filename:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"market_research_analysis_{timestamp}.json"
+
+    with open(filename, "w") as f:
+        json.dump(asdict(result), f, indent=2, default=str)
+
+    print(f"\n💾 Analysis saved to: {filename}")
+
+
+def print_model_usage(metrics: "Metrics" = None):
+    """Print task latency, tokens and cost for each model tier"""
+    for model, stats in sorted((metrics or METRICS).model_summary().items()):
+        mean = stats["seconds"] / stats["tasks"] if stats["tasks"] else 0.0
+        print(
+            f"🧠 {model}: {stats['tasks']} tasks, {mean:.2f}s mean, "
+            f"{stats['tokens']:,.0f} tokens, ${stats['cost_usd']:.4f}"
+        )
+
+
+def print_cache_stats(cache: ResponseCache):
+    """Print response cache counters"""
+    stats = cache.stats()
+    print(
+        f"🗄️  Response cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['entries']} entries ({stats['bytes'] / 1024:,.0f} KB)"
+    )
+
+
+def result_to_dict(result: MarketResearchResult) -> Dict:
+    """Convert a result to plain JSON-ready data without deep-copying it"""
+    record = dict(result.__dict__)
+    record["business_profile"] = dict(result.business_profile.__dict__)
+    record["process_analyses"] = [dict(p.__dict__) for p in result.process_analyses]
+    if result.roi_simulation is not None:
+        record["roi_simulation"] = dict(result.roi_simulation.__dict__)
+    return record
+
+
+def result_from_dict(record: Dict) -> MarketResearchResult:
+    """Rebuild a result from the plain data written by result_to_dict"""
+    record = dict(record)
+    record["business_profile"] = BusinessProfile(**record["business_profile"])
+    record["process_analyses"] = [
+        ProcessAnalysis(**process) for process in record["process_analyses"]
+    ]
+    if record.get("roi_simulation"):
+        record["roi_simulation"] = RoiSimulation(**record["roi_simulation"])
+    return MarketResearchResult(**record)
+
+
+class NDJSONResultWriter:
+    """Append compact NDJSON batch records as analyses finish
+
+    Records go straight to the output handle, so memory stays constant
+    however many clients a batch processes. Paths ending in .gz are gzip
+    compressed. Output is flushed every flush_every records or flush_interval
+    seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compress: bool = None,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+        append: bool = False,
+    ):
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.failed = 0
+        mode = "at" if append else "wt"
+        if self.compress:
+            self._file = gzip.open(path, mode, encoding="utf-8")
+        else:
+            self._file = open(path, mode, encoding="utf-8")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, item: BatchItemResult):
+        """Serialize one batch item as a single NDJSON line"""
+        record = {
+            "index": item.index,
+            "description": item.description,
+            "result": result_to_dict(item.result) if item.result else None,
+            "error": item.error,
+        }
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str))
+        self._file.write("\n")
+        self.written += 1
+        self.failed += item.error is not None
+        self._unflushed += 1
+
+        now = time.monotonic()
+        if (
+            self._unflushed >= self.flush_every
+            or now - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    @staticmethod
+    def recover(path: str) -> Set[int]:
+        """Trim a batch output to its complete records; returns their indices
+
+        A killed run can leave a torn last line, or for gzip output a
+        truncated stream. The complete records are rewritten so a resumed
+        run can append after them.
+        """
+        compress = path.endswith(".gz")
+        opener = gzip.open if compress else open
+        indices, records = set(), []
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    indices.add(record["index"])
+                    records.append(line)
+        except FileNotFoundError:
+            return indices
+        except (EOFError, OSError):
+            pass  # Truncated gzip stream; keep the records read so far
+
+        temp_path = f"{path}.tmp"
+        with opener(temp_path, "wt", encoding="utf-8") as f:
+            f.writelines(records)
+        os.replace(temp_path, path)
+        return indices
+
+    def flush(self):
+        """Push buffered records to disk"""
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "NDJSONResultWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_descriptions(path: str) -> Iterator[str]:
+    """Stream business descriptions from a JSONL or CSV file
+
+    JSONL lines may be plain strings or objects with a "description" key.
+    CSV files use the "description" column, or the first column if absent.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            column = "description"
+            if reader.fieldnames and column not in reader.fieldnames:
+                column = reader.fieldnames[0]
+            for row in reader:
+                yield (row.get(column) or "").strip()
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    record = record.get("description", "")
+                yield str(record).strip()
+
+
+def load_descriptions(path: str) -> List[str]:
+    """Load business descriptions from a JSONL or CSV file"""
+    return list(iter_descriptions(path))
+
+
+def run_batch(
+    agent: MarketResearchAgent,
+    input_path: str,
+    output_path: str = None,
+    max_workers: int = 4,
+    heuristic: bool = False,
+    simulation: SimulationConfig = None,
+    use_cache: bool = True,
+    flush_interval: float = 1.0,
+    store=None,
+    resume: bool = False,
+    report_path: str = None,
+    report_format: str = None,
+):
+    """Analyze every description in a file, streaming results as NDJSON
+
+    When a ResultsStore is given, successful analyses are also indexed there
+    in batched transactions. With resume, items already in the output file
+    are skipped and new records are appended to it. A report_path receives
+    a rendered report for every analysis of this run, in one document whose
+    format follows report_format or the file extension.
+    """
+    if not output_path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = f"market_research_batch_{timestamp}.jsonl"
+
+    finished = NDJSONResultWriter.recover(output_path) if resume else set()
+    mode = "heuristic" if heuristic else "AI"
+    print(f"📂 Streaming business descriptions from {input_path}")
+    if finished:
+        print(f"⏩ Resuming: {len(finished):,} items already in {output_path}")
+    print(f"🔄 Running {mode} analysis on {max_workers} workers...")
+
+    pending = []
+    add_report = None
+    with contextlib.ExitStack() as stack:
+        if report_path:
+            renderer = ReportRenderer(
+                report_format or ReportRenderer.format_for(report_path)
+            )
+            report = stack.enter_context(
+                open(report_path, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE)
+            )
+            add_report = stack.enter_context(renderer.document(report))
+        writer = stack.enter_context(
+            NDJSONResultWriter(
+                output_path, flush_interval=flush_interval, append=resume
+            )
+        )
+        for item in agent.iter_batch(
+            iter_descriptions(input_path),
+            max_workers=max_workers,
+            heuristic=heuristic,
+            simulation=simulation,
+            use_cache=use_cache,
+            skip=finished,
+        ):
+            writer.write(item)
+            if add_report is not None and item.result is not None:
+                add_report(item.result)
+            if store is not None and item.result is not None:
+                pending.append(item.result)
+                if len(pending) >= 1000:
+                    store.add_many(pending)
+                    pending = []
+    if pending:
+        store.add_many(pending)
+
+    analyzed = writer.written - writer.failed
+    print(f"✅ Batch complete: {analyzed} analyzed, {writer.failed} failed")
+    print(f"💾 Results saved to: {output_path}")
+    if report_path:
+        print(f"📝 Reports written to: {report_path}")
+    if store is not None:
+        print(f"🗄️  Results indexed in: {store.path}")
+    if not heuristic:
+        print_cache_stats(agent.cache)
+        print_model_usage()
+        skipped = METRICS.total("market_research_llm_calls_saved_total")
+        print(f"⚡ LLM calls skipped on decisive heuristics: {skipped:,.0f}")
+
+
+def run_scoring(
+    agent: MarketResearchAgent,
+    input_path: str,
+    output_path: str,
+    max_workers: int = None,
+    shard_size: int = 4096,
+):
+    """Score every description in a file into a numeric .npz ROI table"""
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"📂 Streaming business descriptions from {input_path}")
+    print(f"🔄 Scoring with the heuristic model on {max_workers} processes...")
+
+    start = time.perf_counter()
+    scores = agent.score_heuristic(
+        iter_descriptions(input_path), max_workers=max_workers, shard_size=shard_size
+    )
+    elapsed = time.perf_counter() - start
+    scores.save(output_path)
+
+    failed = len(scores.errors)
+    rate = len(scores) / elapsed if elapsed else 0
+    print(
+        f"✅ Scoring complete: {len(scores) - failed:,} scored, {failed:,} failed "
+        f"({rate:,.0f} descriptions/s)"
+    )
+    print(f"💾 Scores saved to: {output_path}")
+
+
+def _task_model(value: str) -> Tuple[str, str]:
+    """Parse a TASK=MODEL option"""
+    task, _, model = value.partition("=")
+    if task not in TASK_NAMES or not model:
+        raise argparse.ArgumentTypeError(
+            f"expected TASK=MODEL with TASK one of {', '.join(TASK_NAMES)}"
+        )
+    return task, model
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Agentic AI Market Research Agent",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="analyze every description in a JSONL or CSV file",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="where to write batch results (NDJSON, gzip if it ends in .gz)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted batch, skipping items already in --output",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="FILE",
+        help="also render every batch analysis into one report document "
+        "(Markdown for .md, HTML for .html, otherwise text)",
+    )
+    parser.add_argument(
+        "--report-format",
+        choices=list(REPORT_TEMPLATES),
+        help="report format, overriding the --report file extension",
+    )
+    parser.add_argument(
+        "--scores",
+        metavar="FILE",
+        help="score --batch descriptions with the heuristic model on every "
+        "worker process and save the numeric ROI table as .npz (implies --heuristic)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=4096,
+        help="descriptions per worker shard with --scores (default: 4096)",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="seconds between batch output flushes (default: 1.0)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="number of concurrent batch workers (default: 4)",
+    )
+    parser.add_argument(
+        "--heuristic",
+        action="store_true",
+        help="run offline with the heuristic analysis, without the AI crew",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore cached agent responses and call the LLM again",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="add Monte Carlo ROI risk bands to each analysis",
+    )
+    parser.add_argument(
+        "--draws",
+        type=int,
+        default=100000,
+        help="number of Monte Carlo draws per client (default: 100000)",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DB",
+        help="also index analyses in a SQLite results store",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="write stage timings, tokens and cost in Prometheus text format",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="wait for the full analysis instead of showing results as they arrive",
+    )
+    parser.add_argument(
+        "--base-url",
+        metavar="URL",
+        help="OpenAI-compatible endpoint to use instead of api.openai.com",
+    )
+    parser.add_argument(
+        "--prompt-budget",
+        type=int,
+        default=DESCRIPTION_TOKEN_BUDGET,
+        metavar="TOKENS",
+        help="tokens of business description sent with each task "
+        f"(default: {DESCRIPTION_TOKEN_BUDGET})",
+    )
+    parser.add_argument(
+        "--confidence-threshold",
+        type=float,
+        default=PROFILE_CONFIDENCE_THRESHOLD,
+        metavar="SCORE",
+        help="heuristic profile confidence (0-1) at which the research task is "
+        f"skipped; above 1 always runs it (default: {PROFILE_CONFIDENCE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=SIMILARITY_THRESHOLD,
+        metavar="SCORE",
+        help="similarity (0-1) at which the analysis of an earlier near-duplicate "
+        f"description is reused; above 1 never reuses (default: {SIMILARITY_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--model",
+        type=_task_model,
+        action="append",
+        default=[],
+        metavar="TASK=MODEL",
+        help="model for one crew task, e.g. market_research=gpt-4o-mini "
+        "(repeatable; defaults: "
+        + ", ".join(f"{task}={model}" for task, model in DEFAULT_TASK_MODELS.items())
+        + ")",
+    )
+    args = parser.parse_args(argv)
+    if args.resume and not (args.batch and args.output):
+        parser.error("--resume needs --batch and the --output of the run to resume")
+    if args.report and not args.batch:
+        parser.error("--report needs --batch")
+    if args.scores:
+        if not args.batch:
+            parser.error("--scores needs --batch")
+        args.heuristic = True
+    return args
+
+
+def main(argv: List[str] = None):
+    """Main application entry point"""
+    args = parse_args(argv)
+    print_header()
+    simulation = SimulationConfig(draws=args.draws) if args.simulate else None
+
+    # Check API key
+    api_key = os.getenv("OPENAI_API_KEY")
+    if args.heuristic:
+        print("⚙️  Offline mode: using the heuristic analysis model")
+    elif not api_key or api_key == "sk-your-key-here":
+        print("❌ Error: OpenAI API key not configured!")
+        print("Please edit the .env file and add your actual OpenAI API key")
+        print("\n1. Get your key from: https://platform.openai.com/api-keys")
+        print("2. Edit the .env file in this directory")
+        print("3. Replace 'sk-your-key-here' with your actual key")
+        return
+
+    try:
+        # Initialize agent
+        agent = MarketResearchAgent(
+            api_key,
+            offline=args.heuristic,
+            base_url=args.base_url,
+            prompt_budget=args.prompt_budget,
+            models=dict(args.model),
+            confidence_threshold=args.confidence_threshold,
+            similarity_threshold=args.similarity_threshold,
+        )
+        store = None
+        if args.store:
+            from results_store import ResultsStore
+
+            store = ResultsStore(args.store)
+
+        if args.scores:
+            run_scoring(
+                agent,
+                args.batch,
+                args.scores,
+                max_workers=args.workers,
+                shard_size=args.shard_size,
+            )
+            return
+
+        if args.batch:
+            run_batch(
+                agent,
+                args.batch,
+                output_path=args.output,
+                max_workers=args.workers,
+                heuristic=args.heuristic,
+                simulation=simulation,
+                use_cache=not args.no_cache,
+                flush_interval=args.flush_interval,
+                store=store,
+                resume=args.resume,
+                report_path=args.report,
+                report_format=args.report_format,
+            )
+            return
+
+        # Collect business information
+        business_description = collect_business_info()
+
+        if not business_description.strip():
+            print("❌ No business information provided. Exiting.")
+            return
+
+        # Perform analysis
+        print("\n🔄 Processing your business analysis...")
+        if agent.offline or args.no_stream:
+            if not agent.offline:
+                print("   This may take 30-60 seconds...")
+            result = agent.analyze_business(
+                business_description,
+                simulation=simulation,
+                use_cache=not args.no_cache,
+            )
+        else:
+            # Show profile and process findings as soon as they arrive
+            renderer = StreamRenderer()
+            for event in agent.analyze_business_stream(
+                business_description,
+                simulation=simulation,
+                use_cache=not args.no_cache,
+            ):
+                if event.kind == "result":
+                    result = event.value
+                else:
+                    renderer.handle(event)
 
         # Display results
         print_analysis_report(result)
@@ -921,6 +4969,9 @@ def main():
         )
         if save_report_choice in ["y", "yes"]:
             save_report(result)
+        if store is not None:
+            store.add(result)
+            print(f"🗄️  Analysis indexed in: {store.path}")
 
         print(
             "\n✅ Analysis complete! Use this report for client discussions and proposals."
@@ -932,6 +4983,10 @@ def main():
         print(f"\n❌ Error during analysis: {str(e)}")
         print("Please check your API key and internet connection.")
         return
+    finally:
+        if args.metrics:
+            METRICS.write(args.metrics)
+            print(f"📈 Metrics written to: {args.metrics}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in server for offline load testing.
+Serves canned chat completions with configurable latency and injected errors.
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from market_research_agent import estimate_tokens
+
+# CrewAI agents stop when the model returns a "Final Answer"; the answers
+# follow the JSON shapes in TASK_OUTPUT_SCHEMAS
+FINAL_ANSWER = "Thought: I now can give a great answer\nFinal Answer: "
+
+CANNED_RESPONSES = {
+    "market_research": FINAL_ANSWER
+    + json.dumps(
+        {
+            "name": "Client Business",
+            "industry": "Professional Services",
+            "size": "Mid-Market (200 employees)",
+            "revenue_range": "$10M - $50M",
+            "pain_points": [
+                "Manual client reporting delays month-end close",
+                "Duplicated data entry causes errors",
+            ],
+            "current_processes": [
+                "Client reporting",
+                "Data entry and reconciliation",
+                "Scheduling and follow-up",
+                "Proposal writing",
+            ],
+        }
+    ),
+    "process_analysis": FINAL_ANSWER
+    + json.dumps(
+        {
+            "process_analyses": [
+                {
+                    "name": "Data Entry & Reconciliation",
+                    "time_percentage": 20,
+                    "complexity_score": 2,
+                    "automation_potential": "High",
+                    "current_cost_annual": 165000,
+                    "potential_savings": 115500,
+                    "roi_percentage": 70,
+                    "implementation_difficulty": "Low",
+                },
+                {
+                    "name": "Client Reporting",
+                    "time_percentage": 25,
+                    "complexity_score": 3,
+                    "automation_potential": "High",
+                    "current_cost_annual": 210000,
+                    "potential_savings": 126000,
+                    "roi_percentage": 60,
+                    "implementation_difficulty": "Medium",
+                },
+                {
+                    "name": "Scheduling & Follow-up",
+                    "time_percentage": 15,
+                    "complexity_score": 2,
+                    "automation_potential": "Medium",
+                    "current_cost_annual": 120000,
+                    "potential_savings": 60000,
+                    "roi_percentage": 50,
+                    "implementation_difficulty": "Low",
+                },
+            ],
+            "approach": "Document and Reporting Automation Agents",
+            "timeline": "12-16 weeks",
+            "implementation_roadmap": [
+                "Week 1-4: Discovery and data mapping",
+                "Week 5-10: Extraction and reporting agents",
+                "Week 11-14: Scheduling assistant and integration",
+                "Week 15-16: Rollout and training",
+            ],
+        }
+    ),
+    "roi_calculation": FINAL_ANSWER
+    + json.dumps(
+        {
+            "name": "Data Entry & Reconciliation",
+            "current_cost_annual": 165000,
+            "potential_savings": 115500,
+            "implementation_cost_low": 60000,
+            "implementation_cost_high": 80000,
+            "roi_percentage": 192,
+            "payback_months": 6,
+            "solution": "Document Extraction Agent",
+            "risks": [
+                "Inconsistent source documents; mitigate with human review of "
+                "low-confidence extractions",
+                "Staff adoption; mitigate with phased rollout and training",
+            ],
+        }
+    ),
+    "default": FINAL_ANSWER + "{}",
+}
+
+# Phrases from each crew task prompt, checked in order against the request
+TASK_MARKERS = [
+    ("roi_calculation", "calculate comprehensive roi"),
+    ("process_analysis", "perform detailed process evaluation"),
+    ("market_research", "identify automation opportunities"),
+]
+
+
+@dataclass
+class LatencyModel:
+    """Response latency distribution in seconds"""
+
+    distribution: str = "lognormal"  # fixed, uniform, normal or lognormal
+    mean: float = 1.0
+    spread: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            return self.mean
+        if self.distribution == "uniform":
+            return rng.uniform(
+                max(0.0, self.mean - self.spread), self.mean + self.spread
+            )
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(self.mean, self.spread))
+        if self.distribution == "lognormal":
+            # Scaled so the median is the configured mean, with a long tail
+            return self.mean * rng.lognormvariate(0.0, self.spread)
+        raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+
+@dataclass
+class ServerConfig:
+    """Behaviour of the stand-in server"""
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    tokens_per_second: float = 80.0
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 120.0
+    retry_after: int = 1
+    responses: Dict[str, str] = field(default_factory=lambda: dict(CANNED_RESPONSES))
+    seed: int = None
+
+
+def classify_task(messages: List[Dict]) -> str:
+    """Work out which crew task a chat request belongs to"""
+    text = " ".join(
+        m.get("content") or ""
+        for m in messages
+        if isinstance(m.get("content"), str) and m.get("role") != "assistant"
+    ).lower()
+    for task, marker in TASK_MARKERS:
+        if marker in text:
+            return task
+    return "default"
+
+
+def name_roi_response(content: str, messages: List[Dict]) -> str:
+    """Answer an ROI sub-task under the name of the process it was given"""
+    text = " ".join(str(m.get("content") or "") for m in messages)
+    match = re.search(r'Process: \{"name": ("(?:[^"\\]|\\.)*")', text)
+    if match is None:
+        return content
+    return re.sub(r'"name": "(?:[^"\\]|\\.)*"', f'"name": {match.group(1)}', content, 1)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the config, RNG and request counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: ServerConfig):
+        super().__init__(address, StandInHandler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "completed": 0, "errors": {}, "tasks": {}}
+
+    def draw(self) -> Tuple[float, float]:
+        """Latency and failure roll for one request"""
+        with self.lock:
+            return self.config.latency.sample(self.rng), self.rng.random()
+
+    def count(self, section: str, key: str = None):
+        with self.lock:
+            if key is None:
+                self.stats[section] += 1
+            else:
+                self.stats[section][key] = self.stats[section].get(key, 0) + 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Handles the subset of the OpenAI API that the agent uses"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            models = [{"id": m, "object": "model"} for m in ("gpt-4o-mini", "gpt-4o")]
+            self.send_json(200, {"object": "list", "data": models})
+        elif self.path == "/stats":
+            with self.server.lock:
+                self.send_json(200, self.server.stats)
+        else:
+            self.send_error_json(404, "Not found", "invalid_request_error")
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error_json(404, "Not found", "invalid_request_error")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error_json(400, "Invalid JSON body", "invalid_request_error")
+            return
+
+        server, config = self.server, self.server.config
+        server.count("requests")
+        latency, roll = server.draw()
+
+        # Failure modes are drawn from one roll so the rates add up
+        if roll < config.rate_limit_rate:
+            server.count("errors", "rate_limit")
+            time.sleep(min(latency, 0.05))
+            self.send_error_json(
+                429,
+                "Rate limit reached for requests",
+                "requests",
+                code="rate_limit_exceeded",
+                headers={"Retry-After": str(config.retry_after)},
+            )
+            return
+        roll -= config.rate_limit_rate
+        if roll < config.server_error_rate:
+            server.count("errors", "server_error")
+            time.sleep(latency)
+            self.send_error_json(
+                500, "The server had an error processing your request", "server_error"
+            )
+            return
+        roll -= config.server_error_rate
+        if roll < config.timeout_rate:
+            server.count("errors", "timeout")
+            time.sleep(config.timeout_seconds)
+            self.send_error_json(504, "Request timed out", "timeout")
+            return
+
+        messages = body.get("messages", [])
+        task = classify_task(messages)
+        server.count("tasks", task)
+        content = config.responses.get(task, config.responses["default"])
+        if task == "roi_calculation":
+            content = name_roi_response(content, messages)
+        model = body.get("model", "gpt-4o-mini")
+        usage = {
+            "prompt_tokens": sum(
+                estimate_tokens(str(m.get("content") or "")) for m in messages
+            ),
+            "completion_tokens": estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            self.stream_completion(
+                model, content, latency, usage if include_usage else None
+            )
+        else:
+            time.sleep(latency)
+            self.send_json(
+                200,
+                {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+        server.count("completed")
+
+    def stream_completion(self, model: str, content: str, latency: float, usage: Dict):
+        """Send server-sent events: first token after the latency, then paced"""
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        def event(choices: List[Dict], **extra) -> bytes:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n".encode()
+
+        def chunk(delta: Dict, finish_reason: str = None) -> bytes:
+            return event([{"index": 0, "delta": delta, "finish_reason": finish_reason}])
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        time.sleep(latency)
+        self.wfile.write(chunk({"role": "assistant", "content": ""}))
+
+        # Roughly one token per word; pace words at the configured rate
+        words = content.split(" ")
+        delay = 1.0 / self.server.config.tokens_per_second
+        for i, word in enumerate(words):
+            self.wfile.write(chunk({"content": word if i == 0 else " " + word}))
+            self.wfile.flush()
+            time.sleep(delay)
+
+        self.wfile.write(chunk({}, "stop"))
+        if usage is not None:
+            self.wfile.write(event([], usage=usage))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def send_json(self, status: int, payload: Dict, headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(
+        self,
+        status: int,
+        message: str,
+        error_type: str,
+        code: str = None,
+        headers: Dict[str, str] = None,
+    ):
+        error = {"message": message, "type": error_type, "param": None, "code": code}
+        self.send_json(status, {"error": error}, headers)
+
+
+def serve(
+    config: ServerConfig, host: str = "127.0.0.1", port: int = 8089
+) -> StandInServer:
+    """Start the stand-in on a background thread and return the server"""
+    server = StandInServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: List[str] = None):
+    """Run the stand-in server from the command line"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency",
+        choices=["fixed", "uniform", "normal", "lognormal"],
+        default="lognormal",
+        help="response latency distribution (default: lognormal)",
+    )
+    parser.add_argument(
+        "--latency-mean", type=float, default=1.0, help="mean or median seconds"
+    )
+    parser.add_argument(
+        "--latency-spread", type=float, default=0.5, help="spread or sigma"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=80.0, help="streaming speed"
+    )
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 share")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 share")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="hang share")
+    parser.add_argument(
+        "--timeout-seconds", type=float, default=120.0, help="how long hangs last"
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Retry-After seconds on 429s"
+    )
+    parser.add_argument(
+        "--responses", metavar="FILE", help="JSON object of canned responses by task"
+    )
+    parser.add_argument("--seed", type=int, help="seed for latency and error draws")
+    args = parser.parse_args(argv)
+
+    responses = dict(CANNED_RESPONSES)
+    if args.responses:
+        with open(args.responses) as f:
+            responses.update(json.load(f))
+
+    config = ServerConfig(
+        latency=LatencyModel(args.latency, args.latency_mean, args.latency_spread),
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        retry_after=args.retry_after,
+        responses=responses,
+        seed=args.seed,
+    )
+    server = StandInServer((args.host, args.port), config)
+    print(f"🧪 OpenAI stand-in listening on http://{args.host}:{args.port}/v1")
+    print(f"   Point the agent at it with --base-url http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stand-in stopped.")
+        print(json.dumps(server.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Local results store for market research analyses.
+Keeps every analysis in an indexed SQLite database for fast lookback queries.
+"""
+
+import os
+import glob
+import json
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from market_research_agent import (
+    BusinessProfile,
+    MarketResearchResult,
+    ProcessAnalysis,
+    RoiSimulation,
+    _SqliteStore,
+    format_currency,
+    result_from_dict,
+)
+
+DEFAULT_STORE_PATH = os.getenv("MARKET_RESEARCH_STORE", "market_research_results.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    industry TEXT NOT NULL COLLATE NOCASE,
+    size_bracket TEXT NOT NULL COLLATE NOCASE,
+    overall_roi REAL NOT NULL,
+    payback_months INTEGER NOT NULL,
+    investment_range TEXT NOT NULL,
+    recommended_solution TEXT NOT NULL,
+    implementation_roadmap TEXT NOT NULL,
+    roi_simulation TEXT
+);
+
+CREATE TABLE IF NOT EXISTS business_profiles (
+    analysis_id INTEGER PRIMARY KEY REFERENCES analyses (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    size TEXT NOT NULL,
+    revenue_range TEXT NOT NULL,
+    description TEXT NOT NULL,
+    pain_points TEXT NOT NULL,
+    current_processes TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS process_analyses (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    time_percentage REAL NOT NULL,
+    complexity_score INTEGER NOT NULL,
+    automation_potential TEXT NOT NULL,
+    current_cost_annual REAL NOT NULL,
+    potential_savings REAL NOT NULL,
+    roi_percentage REAL NOT NULL,
+    implementation_difficulty TEXT NOT NULL,
+    PRIMARY KEY (analysis_id, position)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_analyses_industry_roi
+    ON analyses (industry, overall_roi DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_size_roi
+    ON analyses (size_bracket, overall_roi DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_roi ON analyses (overall_roi DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+"""
+
+ORDER_COLUMNS = {"overall_roi", "payback_months", "created_at"}
+
+
+@dataclass
+class StoredAnalysis:
+    """An analysis as stored in the results database"""
+
+    id: int
+    created_at: float
+    result: MarketResearchResult
+
+
+def size_bracket(size: str) -> str:
+    """Reduce a size label such as "Mid-Market (650 employees)" to its bracket"""
+    return size.split(" (", 1)[0]
+
+
+class ResultsStore(_SqliteStore):
+    """Indexed SQLite store of MarketResearchResult records
+
+    Profiles, process analyses and results live in normalized tables. The
+    industry, size bracket, ROI and creation time are copied onto the
+    analyses table and indexed, so filtered top-N queries only read the
+    rows they return. The database runs in WAL mode and is safe to share
+    between threads and processes.
+    """
+
+    pragmas = _SqliteStore.pragmas + ("foreign_keys=ON",)
+    schema = SCHEMA
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        super().__init__(path)
+
+    def add(self, result: MarketResearchResult, created_at: float = None) -> int:
+        """Store one analysis and return its id"""
+        return self.add_many([result], created_at=created_at)[0]
+
+    def add_many(
+        self,
+        results: Iterable[MarketResearchResult],
+        created_at: float = None,
+        batch_size: int = 1000,
+    ) -> List[int]:
+        """Store analyses in batched transactions and return their ids"""
+        ids = []
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                ids.extend(self._insert_batch(batch, created_at))
+                batch = []
+        if batch:
+            ids.extend(self._insert_batch(batch, created_at))
+        return ids
+
+    def _insert_batch(
+        self, results: List[MarketResearchResult], created_at: float = None
+    ) -> List[int]:
+        """Insert one batch inside a single write transaction"""
+        conn = self._connection()
+        created_at = created_at or time.time()
+        analyses, profiles, processes = [], [], []
+
+        # BEGIN IMMEDIATE takes the write lock, so ids can be allocated up
+        # front and all three tables filled with executemany
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (next_id,) = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM analyses"
+            ).fetchone()
+            ids = list(range(next_id, next_id + len(results)))
+
+            for analysis_id, result in zip(ids, results):
+                profile = result.business_profile
+                simulation = result.roi_simulation
+                analyses.append(
+                    (
+                        analysis_id,
+                        created_at,
+                        profile.industry,
+                        size_bracket(profile.size),
+                        result.overall_roi,
+                        result.payback_months,
+                        result.investment_range,
+                        json.dumps(result.recommended_solution),
+                        json.dumps(result.implementation_roadmap),
+                        json.dumps(simulation.__dict__) if simulation else None,
+                    )
+                )
+                profiles.append(
+                    (
+                        analysis_id,
+                        profile.name,
+                        profile.industry,
+                        profile.size,
+                        profile.revenue_range,
+                        profile.description,
+                        json.dumps(profile.pain_points),
+                        json.dumps(profile.current_processes),
+                    )
+                )
+                processes.extend(
+                    (
+                        analysis_id,
+                        position,
+                        p.name,
+                        p.time_percentage,
+                        p.complexity_score,
+                        p.automation_potential,
+                        p.current_cost_annual,
+                        p.potential_savings,
+                        p.roi_percentage,
+                        p.implementation_difficulty,
+                    )
+                    for position, p in enumerate(result.process_analyses)
+                )
+
+            conn.executemany(
+                "INSERT INTO analyses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", analyses
+            )
+            conn.executemany(
+                "INSERT INTO business_profiles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                profiles,
+            )
+            conn.executemany(
+                "INSERT INTO process_analyses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                processes,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return ids
+
+    def query(
+        self,
+        industry: str = None,
+        size: str = None,
+        min_roi: float = None,
+        since: float = None,
+        until: float = None,
+        order_by: str = "overall_roi",
+        descending: bool = True,
+        limit: int = 100,
+    ) -> List[StoredAnalysis]:
+        """Find analyses by industry, size bracket, ROI and creation time"""
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}")
+
+        clauses, params = [], []
+        for clause, value in [
+            ("industry = ?", industry),
+            ("size_bracket = ?", size),
+            ("overall_roi >= ?", min_roi),
+            ("created_at >= ?", since),
+            ("created_at < ?", until),
+        ]:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if descending else "ASC"
+
+        rows = (
+            self._connection()
+            .execute(
+                f"SELECT * FROM analyses {where} "
+                f"ORDER BY {order_by} {direction} LIMIT ?",
+                params + [limit],
+            )
+            .fetchall()
+        )
+        return self._hydrate(rows)
+
+    def top_prospects(
+        self, industry: str = None, size: str = None, limit: int = 100
+    ) -> List[StoredAnalysis]:
+        """Highest-ROI analyses, optionally within an industry or size bracket"""
+        return self.query(industry=industry, size=size, limit=limit)
+
+    def get(self, analysis_id: int) -> Optional[StoredAnalysis]:
+        """Load a single analysis by id"""
+        rows = (
+            self._connection()
+            .execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,))
+            .fetchall()
+        )
+        stored = self._hydrate(rows)
+        return stored[0] if stored else None
+
+    def count(self, industry: str = None) -> int:
+        """Number of stored analyses, optionally within one industry"""
+        if industry is None:
+            sql, params = "SELECT COUNT(*) FROM analyses", ()
+        else:
+            sql, params = "SELECT COUNT(*) FROM analyses WHERE industry = ?", (
+                industry,
+            )
+        return self._connection().execute(sql, params).fetchone()[0]
+
+    def _hydrate(self, rows: List[tuple]) -> List[StoredAnalysis]:
+        """Join profiles and processes onto analysis rows, keeping row order"""
+        if not rows:
+            return []
+        conn = self._connection()
+        ids = [row[0] for row in rows]
+        marks = ",".join("?" * len(ids))
+
+        profiles = {
+            row[0]: BusinessProfile(
+                name=row[1],
+                industry=row[2],
+                size=row[3],
+                revenue_range=row[4],
+                description=row[5],
+                pain_points=json.loads(row[6]),
+                current_processes=json.loads(row[7]),
+            )
+            for row in conn.execute(
+                f"SELECT * FROM business_profiles WHERE analysis_id IN ({marks})", ids
+            )
+        }
+        processes: Dict[int, List[ProcessAnalysis]] = {i: [] for i in ids}
+        for row in conn.execute(
+            f"SELECT * FROM process_analyses WHERE analysis_id IN ({marks}) "
+            "ORDER BY analysis_id, position",
+            ids,
+        ):
+            processes[row[0]].append(ProcessAnalysis(*row[2:]))
+
+        stored = []
+        for row in rows:
+            analysis_id, created_at = row[0], row[1]
+            stored.append(
+                StoredAnalysis(
+                    id=analysis_id,
+                    created_at=created_at,
+                    result=MarketResearchResult(
+                        business_profile=profiles[analysis_id],
+                        process_analyses=processes[analysis_id],
+                        overall_roi=row[4],
+                        recommended_solution=json.loads(row[7]),
+                        implementation_roadmap=json.loads(row[8]),
+                        investment_range=row[6],
+                        payback_months=row[5],
+                        roi_simulation=(
+                            RoiSimulation(**json.loads(row[9])) if row[9] else None
+                        ),
+                    ),
+                )
+            )
+        return stored
+
+    def import_reports(self, pattern: str) -> int:
+        """Load JSON reports written by save_report into the store"""
+        paths = sorted(glob.glob(pattern))
+        for path in paths:
+            with open(path) as f:
+                self.add(result_from_dict(json.load(f)), os.path.getmtime(path))
+        return len(paths)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main(argv: List[str] = None):
+    """Query or populate the results store from the command line"""
+    parser = argparse.ArgumentParser(description="Market research results store")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    top = commands.add_parser("top", help="list the highest-ROI prospects")
+    top.add_argument("--industry", help="only this industry")
+    top.add_argument("--size", help="only this size bracket, e.g. Mid-Market")
+    top.add_argument("--limit", type=int, default=20)
+
+    load = commands.add_parser("import", help="import saved JSON reports")
+    load.add_argument("pattern", help="glob of report files")
+
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.db)
+
+    if args.command == "import":
+        count = store.import_reports(args.pattern)
+        print(f"✅ Imported {count} reports into {args.db}")
+        return
+
+    start = time.perf_counter()
+    prospects = store.top_prospects(args.industry, args.size, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"📊 Top {len(prospects)} prospects ({elapsed:.1f} ms)")
+    for rank, stored in enumerate(prospects, 1):
+        result = stored.result
+        savings = sum(p.potential_savings for p in result.process_analyses)
+        print(
+            f"{rank:>3}. #{stored.id} {result.business_profile.industry} | "
+            f"{result.business_profile.size} | ROI {result.overall_roi:.0f}% | "
+            f"Savings {format_currency(savings)}/yr"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Local HTTP service for the Market Research Agent.
+Queues analysis jobs in a bounded queue, runs them on a worker pool and
+serves results by polling or long-polling.
+"""
+
+import os
+import json
+import math
+import time
+import uuid
+import argparse
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from market_research_agent import (
+    METRICS,
+    QUESTIONNAIRE,
+    ROI_FANOUT,
+    MarketResearchAgent,
+    SimulationConfig,
+    result_to_dict,
+)
+
+API_PREFIX = "/api/v1/analysis"
+MAX_BODY_BYTES = 64 * 1024
+
+# Structured business_info fields, asked as the questionnaire questions so
+# the agent sees the same text as from the interactive CLI
+BUSINESS_INFO_QUESTIONS = dict(
+    zip(
+        ("industry", "employees", "description", "processes", "challenges", "revenue"),
+        (question for question, _ in QUESTIONNAIRE),
+    )
+)
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ServiceConfig:
+    """Capacity and timing settings for the analysis service"""
+
+    workers: int = 4
+    queue_size: int = 100
+    max_wait: float = 30.0  # Longest long-poll a client may ask for
+    result_ttl: float = 3600.0  # Seconds finished jobs stay retrievable
+    max_jobs: int = 10000  # Jobs kept in memory, finished ones evicted first
+    simulation: Optional[SimulationConfig] = None
+    use_cache: bool = True
+
+
+@dataclass
+class Job:
+    """One analysis request and its outcome"""
+
+    id: str
+    description: str
+    status: str = "queued"  # queued, running, completed, failed or cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.done.is_set()
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """Job as the API returns it"""
+        record = {
+            "id": self.id,
+            "status": self.status,
+            "created_at": _timestamp(self.created_at),
+            "started_at": _timestamp(self.started_at),
+            "completed_at": _timestamp(self.completed_at),
+        }
+        if self.error is not None:
+            record["error"] = self.error
+        if include_result:
+            record["results"] = self.result
+        return record
+
+
+def _timestamp(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="seconds")
+
+
+def description_from_request(body: Dict) -> str:
+    """Business description from a create request
+
+    Accepts {"description": "..."} or the documented {"business_info": {...}}
+    shape, whose known fields become questionnaire answers.
+    """
+    if isinstance(body.get("description"), str):
+        return body["description"].strip()
+    info = body.get("business_info")
+    if not isinstance(info, dict):
+        raise ValueError("expected a description or a business_info object")
+    parts = [
+        f"{question} {info[name]}"
+        for name, question in BUSINESS_INFO_QUESTIONS.items()
+        if info.get(name) not in (None, "")
+    ]
+    parts.extend(
+        f"{name.replace('_', ' ').capitalize()}: {value}"
+        for name, value in info.items()
+        if name not in BUSINESS_INFO_QUESTIONS and value not in (None, "")
+    )
+    return " ".join(parts)
+
+
+class AnalysisService:
+    """Bounded job queue drained by a pool of analysis worker threads
+
+    Submissions beyond queue_size are rejected with a Retry-After estimate
+    instead of buffered; cancelled jobs leave the queue at once, so they
+    never hold capacity. Finished jobs are evicted after result_ttl or once
+    max_jobs are held, so memory stays flat under bursty intake.
+    """
+
+    def __init__(self, agent: MarketResearchAgent, config: ServiceConfig = None):
+        self.agent = agent
+        self.config = config or ServiceConfig()
+        self.config.max_jobs = max(
+            self.config.max_jobs, self.config.queue_size + self.config.workers
+        )
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.lock = threading.Lock()
+        # Queued jobs, then one None per worker once stopping (lock held)
+        self.pending: Deque[Optional[Job]] = deque()
+        self.ready = threading.Condition(self.lock)
+        self.started = time.time()
+        self.running = 0
+        self.counts = {"completed": 0, "failed": 0, "cancelled": 0, "rejected": 0}
+        self.mean_seconds = 30.0  # Moving average of job run time
+        self.workers: List[threading.Thread] = []
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.config.workers):
+            worker = threading.Thread(
+                target=self._work, name=f"analysis-worker-{i}", daemon=True
+            )
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self, timeout: float = None):
+        """Let queued jobs finish, then stop the workers"""
+        with self.ready:
+            self.pending.extend([None] * len(self.workers))
+            self.ready.notify_all()
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers = []
+
+    def submit(self, description: str) -> Job:
+        """Queue a job, or raise QueueFull when at capacity"""
+        job = Job(id=f"analysis_{uuid.uuid4().hex[:12]}", description=description)
+        with self.lock:
+            self._evict(time.time())
+            if len(self.pending) >= self.config.queue_size:
+                self.counts["rejected"] += 1
+                METRICS.inc("market_research_service_jobs_total", status="rejected")
+                raise QueueFull(self.retry_after())
+            self.pending.append(job)
+            self.jobs[job.id] = job
+            self.ready.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued job; running and finished jobs are left as they are"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.status == "queued":
+                self.pending.remove(job)
+                self._finish(job, "cancelled")
+            return job
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up"""
+        backlog = len(self.pending) + 1
+        seconds = self.mean_seconds * backlog / max(1, self.config.workers)
+        return max(1, min(300, math.ceil(seconds)))
+
+    def health(self) -> Dict:
+        with self.lock:
+            return {
+                "status": "healthy",
+                "uptime_seconds": round(time.time() - self.started),
+                "workers": len(self.workers),
+                "running": self.running,
+                "queued": len(self.pending),
+                "queue_size": self.config.queue_size,
+                "jobs_held": len(self.jobs),
+                "mean_job_seconds": round(self.mean_seconds, 3),
+                **self.counts,
+            }
+
+    def _work(self):
+        while True:
+            with self.ready:
+                while not self.pending:
+                    self.ready.wait()
+                job = self.pending.popleft()
+                if job is None:
+                    return
+                job.status = "running"
+                job.started_at = time.time()
+                self.running += 1
+            METRICS.observe(
+                "market_research_stage_seconds",
+                job.started_at - job.created_at,
+                stage="queue_wait",
+            )
+
+            try:
+                result = self.agent.analyze_business(
+                    job.description,
+                    simulation=self.config.simulation,
+                    use_cache=self.config.use_cache,
+                )
+                record, error = result_to_dict(result), None
+            except Exception as e:
+                record, error = None, str(e)
+
+            with self.lock:
+                self.running -= 1
+                elapsed = time.time() - job.started_at
+                self.mean_seconds += 0.2 * (elapsed - self.mean_seconds)
+                job.result, job.error = record, error
+                self._finish(job, "failed" if error else "completed")
+
+    def _finish(self, job: Job, status: str):
+        """Record a final status and wake long-polling clients (lock held)"""
+        job.status = status
+        job.completed_at = time.time()
+        self.counts[status] += 1
+        METRICS.inc("market_research_service_jobs_total", status=status)
+        job.done.set()
+
+    def _evict(self, now: float):
+        """Drop expired finished jobs, then the oldest finished ones over max_jobs"""
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished and now - job.completed_at > self.config.result_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if len(self.jobs) < self.config.max_jobs:
+            return
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished]:
+            del self.jobs[job_id]
+            if len(self.jobs) < self.config.max_jobs:
+                return
+
+
+class ServiceServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the analysis service"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AnalysisService):
+        super().__init__(address, ServiceHandler)
+        self.service = service
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """REST endpoints for creating, polling and cancelling analyses"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.rstrip("/").split("/")
+        if url.path in ("/health", "/api/v1/admin/system/health"):
+            self.send_json(200, self.server.service.health())
+        elif url.path == "/metrics":
+            data = METRICS.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif url.path.startswith(API_PREFIX + "/") and len(parts) in (5, 6):
+            if len(parts) == 6 and parts[5] != "status":
+                self.send_error_json(404, "Not found")
+                return
+            self.get_job(parts[4], parse_qs(url.query), include_result=len(parts) == 5)
+        else:
+            self.send_error_json(404, "Not found")
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        parts = path.split("/")
+        if path in (API_PREFIX, API_PREFIX + "/create"):
+            self.create_job()
+        elif path.startswith(API_PREFIX + "/") and len(parts) == 6:
+            if parts[5] != "cancel":
+                self.send_error_json(404, "Not found")
+                return
+            job = self.server.service.cancel(parts[4])
+            if job is None:
+                self.send_error_json(404, "Unknown analysis id")
+            elif job.status != "cancelled":
+                self.send_error_json(409, f"Analysis is already {job.status}")
+            else:
+                self.send_json(200, job.to_dict(include_result=False))
+        else:
+            self.send_error_json(404, "Not found")
+
+    def create_job(self):
+        if self.headers.get("Content-Length") is None:
+            self.send_error_json(411, "Content-Length required")
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+            if length < 0:
+                raise ValueError(f"negative Content-Length {length}")
+        except ValueError as e:
+            self.send_error_json(400, f"Invalid request: {e}")
+            return
+        if length > MAX_BODY_BYTES:
+            self.send_error_json(413, "Request body too large")
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            description = description_from_request(body)
+        except (ValueError, AttributeError) as e:
+            self.send_error_json(400, f"Invalid request: {e}")
+            return
+        if not description:
+            self.send_error_json(400, "Invalid request: empty business description")
+            return
+
+        try:
+            job = self.server.service.submit(description)
+        except QueueFull as e:
+            self.send_error_json(
+                429, str(e), headers={"Retry-After": str(e.retry_after)}
+            )
+            return
+        location = f"{API_PREFIX}/{job.id}"
+        payload = job.to_dict(include_result=False)
+        payload["status_url"] = location
+        self.send_json(202, payload, headers={"Location": location})
+
+    def get_job(self, job_id: str, query: Dict[str, List[str]], include_result: bool):
+        service = self.server.service
+        job = service.get(job_id)
+        if job is None:
+            self.send_error_json(404, "Unknown analysis id")
+            return
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            self.send_error_json(400, "wait must be a number of seconds")
+            return
+        # Long-poll: hold the request until the job finishes or wait expires
+        if wait > 0 and not job.finished:
+            job.done.wait(min(wait, service.config.max_wait))
+        headers = {}
+        if not job.finished:
+            headers["Retry-After"] = str(
+                max(1, min(service.retry_after(), int(service.config.max_wait)))
+            )
+        self.send_json(200, job.to_dict(include_result), headers)
+
+    def send_json(self, status: int, payload: Dict, headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(
+        self, status: int, message: str, headers: Dict[str, str] = None
+    ):
+        self.send_json(status, {"error": {"message": message}}, headers)
+
+
+def serve(
+    service: AnalysisService, host: str = "127.0.0.1", port: int = 8080
+) -> ServiceServer:
+    """Start the workers and the server on background threads"""
+    service.start()
+    server = ServiceServer((host, port), service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: List[str] = None):
+    """Run the analysis service from the command line"""
+    parser = argparse.ArgumentParser(description="Market research analysis service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="concurrent analyses (default: 4)"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=100,
+        help="queued jobs before new ones get 429 (default: 100)",
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=30.0,
+        help="longest long-poll in seconds (default: 30)",
+    )
+    parser.add_argument(
+        "--result-ttl",
+        type=float,
+        default=3600.0,
+        help="seconds finished results stay available (default: 3600)",
+    )
+    parser.add_argument(
+        "--heuristic",
+        action="store_true",
+        help="run offline with the heuristic analysis, without the AI crew",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore cached agent responses and call the LLM again",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="add Monte Carlo ROI risk bands to each analysis",
+    )
+    parser.add_argument(
+        "--base-url",
+        metavar="URL",
+        help="OpenAI-compatible endpoint to use instead of api.openai.com",
+    )
+    args = parser.parse_args(argv)
+
+    agent = MarketResearchAgent(
+        os.getenv("OPENAI_API_KEY"),
+        offline=args.heuristic,
+        # A worker returns its main crew before the ROI fan-out, so it holds
+        # at most ROI_FANOUT agent sets at once; one set per sub-task per
+        # worker means no worker waits on another's lease
+        pool_size=args.workers * ROI_FANOUT,
+        base_url=args.base_url,
+    )
+    service = AnalysisService(
+        agent,
+        ServiceConfig(
+            workers=args.workers,
+            queue_size=args.queue_size,
+            max_wait=args.max_wait,
+            result_ttl=args.result_ttl,
+            simulation=SimulationConfig() if args.simulate else None,
+            use_cache=not args.no_cache,
+        ),
+    )
+    service.start()
+    server = ServiceServer((args.host, args.port), service)
+    print(f"🌐 Analysis service listening on http://{args.host}:{args.port}")
+    print(f"   POST {API_PREFIX} · GET {API_PREFIX}/{{id}}?wait=30 · GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped.")
+        print(json.dumps(service.health(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
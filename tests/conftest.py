@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The agent modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_research_agent import MarketResearchAgent  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def offline_agent() -> MarketResearchAgent:
+    """Heuristic-only agent, so no API key or LLM stack is needed"""
+    return MarketResearchAgent(offline=True)
@@ -0,0 +1,43 @@
+from dataclasses import asdict
+
+from benchmark import generate_corpus
+from market_research_agent import MarketResearchAgent
+
+
+class FlakyAgent(MarketResearchAgent):
+    """Offline agent that fails on one description"""
+
+    def analyze_business(self, business_description, **options):
+        if "fail" in business_description:
+            raise RuntimeError("LLM unavailable")
+        return super().analyze_business(business_description, **options)
+
+
+def test_threaded_batch_keeps_input_order_and_isolates_failures():
+    agent = FlakyAgent(offline=True)
+    descriptions = generate_corpus(12) + ["please fail"] + generate_corpus(3, seed=9)
+
+    items = agent.analyze_batch(descriptions, max_workers=4)
+
+    assert [item.index for item in items] == list(range(len(descriptions)))
+    assert [item.description for item in items] == descriptions
+    failed = items[12]
+    assert failed.result is None and "LLM unavailable" in failed.error
+    for item in items[:12] + items[13:]:
+        assert item.error is None
+        assert item.result == agent.analyze_business(item.description)
+
+
+def test_heuristic_batch_matches_the_vectorized_portfolio(offline_agent):
+    descriptions = generate_corpus(40)
+
+    items = offline_agent.analyze_batch(descriptions, max_workers=2, heuristic=True)
+    expected, _ = offline_agent.analyze_portfolio(descriptions)
+
+    assert [asdict(item.result) for item in items] == [asdict(r) for r in expected]
+
+
+def test_iter_batch_skips_finished_items(offline_agent):
+    descriptions = generate_corpus(10)
+    items = offline_agent.iter_batch(descriptions, max_workers=3, skip={0, 4, 9})
+    assert sorted(item.index for item in items) == [1, 2, 3, 5, 6, 7, 8]
@@ -0,0 +1,65 @@
+import gzip
+import json
+
+import pytest
+
+from market_research_agent import BatchItemResult, NDJSONResultWriter
+
+
+def write_items(path: str, indices, append: bool = False):
+    with NDJSONResultWriter(path, append=append) as writer:
+        for index in indices:
+            writer.write(
+                BatchItemResult(index=index, description=f"client {index}", error="x")
+            )
+
+
+def read_indices(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line)["index"] for line in f]
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+def test_recover_keeps_complete_records_and_resumes(tmp_path, name):
+    path = str(tmp_path / name)
+    write_items(path, [0, 1, 2])
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "at", encoding="utf-8") as f:
+        f.write('{"index": 3, "description": "torn')
+
+    assert NDJSONResultWriter.recover(path) == {0, 1, 2}
+    assert read_indices(path) == [0, 1, 2]
+
+    write_items(path, [3, 4], append=True)
+    assert read_indices(path) == [0, 1, 2, 3, 4]
+
+
+def test_recover_stops_at_a_truncated_gzip_stream(tmp_path):
+    path = str(tmp_path / "out.ndjson.gz")
+    write_items(path, range(50))
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[: len(data) - 20])
+
+    indices = NDJSONResultWriter.recover(path)
+
+    assert indices == set(range(len(indices)))
+    assert read_indices(path) == sorted(indices)
+
+
+def test_recover_of_a_missing_file_is_empty(tmp_path):
+    assert NDJSONResultWriter.recover(str(tmp_path / "missing.ndjson")) == set()
+
+
+def test_records_are_flushed_every_flush_every_items(tmp_path):
+    path = str(tmp_path / "out.ndjson")
+    writer = NDJSONResultWriter(path, flush_every=2, flush_interval=3600)
+    for index in range(3):
+        writer.write(BatchItemResult(index=index, description="d", error="x"))
+
+    assert read_indices(path) == [0, 1]
+    assert (writer.written, writer.failed) == (3, 3)
+    writer.close()
+    assert read_indices(path) == [0, 1, 2]
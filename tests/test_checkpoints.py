@@ -0,0 +1,47 @@
+import pickle
+from unittest import mock
+
+from market_research_agent import CheckpointStore
+
+
+def test_outputs_are_kept_per_job_task_and_position(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.save("job-1", "market_research", 0, "profile")
+    store.save("job-1", "roi_calculation", 0, "roi 0")
+    store.save("job-1", "roi_calculation", 2, "roi 2")
+    store.save("job-1", "roi_calculation", 2, "roi 2 retried")
+    store.save("job-2", "market_research", 0, "other")
+
+    assert store.load("job-1") == {
+        ("market_research", 0): "profile",
+        ("roi_calculation", 0): "roi 0",
+        ("roi_calculation", 2): "roi 2 retried",
+    }
+    store.clear("job-1")
+    assert store.load("job-1") == {}
+    assert store.load("job-2") == {("market_research", 0): "other"}
+
+
+def test_abandoned_jobs_expire(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"), ttl_seconds=60)
+    with mock.patch("market_research_agent.time.time", return_value=1000.0):
+        store.save("stale", "market_research", 0, "old")
+    with mock.patch("market_research_agent.time.time", return_value=1030.0):
+        store.save("fresh", "market_research", 0, "new")
+
+    with mock.patch("market_research_agent.time.time", return_value=1070.0):
+        assert store.load("stale") == {}
+        store.clear("unrelated")  # Also sweeps expired entries
+        assert store.load("fresh") == {("market_research", 0): "new"}
+
+    assert store.load("stale") == {} and store._connection().execute(
+        "SELECT COUNT(*) FROM checkpoints"
+    ).fetchone() == (1,)
+
+
+def test_a_restarted_worker_sees_earlier_checkpoints(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.save("job", "process_analysis", 0, "processes")
+
+    restarted = pickle.loads(pickle.dumps(store))
+    assert restarted.load("job") == {("process_analysis", 0): "processes"}
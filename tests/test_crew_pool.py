@@ -0,0 +1,83 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from market_research_agent import CrewPool
+
+
+class CountingPool(CrewPool):
+    """CrewPool whose agent sets are plain objects instead of CrewAI agents"""
+
+    def build_agents(self):
+        time.sleep(0.001)
+        return [object()]
+
+
+def test_sets_are_built_lazily_up_to_the_size_then_reused():
+    pool = CountingPool(llms=[], size=2)
+    assert pool.created == 0
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert pool.created == 2 and first is not second
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.created == 2
+
+
+def test_an_exhausted_pool_waits_for_a_release():
+    pool = CountingPool(llms=[], size=1)
+    held = pool.acquire()
+    with pytest.raises(queue.Empty):
+        pool.acquire(timeout=0.05)
+
+    threading.Timer(0.05, pool.release, args=(held,)).start()
+    assert pool.acquire(timeout=2) is held
+
+
+def test_concurrent_leases_never_share_a_set():
+    pool = CountingPool(llms=[], size=3)
+    in_use, peak, errors = set(), [0], []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(20):
+            with pool.lease() as agents:
+                with lock:
+                    if id(agents) in in_use:
+                        errors.append("shared")
+                    in_use.add(id(agents))
+                    peak[0] = max(peak[0], len(in_use))
+                time.sleep(0.001)
+                with lock:
+                    in_use.discard(id(agents))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert peak[0] <= 3
+    assert pool.created == 3
+
+
+def test_a_failed_build_frees_its_slot():
+    class FlakyPool(CountingPool):
+        fail = True
+
+        def build_agents(self):
+            if self.fail:
+                self.fail = False
+                raise RuntimeError("no API key")
+            return super().build_agents()
+
+    pool = FlakyPool(llms=[], size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.created == 0
+    assert pool.acquire(timeout=1)
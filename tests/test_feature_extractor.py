@@ -0,0 +1,104 @@
+import re
+
+import pytest
+
+from benchmark import generate_corpus
+from market_research_agent import FEATURE_EXTRACTOR, INDUSTRY_KEYWORDS
+
+CORPUS = generate_corpus(2000, seed=7)
+
+
+def baseline_industry(description: str) -> str:
+    """The original first-match substring scan over INDUSTRY_KEYWORDS"""
+    text = description.lower()
+    for industry, keywords in INDUSTRY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return industry.title()
+    return "Professional Services"
+
+
+def baseline_employees(description: str):
+    """The original headcount regex, which stops at a thousands separator"""
+    counts = re.findall(r"(\d{1,6})\s*(?:employees|people|staff)", description.lower())
+    return int(counts[0]) if counts else None
+
+
+def test_industry_matches_the_baseline_scan():
+    for description in CORPUS:
+        features = FEATURE_EXTRACTOR.extract(description)
+        assert features.industry == baseline_industry(description), description
+
+
+def test_headcount_matches_the_baseline_regex_without_separators():
+    checked = 0
+    for description in CORPUS:
+        if re.search(r"\d,\d{3}\s*(?:employees|people|staff)", description):
+            continue
+        features = FEATURE_EXTRACTOR.extract(description)
+        assert features.employee_count == baseline_employees(description)
+        checked += 1
+    assert checked > len(CORPUS) // 2
+
+
+@pytest.mark.parametrize(
+    "description, industry",
+    [
+        ("Bank with 5000 employees", "Banking"),
+        ("We are a digital marketing consultant", "Consulting"),
+        ("tech firm, marketing heavy", "Marketing"),
+        ("Small retail store", "Retail"),
+        ("Family bakery", "Professional Services"),
+    ],
+)
+def test_keyword_priority_follows_the_table_order(description, industry):
+    assert FEATURE_EXTRACTOR.extract(description).industry == industry
+
+
+@pytest.mark.parametrize(
+    "description, employees, size",
+    [
+        ("40 employees", 40, "Small Business (40 employees)"),
+        ("650 staff", 650, "Mid-Market (650 employees)"),
+        ("1,200 employees", 1200, "Mid-Large Enterprise (1,200 employees)"),
+        ("a solo practice", None, "Solo/Freelance"),
+        ("a large enterprise", None, "Large Enterprise (1000+ employees)"),
+    ],
+)
+def test_size_brackets(description, employees, size):
+    features = FEATURE_EXTRACTOR.extract(description)
+    assert features.employee_count == employees
+    assert features.size == size
+
+
+@pytest.mark.parametrize(
+    "description, revenue, revenue_range",
+    [
+        ("$4.39 billion in revenue", 4.39e9, "$4.39B (Enterprise)"),
+        ("About 0.5 billion", 0.5e9, "$500.0M (Large Corporate)"),
+        ("$500M annual revenue", 500e6, "$500.0M+ (Large Corporate)"),
+        ("About 12 million", 12e6, "$12.0M (Mid-Market)"),
+        ("$2,000,000", 2e6, "$2M (Corporate)"),
+        ("$500,000 and a big backlog", 5e5, "$500,000 (Small Business)"),
+        ("Prefer not to say", 10e6, "$1M - $50M"),
+    ],
+)
+def test_revenue(description, revenue, revenue_range):
+    features = FEATURE_EXTRACTOR.extract(description)
+    assert features.revenue == revenue
+    assert features.revenue_range == revenue_range
+
+
+@pytest.mark.parametrize(
+    "description, employees, revenue_range",
+    [
+        ("$1,500,000 employees", None, "$2M (Corporate)"),
+        ("B2B software company, 40 staff", 40, "$1M - $50M"),
+        ("We ship 10b parts a year", None, "$1M - $50M"),
+        ("Annual revenue: 2.5m", None, "$2.5M (Small-Mid Market)"),
+        ("$10b fund with 300 people", 300, "$10.0B+ (Large Enterprise)"),
+    ],
+)
+def test_units_need_currency_or_revenue_context(description, employees, revenue_range):
+    features = FEATURE_EXTRACTOR.extract(description)
+    assert features.employee_count == employees
+    assert features.revenue_range == revenue_range
@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from market_research_agent import (
+    QUESTIONNAIRE,
+    ROI_FANOUT,
+    CheckpointStore,
+    MarketResearchAgent,
+    ResponseCache,
+    SimilarityIndex,
+)
+
+ANSWERS = [
+    "Boutique law firm",
+    "40 employees",
+    "Contract review for corporate clients",
+    "Document preparation, client intake",
+    "Slow turnaround, billing errors",
+    "$8 million",
+]
+CONFIDENT = " ".join(f"{q} {a}" for (q, _), a in zip(QUESTIONNAIRE, ANSWERS))
+
+
+@pytest.fixture
+def online_agent(tmp_path):
+    """Agent on the crew path with every store in tmp_path"""
+    agent = MarketResearchAgent(
+        offline=True,
+        cache=ResponseCache(str(tmp_path / "cache.sqlite3")),
+        checkpoints=CheckpointStore(str(tmp_path / "checkpoints.sqlite3")),
+        similarity=SimilarityIndex(str(tmp_path / "similarity.sqlite3")),
+    )
+    agent.offline = False
+    return agent
+
+
+def test_confident_profile_is_computed_once_per_analysis(online_agent):
+    agent = online_agent
+    crew_profiles = []
+
+    def kickoff(description, prompts, stream, job_id, profile):
+        crew_profiles.append(profile)
+        return ["{}"] * (len(prompts) + ROI_FANOUT), 0
+
+    with mock.patch.object(
+        agent, "heuristic_profile", wraps=agent.heuristic_profile
+    ) as heuristic, mock.patch.object(
+        agent, "_kickoff_crew", side_effect=kickoff
+    ), mock.patch.object(
+        agent, "_reservation", wraps=agent._reservation
+    ) as reservation:
+        agent.analyze_business(CONFIDENT, use_cache=False)
+
+    assert heuristic.call_count == 1
+    profile = crew_profiles[0]
+    assert profile is not None
+    assert reservation.call_args.args[2] == profile
+    # The research task is never sent, so it is not reserved for
+    requests, _ = agent._reservation(CONFIDENT, agent._task_prompts(CONFIDENT), profile)
+    assert requests == 2 + ROI_FANOUT - 1
+
+
+def test_process_analysis_prompt_carries_only_a_given_profile(offline_agent):
+    plain = offline_agent._task_prompts(CONFIDENT)
+    profiled = offline_agent._task_prompts(CONFIDENT, research_output='{"x": 1}')
+
+    assert plain[0] == profiled[0]
+    assert '{"x": 1}' not in plain[1][0]
+    assert '{"x": 1}' in profiled[1][0]
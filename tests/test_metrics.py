@@ -0,0 +1,23 @@
+from market_research_agent import Metrics
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.inc("market_research_field_fallbacks_total", field='say "hi"\\now\nok')
+    metrics.observe("market_research_stage_seconds", 0.2, stage="a\\b")
+
+    text = metrics.to_prometheus()
+
+    assert (
+        'market_research_field_fallbacks_total{field="say \\"hi\\"\\\\now\\nok"} 1'
+        in text.splitlines()
+    )
+    assert 'market_research_stage_seconds_count{stage="a\\\\b"} 1' in text
+    assert "market_research_stage_seconds_bucket{" in text
+
+
+def test_prometheus_output_keeps_one_sample_per_line():
+    metrics = Metrics()
+    metrics.inc("market_research_analyses_total", source="crew\nfake 1")
+    samples = [line for line in metrics.to_prometheus().splitlines() if line[0] != "#"]
+    assert samples == ['market_research_analyses_total{source="crew\\nfake 1"} 1']
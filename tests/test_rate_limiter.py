@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from market_research_agent import MarketResearchAgent, RateLimiter
+
+UNLIMITED = dict(requests_per_minute=10**9, tokens_per_minute=10**12)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def queue_waiters(limiter: RateLimiter, starters):
+    """Start each waiter only once the previous one is queued"""
+    for depth, start in enumerate(starters, 1):
+        start()
+        wait_for(lambda: limiter.queue_depth == depth)
+
+
+def test_sync_waiters_are_served_in_arrival_order():
+    limiter = RateLimiter(**UNLIMITED, max_concurrency=1)
+    limiter.acquire_sync()
+    order = []
+
+    def waiter(name):
+        with limiter.limit_sync():
+            order.append(name)
+
+    threads = [threading.Thread(target=waiter, args=(n,)) for n in range(5)]
+    queue_waiters(limiter, [thread.start for thread in threads])
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == list(range(5))
+    assert limiter.metrics()["granted"] == 6
+    assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+
+def test_head_of_queue_is_not_overtaken_by_smaller_requests():
+    limiter = RateLimiter(requests_per_minute=10**9, tokens_per_minute=6000)
+    limiter.acquire_sync(tokens=6000)
+    order = []
+
+    def waiter(name, tokens):
+        with limiter.limit_sync(tokens=tokens):
+            order.append(name)
+
+    big = threading.Thread(target=waiter, args=("big", 300))  # Needs ~3s refill
+    small = threading.Thread(target=waiter, args=("small", 1))
+    queue_waiters(limiter, [big.start, small.start])
+    limiter.settle(300, 0)  # Budget for the head only
+    big.join(5)
+    small.join(5)
+
+    assert order == ["big", "small"]
+
+
+def test_sync_and_async_waiters_share_slots_and_order():
+    limiter = RateLimiter(**UNLIMITED, max_concurrency=1)
+    limiter.acquire_sync()
+    order, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def hold(name):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            order.append(name)
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+
+    def sync_waiter(name):
+        with limiter.limit_sync():
+            hold(name)
+
+    async def async_waiter(name):
+        async with limiter.limit():
+            hold(name)
+
+    threads = [
+        threading.Thread(target=sync_waiter, args=("thread-1",)),
+        threading.Thread(target=asyncio.run, args=(async_waiter("loop-1"),)),
+        threading.Thread(target=sync_waiter, args=("thread-2",)),
+        threading.Thread(target=asyncio.run, args=(async_waiter("loop-2"),)),
+    ]
+    queue_waiters(limiter, [thread.start for thread in threads])
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["thread-1", "loop-1", "thread-2", "loop-2"]
+    assert peak[0] == 1
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    limiter = RateLimiter(**UNLIMITED, max_concurrency=1)
+
+    async def scenario():
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        behind = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.1)
+        cancelled.cancel()
+        limiter.release()
+        await asyncio.wait_for(behind, 2)
+
+    asyncio.run(scenario())
+    assert limiter.queue_depth == 0
+    assert limiter.in_flight == 1
+    assert limiter.metrics()["granted"] == 2
+
+
+def test_throttled_and_unused_tokens_are_refunded():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=10000)
+    limiter.acquire_sync(tokens=8000)
+    assert limiter._tokens.level == pytest.approx(2000, abs=5)
+
+    limiter.record_throttle(8000)
+    assert limiter.throttled == 1
+    assert limiter._tokens.level == pytest.approx(10000)
+
+    limiter.acquire_sync(tokens=8000)
+    limiter.settle(8000, 3000)
+    assert limiter._tokens.level == pytest.approx(7000, abs=5)
+    limiter.settle(1000, 4000)  # Using more than reserved refunds nothing
+    assert limiter._tokens.level == pytest.approx(7000, abs=5)
+
+
+def test_sync_analysis_retries_throttling_and_refunds_the_reservation(tmp_path):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=10**6)
+    agent = MarketResearchAgent(offline=True, rate_limiter=limiter)
+    description = "Law firm with 40 employees"
+    prompts = agent._task_prompts(description)
+    calls = []
+
+    def kickoff(*args):
+        calls.append(limiter._tokens.level)
+        if len(calls) == 1:
+            raise RuntimeError("Error code: 429 - Rate limit reached")
+        return ["done"], 0
+
+    with mock.patch.object(agent, "_kickoff_crew", side_effect=kickoff), mock.patch(
+        "market_research_agent.time.sleep"
+    ) as sleep:
+        outputs = agent._kickoff_crew_limited(description, prompts, None, "job", 2)
+
+    assert outputs == ["done"]
+    sleep.assert_called_once_with(1)
+    assert limiter.throttled == 1
+    assert limiter.granted == 2
+    # The retry reserved the same amount again, not on top of the first try
+    assert calls[1] == pytest.approx(calls[0], abs=50)
+
+
+def test_non_throttling_errors_are_not_retried():
+    limiter = RateLimiter(**UNLIMITED)
+    agent = MarketResearchAgent(offline=True, rate_limiter=limiter)
+    prompts = agent._task_prompts("Law firm")
+
+    with mock.patch.object(agent, "_kickoff_crew", side_effect=ValueError("bad")):
+        with pytest.raises(ValueError):
+            agent._kickoff_crew_limited("Law firm", prompts, None, "job", 5)
+
+    assert limiter.throttled == 0
+    assert limiter.in_flight == 0
@@ -0,0 +1,97 @@
+import pickle
+import threading
+import time
+from unittest import mock
+
+from market_research_agent import ResponseCache
+
+
+def clock():
+    """Patch the cache's clock with one that ticks only when told"""
+    now = [time.time()]
+    patcher = mock.patch("market_research_agent.time.time", lambda: now[0])
+    return now, patcher
+
+
+def test_hits_and_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    key = ResponseCache.make_key("gpt-4", "Law firm")
+
+    assert cache.get(key) is None
+    cache.put(key, ["profile", "processes"])
+    assert cache.get(key) == ["profile", "processes"]
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "entries": 1,
+        "bytes": len('["profile","processes"]'),
+    }
+
+
+def test_keys_depend_on_every_input():
+    key = ResponseCache.make_key("gpt-4", "Law firm", {"a": 1, "b": 2})
+    assert key == ResponseCache.make_key("gpt-4", "Law firm", {"b": 2, "a": 1})
+    assert key != ResponseCache.make_key("gpt-4o", "Law firm", {"a": 1, "b": 2})
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+    now, patcher = clock()
+    with patcher:
+        cache.put("k", ["out"])
+        now[0] += 59
+        assert cache.get("k") == ["out"]
+        now[0] += 2
+        assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+    now, patcher = clock()
+    with patcher:
+        cache.put("a", ["a"])
+        now[0] += 1
+        cache.put("b", ["b"])
+        now[0] += 1
+        cache.get("a")  # Now more recent than b
+        now[0] += 1
+        cache.put("c", ["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+    assert cache.get("c") == ["c"]
+
+
+def test_byte_budget_is_enforced(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=100)
+    now, patcher = clock()
+    with patcher:
+        for index in range(5):
+            now[0] += 1
+            cache.put(str(index), ["x" * 30])
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert cache.get("4") == ["x" * 30]
+    assert cache.get("0") is None
+
+
+def test_cache_is_shared_by_threads_and_pickled_copies(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+
+    def writer(index):
+        for n in range(20):
+            cache.put(f"{index}-{n}", [str(n)])
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.stats()["entries"] == 80
+    assert copy.get("3-19") == ["19"]
+    copy.clear()
+    assert cache.stats()["entries"] == 0
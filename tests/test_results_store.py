@@ -0,0 +1,68 @@
+from dataclasses import replace
+
+import pytest
+
+from results_store import ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path, offline_agent):
+    """Store holding four analyses across two industries and two dates"""
+    store = ResultsStore(str(tmp_path / "results.db"))
+    rows = [
+        ("Law firm with 40 employees", 150.0, 1000.0),
+        ("Law firm with 650 employees", 300.0, 2000.0),
+        ("Regional bank with 40 employees", 250.0, 1000.0),
+        ("Community bank with 2,000 employees", 90.0, 2000.0),
+    ]
+    for description, overall_roi, created_at in rows:
+        result = offline_agent.analyze_business(description)
+        store.add(replace(result, overall_roi=overall_roi), created_at=created_at)
+    return store
+
+
+def rois(stored):
+    return [item.result.overall_roi for item in stored]
+
+
+def test_query_orders_by_roi_descending_by_default(store):
+    assert rois(store.query()) == [300.0, 250.0, 150.0, 90.0]
+    assert rois(store.query(descending=False, limit=2)) == [90.0, 150.0]
+
+
+def test_query_filters_combine(store):
+    assert rois(store.query(industry="legal")) == [300.0, 150.0]
+    assert rois(store.query(size="Small Business")) == [250.0, 150.0]
+    assert rois(store.query(industry="Banking", min_roi=100)) == [250.0]
+    assert rois(store.query(since=1500)) == [300.0, 90.0]
+    assert rois(store.query(until=1500)) == [250.0, 150.0]
+    assert store.query(industry="Retail") == []
+
+
+def test_query_round_trips_the_result(store, offline_agent):
+    stored = store.query(industry="Legal", size="Mid-Market")
+    assert len(stored) == 1
+    assert stored[0].created_at == 2000.0
+    expected = offline_agent.analyze_business("Law firm with 650 employees")
+    assert stored[0].result == replace(expected, overall_roi=300.0)
+
+
+def test_query_rejects_unknown_order_columns(store):
+    with pytest.raises(ValueError):
+        store.query(order_by="industry; DROP TABLE analyses")
+
+
+def test_add_many_stores_batches_and_counts(tmp_path, offline_agent):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    results = [
+        offline_agent.analyze_business(f"Law firm with {count} employees")
+        for count in (10, 20, 30, 40, 50)
+    ]
+
+    ids = store.add_many(results, created_at=1.0, batch_size=2)
+
+    assert len(set(ids)) == 5
+    assert store.count() == 5
+    assert store.count(industry="Legal") == 5
+    assert store.get(ids[2]).result == results[2]
+    assert store.get(max(ids) + 1) is None
@@ -0,0 +1,72 @@
+import pytest
+
+from market_research_agent import (
+    ROI_FANOUT,
+    ProcessAnalysis,
+    merge_process_roi,
+    select_roi_processes,
+)
+
+
+def process(name: str, savings: float) -> ProcessAnalysis:
+    return ProcessAnalysis(
+        name=name,
+        time_percentage=10,
+        complexity_score=3,
+        automation_potential="High",
+        current_cost_annual=savings * 2,
+        potential_savings=savings,
+        roi_percentage=100,
+        implementation_difficulty="Low",
+    )
+
+
+def roi(cost: float, solution: str, risks=()) -> dict:
+    return {
+        "potential_savings": cost * 2,
+        "implementation_cost_low": cost,
+        "implementation_cost_high": cost * 1.5,
+        "solution": solution,
+        "risks": list(risks),
+    }
+
+
+def test_roi_processes_are_ranked_by_savings_with_ties_in_input_order():
+    processes = [process(name, s) for name, s in zip("abcde", [1, 3, 2, 3, 5])]
+    assert select_roi_processes(processes) == [4, 1, 3]
+
+
+def test_merge_process_roi_maps_sub_tasks_to_their_process():
+    processes = [process(name, s) for name, s in zip("abcd", [100, 300, 200, 300])]
+    fields = [roi(100, "OCR", ["Adoption"]), roi(200, "Bots"), roi(300, "OCR")]
+
+    merged, totals = merge_process_roi(processes, fields)
+
+    # Sub-task i belongs to the i-th selected process: b, d, then c
+    assert [p.potential_savings for p in merged] == [100, 200, 600, 400]
+    assert merged[0] is processes[0]
+    assert totals["overall_roi"] == pytest.approx(1200 / 600 * 100)
+    assert totals["payback_months"] == int(600 / (1200 / 12))
+    assert totals["investment_range"] == "$600 - $900"
+    assert totals["components"] == ["OCR", "Bots"]
+    assert totals["risks"] == ["Adoption"]
+    assert merge_process_roi(processes, fields) == (merged, totals)
+
+
+def test_merge_process_roi_leaves_totals_to_the_fallback_when_incomplete():
+    processes = [process(name, s) for name, s in zip("abc", [100, 300, 200])]
+    fields = [roi(100, "OCR"), {"solution": "Bots"}]
+
+    merged, totals = merge_process_roi(processes, fields)
+
+    assert merged[1].potential_savings == 200
+    assert "overall_roi" not in totals
+    assert "investment_range" not in totals
+    assert totals["components"] == ["OCR", "Bots"]
+
+
+def test_fan_out_is_capped_and_short_lists_fan_out_fully():
+    many = [process(str(i), i) for i in range(ROI_FANOUT + 3)]
+    assert len(select_roi_processes(many)) == ROI_FANOUT
+    assert select_roi_processes(many[:1]) == [0]
+    assert merge_process_roi([], []) == ([], {})
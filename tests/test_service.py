@@ -0,0 +1,141 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from market_research_agent import MarketResearchAgent
+from service import (
+    AnalysisService,
+    QueueFull,
+    ServiceConfig,
+    ServiceServer,
+    description_from_request,
+)
+
+
+class GatedAgent(MarketResearchAgent):
+    """Offline agent whose analyses wait until the test opens the gate"""
+
+    def __init__(self):
+        super().__init__(offline=True)
+        self.gate = threading.Event()
+        self.started = []
+
+    def analyze_business(self, business_description, **options):
+        self.started.append(business_description)
+        self.gate.wait(5)
+        return super().analyze_business(business_description, **options)
+
+
+def test_cancelled_jobs_free_their_queue_slot(offline_agent):
+    service = AnalysisService(offline_agent, ServiceConfig(workers=1, queue_size=2))
+    first = service.submit("Law firm")
+    service.submit("Bank")
+    with pytest.raises(QueueFull):
+        service.submit("Clinic")
+    backlog_retry = service.retry_after()
+
+    service.cancel(first.id)
+
+    assert first.status == "cancelled" and first.finished
+    assert service.health()["queued"] == 1
+    assert service.retry_after() < backlog_retry
+    service.submit("Clinic")
+    assert service.health()["queued"] == 2
+    assert service.counts["rejected"] == 1
+
+
+def test_workers_run_queued_jobs_and_skip_cancelled_ones():
+    agent = GatedAgent()
+    service = AnalysisService(agent, ServiceConfig(workers=1, queue_size=10))
+    service.start()
+    try:
+        running = service.submit("Law firm with 40 employees")
+        cancelled = service.submit("Bank with 300 employees")
+        queued = service.submit("Clinic with 12 employees")
+        assert service.cancel(cancelled.id).status == "cancelled"
+        agent.gate.set()
+
+        assert running.done.wait(5) and queued.done.wait(5)
+        assert running.status == queued.status == "completed"
+        assert running.result["business_profile"]["industry"] == "Legal"
+        assert service.cancel(running.id).status == "completed"
+        assert agent.started == [running.description, queued.description]
+    finally:
+        service.stop(5)
+    assert service.health()["running"] == 0
+
+
+def test_business_info_becomes_questionnaire_answers():
+    description = description_from_request(
+        {"business_info": {"industry": "Legal", "employees": 40, "website": "x.io"}}
+    )
+    assert description == (
+        "What industry is your business in? Legal "
+        "How many employees do you have? 40 Website: x.io"
+    )
+    with pytest.raises(ValueError):
+        description_from_request({"business_info": "Legal"})
+
+
+@pytest.fixture
+def server(offline_agent):
+    service = AnalysisService(offline_agent, ServiceConfig(workers=1))
+    service.start()
+    server = ServiceServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.stop(5)
+
+
+def post(server, path: str, body: bytes = None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.putrequest("POST", path)
+    for name, value in (headers or {}).items():
+        conn.putheader(name, value)
+    conn.endheaders(body)
+    response = conn.getresponse()
+    payload = json.loads(response.read() or b"{}")
+    conn.close()
+    return response.status, payload
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({}, 411),
+        ({"Content-Length": "abc"}, 400),
+        ({"Content-Length": "-5"}, 400),
+        ({"Content-Length": str(10**8)}, 413),
+    ],
+)
+def test_invalid_content_length_is_rejected(server, headers, status):
+    code, payload = post(server, "/api/v1/analysis", headers=headers)
+    assert code == status
+    assert "error" in payload
+
+
+def test_create_and_poll_an_analysis(server):
+    body = json.dumps({"description": "Law firm with 40 employees"}).encode()
+    code, created = post(
+        server,
+        "/api/v1/analysis",
+        body,
+        {"Content-Length": str(len(body)), "Content-Type": "application/json"},
+    )
+    assert code == 202 and created["status"] in ("queued", "running", "completed")
+
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.request("GET", f"{created['status_url']}?wait=5")
+    response = conn.getresponse()
+    job = json.loads(response.read())
+    conn.close()
+    assert response.status == 200
+    assert job["status"] == "completed"
+    assert job["results"]["business_profile"]["industry"] == "Legal"
@@ -0,0 +1,44 @@
+import numpy as np
+
+from benchmark import generate_corpus
+
+
+def test_sharded_scores_match_the_single_process_portfolio(offline_agent):
+    corpus = generate_corpus(70)
+
+    scores = offline_agent.score_heuristic(corpus, max_workers=2, shard_size=8)
+    results, arrays = offline_agent.analyze_portfolio(corpus)
+
+    assert len(scores) == len(corpus) and scores.errors == {}
+    assert np.allclose(scores.arrays.overall_roi, arrays.overall_roi)
+    assert np.array_equal(scores.arrays.payback_months, arrays.payback_months)
+    assert np.allclose(scores.arrays.savings, arrays.savings)
+    assert np.array_equal(scores.arrays.process_counts, arrays.process_counts)
+
+
+def test_a_failing_description_only_blanks_its_row(offline_agent):
+    corpus = generate_corpus(20) + [None] + generate_corpus(4, seed=3)
+
+    scores = offline_agent.score_heuristic(corpus, max_workers=2, shard_size=8)
+
+    assert list(scores.errors) == [20]
+    assert scores.templates[20] == -1
+    assert (np.delete(scores.templates, 20) >= 0).all()
+
+
+def test_scores_round_trip_through_npz(offline_agent, tmp_path):
+    corpus = generate_corpus(10) + [None]
+    scores = offline_agent.score_heuristic(corpus, max_workers=1, shard_size=4)
+    path = str(tmp_path / "scores.npz")
+
+    scores.save(path)
+
+    saved = np.load(path)
+    assert np.array_equal(saved["overall_roi"], scores.arrays.overall_roi)
+    assert list(saved["template_keys"]) == scores.template_keys
+    assert saved["error_index"].tolist() == [10]
+
+
+def test_empty_input_scores_nothing(offline_agent):
+    scores = offline_agent.score_heuristic([], max_workers=1)
+    assert len(scores) == 0 and scores.errors == {}
@@ -0,0 +1,93 @@
+import pytest
+
+from market_research_agent import QUESTIONNAIRE, SimilarityIndex
+
+ANSWERS = [
+    "Boutique litigation law firm",
+    "40 employees",
+    "Commercial litigation, contract review and compliance work for mid-size "
+    "manufacturers and distributors across the region",
+    "Document review, time entry, billing reconciliation, client intake calls "
+    "and preparing weekly matter status reports for partners",
+    "Too much manual data entry, slow turnaround on client questions and "
+    "associates spending evenings on formatting instead of legal analysis",
+    "$8 million",
+]
+
+
+def describe(answers) -> str:
+    return " ".join(f"{q} {a}" for (q, _), a in zip(QUESTIONNAIRE, answers))
+
+
+BASE = describe(ANSWERS)
+
+
+def variant(index: int, answer: str) -> str:
+    answers = list(ANSWERS)
+    answers[index] = answer
+    return describe(answers)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SimilarityIndex(str(tmp_path / "similarity.db"))
+    index.add(BASE, "base-key", scope="gpt-4")
+    return index
+
+
+def test_reworded_intake_reuses_the_indexed_analysis(index):
+    near = variant(3, ANSWERS[3] + " every friday")
+    match = index.find(near, scope="gpt-4")
+    assert match is not None
+    assert match.cache_key == "base-key"
+    assert 0.9 <= match.similarity < 1.0
+
+    exact = index.find(BASE, scope="gpt-4")
+    assert exact.similarity == 1.0
+
+
+def test_different_facts_are_never_reused(index):
+    assert index.find(variant(1, "45 employees"), scope="gpt-4") is None
+    assert index.find(variant(5, "$9 million"), scope="gpt-4") is None
+
+
+def test_unrelated_intakes_do_not_match(index):
+    other = describe(
+        [ANSWERS[0], ANSWERS[1], "Estate planning", "Drafting wills", "Growth"]
+        + [ANSWERS[5]]
+    )
+    assert index.find(other, scope="gpt-4") is None
+
+
+def test_scopes_are_isolated(index):
+    assert index.find(BASE, scope="gpt-4o") is None
+
+
+def test_entries_are_refreshed_discarded_and_expire(tmp_path):
+    index = SimilarityIndex(str(tmp_path / "similarity.db"), ttl_seconds=0)
+    index.add(BASE, "key", scope="s")
+    index.add(BASE, "key", scope="s")
+    assert len(index) == 1
+    assert index.find(BASE, scope="s") is None  # Older than the TTL
+
+    index.ttl_seconds = 3600
+    assert index.find(BASE, scope="s").cache_key == "key"
+    index.discard("key")
+    assert len(index) == 0 and index.find(BASE, scope="s") is None
+
+    index.add(BASE, "again", scope="s")
+    index.clear()
+    assert len(index) == 0
+
+
+def test_signatures_estimate_jaccard_similarity(tmp_path):
+    index = SimilarityIndex(str(tmp_path / "similarity.db"), permutations=256)
+    a = index.signature(BASE)
+    assert (a == index.signature(BASE)).all()
+    b = index.signature(variant(2, "Family law and estate planning"))
+    assert 0.4 < (a == b).mean() < 0.95
+
+
+def test_bands_must_divide_the_permutations(tmp_path):
+    with pytest.raises(ValueError):
+        SimilarityIndex(str(tmp_path / "similarity.db"), permutations=60, bands=8)
@@ -0,0 +1,86 @@
+from dataclasses import replace
+
+import pytest
+
+from market_research_agent import (
+    SimulationConfig,
+    parse_investment_range,
+    simulate_roi,
+)
+
+FIXED = SimulationConfig(
+    draws=1000,
+    savings_rate=("uniform", 0.0),
+    cost_share=("uniform", 0.0),
+    implementation_cost=("uniform", 0.0),
+    seed=1,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$60,000 - $80,000", (60000, 80000)),
+        ("$1.2M", (1.2e6, 1.2e6)),
+        ("$250k to $1.5m", (250e3, 1.5e6)),
+        ("2 - 3 billion", (2, 3)),
+        ("To be scoped", None),
+        ("", None),
+    ],
+)
+def test_parse_investment_range(text, expected):
+    assert parse_investment_range(text) == expected
+
+
+@pytest.fixture(scope="module")
+def result(offline_agent):
+    return offline_agent.analyze_business(
+        "Law firm with 40 employees and $8 million revenue"
+    )
+
+
+def deterministic_roi(result, implementation_cost):
+    savings = sum(p.potential_savings for p in result.process_analyses)
+    return savings / implementation_cost * 100
+
+
+def test_without_shocks_every_draw_is_the_deterministic_roi(result):
+    low, _ = parse_investment_range(result.investment_range)
+    simulation = simulate_roi(result, FIXED)
+
+    expected = deterministic_roi(result, low)
+    assert simulation.draws == 1000
+    assert set(simulation.roi_percentiles) == {
+        "p5",
+        "p10",
+        "p25",
+        "p50",
+        "p75",
+        "p90",
+        "p95",
+    }
+    for value in simulation.roi_percentiles.values():
+        assert value == pytest.approx(expected)
+    assert result.overall_roi == pytest.approx(expected, rel=0.01)
+
+
+def test_unparseable_investment_is_solved_back_from_overall_roi(result):
+    vague = replace(result, investment_range="To be scoped")
+    simulation = simulate_roi(vague, FIXED)
+    assert simulation.roi_percentiles["p50"] == pytest.approx(result.overall_roi)
+
+
+def test_seeded_runs_repeat_and_bands_are_ordered(result):
+    config = SimulationConfig(draws=20000, seed=7)
+    first, second = simulate_roi(result, config), simulate_roi(result, config)
+    assert first == second
+
+    bands = list(first.roi_percentiles.values())
+    assert bands == sorted(bands)
+    assert first.roi_percentiles["p50"] == pytest.approx(result.overall_roi, rel=0.15)
+    assert 0 <= first.payback_within_12_months <= 1
+
+
+def test_unknown_distributions_are_rejected(result):
+    with pytest.raises(ValueError):
+        simulate_roi(result, SimulationConfig(draws=10, savings_rate=("beta", 0.1)))
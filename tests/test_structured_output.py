@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from market_research_agent import (
+    METRICS,
+    IncrementalJSONDecoder,
+    parse_task_output,
+)
+
+DOCUMENT = (
+    "Final Answer: ```json\n"
+    '{"name": "Acme \\"Law\\"", "pain_points": ["billing", "intake"], '
+    '"size": {"employees": 40}, "overall_roi": 12.5}\n'
+    "```"
+)
+
+
+def feed_in_chunks(text: str, size: int):
+    decoder = IncrementalJSONDecoder()
+    completed = []
+    for start in range(0, len(text), size):
+        completed += decoder.feed(text[start : start + size])
+    return decoder, completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, len(DOCUMENT)])
+def test_decoder_results_do_not_depend_on_chunking(size):
+    decoder, completed = feed_in_chunks(DOCUMENT, size)
+    assert completed == [
+        ("name", None, 'Acme "Law"'),
+        ("pain_points", 0, "billing"),
+        ("pain_points", 1, "intake"),
+        ("pain_points", None, ["billing", "intake"]),
+        ("size", None, {"employees": 40}),
+        ("overall_roi", None, 12.5),
+    ]
+    assert decoder.done
+    assert decoder.value() == json.loads(DOCUMENT[DOCUMENT.index("{") : -4])
+
+
+def test_decoder_drops_values_cut_off_mid_way():
+    decoder = IncrementalJSONDecoder()
+    completed = decoder.feed('{"name": "Acme", "pain_points": ["billing", "inta')
+    assert completed == [("name", None, "Acme"), ("pain_points", 0, "billing")]
+    assert decoder.value() == {"name": "Acme", "pain_points": ["billing"]}
+
+    decoder = IncrementalJSONDecoder()
+    decoder.feed('{"name": "Acme", "overall_roi": 12')
+    assert decoder.value() == {"name": "Acme"}
+
+
+def test_decoder_waits_for_an_escape_split_across_chunks():
+    decoder, completed = feed_in_chunks('{"name": "a\\"b", "x": 1}', 11)
+    assert completed == [("name", None, 'a"b'), ("x", None, 1)]
+
+
+def test_decoder_without_an_object_has_no_value():
+    decoder = IncrementalJSONDecoder()
+    assert decoder.feed("I could not produce an analysis.") == []
+    assert decoder.value() is None
+
+
+def test_parse_task_output_keeps_valid_fields_of_a_truncated_document():
+    fields = {"name": lambda v: v.strip(), "pain_points": list}
+    output = '{"name": " Acme ", "pain_points": ["billing"], "extra": tr'
+    assert parse_task_output(fields, output) == {
+        "name": "Acme",
+        "pain_points": ["billing"],
+    }
+
+
+def test_invalid_fields_fall_back_to_the_heuristic_analysis(offline_agent):
+    description = "Law firm with 40 employees, billing and intake are manual"
+    heuristic = offline_agent._create_fallback_analysis(description)
+    profile = {
+        "name": "Acme Legal",
+        "industry": "Legal",
+        "size": "",  # Fails validation
+        "pain_points": ["Manual billing"],
+        "current_processes": ["Billing", "Client intake"],
+    }
+    process = '{"approach": "Document automation", "timeline": "3 mon'
+    before = METRICS.value("market_research_field_fallbacks_total", field="size")
+
+    result = offline_agent._parse_analysis_result(
+        [json.dumps(profile), process], description
+    )
+
+    profile_result = result.business_profile
+    assert profile_result.name == "Acme Legal"
+    assert profile_result.pain_points == ["Manual billing"]
+    assert profile_result.size == heuristic.business_profile.size
+    assert profile_result.revenue_range == heuristic.business_profile.revenue_range
+    assert result.recommended_solution["approach"] == "Document automation"
+    assert result.recommended_solution["timeline"] == (
+        heuristic.recommended_solution["timeline"]
+    )
+    assert result.process_analyses == heuristic.process_analyses
+    assert (
+        METRICS.value("market_research_field_fallbacks_total", field="size")
+        == before + 1
+    )